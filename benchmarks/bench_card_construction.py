@@ -0,0 +1,137 @@
+"""Benchmark: build a grid of AnimeCards and measure construction + polish time.
+
+Compares the application stylesheet (``ui.theme``) against the old approach of
+calling ``setStyleSheet`` on every card and its child widgets.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_card_construction.py [--cards 200] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QLabel
+
+from ui.components.anime_card import AnimeCard
+from ui.theme import apply_theme
+
+# Stylesheets the cards used to set on themselves, kept here to measure the old cost.
+LEGACY_CARD_QSS = """
+    AnimeCard {
+        background-color: #1a1a1a;
+        border-radius: 12px;
+        border: 1px solid #2a2a2a;
+    }
+    AnimeCard:hover {
+        background-color: #2a2a2a;
+        border: 1px solid #00b4d8;
+    }
+    QLabel {
+        color: #ffffff;
+    }
+    .title {
+        font-size: 15px;
+        font-weight: bold;
+        margin-bottom: 8px;
+        color: #ffffff;
+    }
+    .score {
+        color: #00b4d8;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    .info {
+        color: #a0a0a0;
+        font-size: 13px;
+    }
+"""
+LEGACY_IMAGE_QSS = """
+    QLabel {
+        background-color: #2a2a2a;
+        border-top-left-radius: 12px;
+        border-top-right-radius: 12px;
+    }
+"""
+LEGACY_INFO_QSS = """
+    QWidget {
+        background-color: #1a1a1a;
+        border-bottom-left-radius: 12px;
+        border-bottom-right-radius: 12px;
+        padding: 16px;
+    }
+"""
+
+
+class StubImageLoader:
+    """Stands in for ImageLoader; the benchmark cards have no image URLs."""
+
+    def enqueue(self, url, size):
+        pass
+
+
+def synthetic_anime(count):
+    return [
+        {
+            "id": str(i),
+            "title": f"Synthetic Anime {i}",
+            "image_url": "",
+            "score": f"{50 + (i % 50)}.{i % 10}",
+            "synopsis": "",
+            "episodes": 12 + i % 40,
+            "status": "finished",
+            "aired": "2000-01-01 to 2000-03-31",
+        }
+        for i in range(count)
+    ]
+
+
+def build_grid(app, results, legacy):
+    """Build and show a card grid, returning elapsed seconds."""
+    loader = StubImageLoader()
+    start = time.perf_counter()
+    grid = QWidget()
+    layout = QGridLayout(grid)
+    for index, anime in enumerate(results):
+        card = AnimeCard(anime, loader)
+        if legacy:
+            card.setStyleSheet(LEGACY_CARD_QSS)
+            card.image_label.setStyleSheet(LEGACY_IMAGE_QSS)
+            card.findChild(QWidget, "CardInfo").setStyleSheet(LEGACY_INFO_QSS)
+        layout.addWidget(card, index // 4, index % 4)
+    grid.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    grid.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = synthetic_anime(args.cards)
+
+    timings = {}
+    for label, legacy in (("per-widget stylesheets (before)", True), ("application stylesheet (after)", False)):
+        app.setStyleSheet("")
+        if not legacy:
+            apply_theme(app)
+        build_grid(app, results, legacy)  # warm-up
+        timings[label] = [build_grid(app, results, legacy) for _ in range(args.runs)]
+
+    print(f"Card grid construction, {args.cards} cards, {args.runs} runs")
+    for label, runs in timings.items():
+        print(f"  {label:34s} median {statistics.median(runs) * 1000:8.1f} ms   "
+              f"min {min(runs) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: sorting, top-k, filtering and aggregating a large catalog, dicts vs. NumPy columns.
+
+Builds synthetic results (the fields the stub server assigns) and times the
+same operations over the list of dicts, the way the grid used to sort with
+Python lambdas, and over a CatalogStore: a score sort and a title sort, the
+top 20 by score, a score and year range filter, a score histogram and titles
+per season. Also compares the memory the dicts and the columns take.
+
+Usage:
+    python benchmarks/bench_catalog.py [--titles 50000]
+"""
+import argparse
+import collections
+import heapq
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from stub_server import SEASONS, Catalog
+from models.catalog_store import CatalogStore
+
+
+def make_results(count):
+    return [{"id": entry["id"], "title": entry["title"], "score": entry["score"], "episodes": entry["episodes"],
+             "popularity": entry["popularity"], "status": entry["status"],
+             "season": SEASONS[(int(entry["start"][5:7]) % 12) // 3], "year": entry["start"][:4]}
+            for entry in Catalog(count).entries]
+
+
+def score(result):
+    return float(result["score"]) if result["score"] not in ("N/A", None) else 0
+
+
+def best_ms(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=50000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    results = make_results(args.titles)
+    dicts_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    store = CatalogStore(results)
+    build_ms = (time.perf_counter() - start) * 1000
+    store.title_rank()
+
+    operations = [
+        ("sort by score",
+         lambda: sorted(results, key=score, reverse=True),
+         lambda: store.order("score", descending=True)),
+        ("sort by title",
+         lambda: sorted(results, key=lambda x: x["title"]),
+         lambda: store.order("title")),
+        ("top 20 by score",
+         lambda: heapq.nlargest(20, results, key=score),
+         lambda: store.top_k("score", 20)),
+        ("score >= 80, 2010-2019",
+         lambda: [r for r in results if score(r) >= 80 and 2010 <= int(r["year"]) <= 2019],
+         lambda: store.select(score=(80, None), year=(2010, 2019))),
+        ("score histogram",
+         lambda: collections.Counter(int(score(r) // 5) for r in results),
+         lambda: store.histogram("score", bins=10, range=(40, 90))),
+        ("titles per season",
+         lambda: collections.Counter((r["year"], r["season"]) for r in results),
+         lambda: store.season_counts()),
+    ]
+    print(f"{args.titles} titles, columns built in {build_ms:.0f} ms")
+    print(f"  {'operation':24s} {'dicts ms':>9s} {'columns ms':>11s} {'speedup':>8s}")
+    for name, with_dicts, with_columns in operations:
+        dicts_ms, columns_ms = best_ms(with_dicts), best_ms(with_columns)
+        print(f"  {name:24s} {dicts_ms:9.2f} {columns_ms:11.3f} {dicts_ms / columns_ms:7.0f}x")
+    print(f"  memory: dicts {dicts_bytes / 2**20:.1f} MB, columns and strings {store.nbytes / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: poster decode throughput, worker threads vs. worker processes.
+
+Decodes a burst of synthetic JPEG posters (like a large page arriving at
+once) to card-size RGBA with both ``ImageLoader`` backends and reports
+posters per second for each worker count. Thread throughput stays flat
+because decoding holds the GIL; the process backend should scale with cores.
+
+Usage:
+    python benchmarks/bench_decode.py [--posters 200] [--workers 1 2 4]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from stub_server import StubKitsuServer
+from utils.image_decode import ProcessDecoder, SharedPixels, decode_rgba
+
+CARD_SIZE = (280, 380)
+
+
+def make_posters(count):
+    server = StubKitsuServer(catalog_size=1)
+    try:
+        # A few distinct posters are enough; decode cost doesn't depend on content much
+        return [server.poster(str(i % 16)) for i in range(count)]
+    finally:
+        server.httpd.server_close()
+
+
+def bench_threads(posters, workers):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        for _ in executor.map(lambda content: decode_rgba(content, CARD_SIZE), posters):
+            pass
+        return time.perf_counter() - start
+
+
+def bench_processes(posters, workers):
+    decoder = ProcessDecoder(workers)
+    try:
+        # Start the workers before timing; the app keeps its pool for the whole session
+        for future in [decoder.submit(posters[0], CARD_SIZE) for _ in range(workers)]:
+            with SharedPixels(*future.result()[:3]):
+                pass
+        start = time.perf_counter()
+        for future in [decoder.submit(content, CARD_SIZE) for content in posters]:
+            with SharedPixels(*future.result()[:3]) as pixels:
+                bytes(pixels.buffer[:4])
+        return time.perf_counter() - start
+    finally:
+        decoder.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posters", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    posters = make_posters(args.posters)
+    print(f"Decoding {args.posters} posters to {CARD_SIZE[0]}x{CARD_SIZE[1]}, {os.cpu_count()} CPUs")
+    print(f"  {'workers':>7s} {'threads':>14s} {'processes':>14s}")
+    for workers in args.workers:
+        threads = args.posters / bench_threads(posters, workers)
+        processes = args.posters / bench_processes(posters, workers)
+        print(f"  {workers:7d} {threads:10.1f} /s   {processes:10.1f} /s")
+
+
+if __name__ == "__main__":
+    main()
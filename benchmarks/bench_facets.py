@@ -0,0 +1,64 @@
+"""Benchmark: facet index build, filter and count times as the number of loaded titles grows.
+
+Indexes synthetic results (with the genres, categories, status, season, year
+and age rating the stub server assigns), then times what happens when a
+checkbox is toggled: filtering to the matching titles and recounting every
+facet.
+
+Usage:
+    python benchmarks/bench_facets.py [--titles 1000 5000 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from stub_server import CATEGORIES, GENRES, SEASONS, Catalog
+from models.facet_index import FACETS, FacetIndex
+
+
+def make_results(count):
+    return [{"id": entry["id"],
+             "genres": [GENRES[g] for g in entry["genres"]],
+             "categories": [CATEGORIES[c] for c in entry["categories"]],
+             "status": entry["status"],
+             "season": SEASONS[(int(entry["start"][5:7]) % 12) // 3],
+             "year": entry["start"][:4],
+             "age_rating": entry["age_rating"]}
+            for entry in Catalog(count).entries]
+
+
+def best_of(fn, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"  {'titles':>7s} {'build ms':>9s} {'filter us':>10s} {'counts us':>10s} {'matches':>8s}")
+    for count in args.titles:
+        results = make_results(count)
+        start = time.perf_counter()
+        index = FacetIndex(results)
+        build = (time.perf_counter() - start) * 1000
+        selection = {facet: set() for facet in FACETS}
+        selection["genre"] = {"Action", "Comedy"}
+        selection["status"] = {"finished"}
+        matches = len(index.filter(selection))
+        filter_us = best_of(lambda: index.filter(selection))
+        counts_us = best_of(lambda: [index.counts(facet, selection) for facet in FACETS])
+        print(f"  {count:7d} {build:9.1f} {filter_us:10.0f} {counts_us:10.0f} {matches:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark: frame times while scrolling, resizing and hovering the result grid.
+
+Builds the main window offscreen with N synthetic results from the stub
+server and drives it one frame at a time, paced at 60 Hz. Each frame applies
+one input step (a scroll-wheel step, a window resize, a pointer move across
+the cards) and then runs the event loop until it is idle again; how long that
+takes is the frame's latency, the time before the app could take the next
+input. Time spent in paint events is recorded separately. Posters that finish
+loading during a frame are handled, and counted, in it, as on screen.
+
+Reports p50/p95/p99 frame and paint times per sequence and the frames that
+went over budget. ``run_benchmarks.py`` includes the same figures in its
+report, so they can be compared against a baseline.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_frames.py [--results 500] [--frames 240] [--budget-ms 16.7]
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_frames.py --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from stub_server import StubKitsuServer
+
+FRAME_MS = 1000 / 60
+SEQUENCES = ("scroll", "resize", "hover")
+WINDOW_SIZE = (1400, 900)
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+def synthetic_results(server, count):
+    """``count`` results as the client would parse them from one large stub page."""
+    from api.jikan_client import JikanClient
+
+    _, _, body = server.route("/anime", {"page[limit]": str(count), "include": "genres,categories"})
+    results, _ = JikanClient()._parse_anime_page(json.loads(body))
+    return results
+
+
+class FrameRecorder:
+    """Runs frames and times them, and the paint events inside them.
+
+    Paint events are timed by an application-wide event filter that delivers
+    them itself; only the outermost one is counted, so nested paints aren't
+    counted twice.
+    """
+
+    def __init__(self, app, budget_ms=FRAME_MS):
+        from PySide6.QtCore import QEvent, QObject
+
+        recorder = self
+
+        class PaintTimer(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() != QEvent.Type.Paint or recorder.painting:
+                    return False
+                recorder.painting = True
+                start = time.perf_counter()
+                try:
+                    obj.event(event)
+                finally:
+                    recorder.paint_ms += (time.perf_counter() - start) * 1000
+                    recorder.painting = False
+                return True
+
+        self.app = app
+        self.budget_ms = budget_ms
+        self.painting = False
+        self.paint_ms = 0.0
+        self.filter = PaintTimer()
+
+    def run(self, steps):
+        """Apply each step in its own frame. Returns ``(frame_ms, paint_ms)`` lists."""
+        frames, paints = [], []
+        self.app.installEventFilter(self.filter)
+        try:
+            for step in steps:
+                self.paint_ms = 0.0
+                start = time.perf_counter()
+                step()
+                self.app.processEvents()
+                elapsed = (time.perf_counter() - start) * 1000
+                frames.append(elapsed)
+                paints.append(self.paint_ms)
+                # Wait for the next vsync, as a real frame would; loaders run meanwhile
+                if elapsed < self.budget_ms:
+                    time.sleep((self.budget_ms - elapsed) / 1000)
+        finally:
+            self.app.removeEventFilter(self.filter)
+        return frames, paints
+
+
+def scroll_steps(window, frames, step_px=120):
+    """Wheel steps down the grid and back up, one per frame."""
+    bar = window.content_area.verticalScrollBar()
+    positions = list(range(0, bar.maximum() + 1, step_px))
+    positions = (positions + positions[::-1])[:frames]
+    return [lambda value=value: bar.setValue(value) for value in positions]
+
+
+def resize_steps(window, frames, step_px=10):
+    """The window widened and narrowed again by ``step_px`` a frame, as when dragging its edge."""
+    width, height = WINDOW_SIZE
+    widths = [width + step_px * min(i % 80, 80 - i % 80) for i in range(frames)]
+    return [lambda w=w: window.resize(w, height) for w in widths]
+
+
+def hover_steps(window, frames, step_px=40):
+    """The pointer swept left to right across the visible rows of cards."""
+    from PySide6.QtCore import QPoint
+    from PySide6.QtTest import QTest
+
+    viewport = window.content_area.viewport()
+    points = [QPoint(x, y) for y in range(150, viewport.height(), 200)
+              for x in range(0, viewport.width(), step_px)]
+    return [lambda point=points[i % len(points)]: QTest.mouseMove(viewport, point) for i in range(frames)]
+
+
+def bench_frames(app, server, result_count=500, frames=240, budget_ms=FRAME_MS):
+    """Frame and paint time percentiles for each input sequence over a grid of ``result_count`` cards."""
+    from run_benchmarks import wait_until
+    from ui.main_window import MainWindow
+
+    window = MainWindow()
+    window.resize(*WINDOW_SIZE)
+    window.show()
+    wait_until(app, lambda: not window.search_thread.isRunning() and window.cards)
+    # The grid stays at result_count cards: answers to a search or page still loading are dropped
+    # and no further pages are fetched while scrolling
+    window.search_thread = None
+    window.page_thread = None
+    window.has_more = False
+    window.content_area.verticalScrollBar().setValue(0)
+    window.display_results(synthetic_results(server, result_count))
+    wait_until(app, lambda: len(window.cards) == result_count)
+    wait_until(app, lambda: all(card.has_image() or card.image_failed for card in window.cards if card.wants_image))
+
+    recorder = FrameRecorder(app, budget_ms)
+    sequences = {"scroll": scroll_steps, "resize": resize_steps, "hover": hover_steps}
+    results = {}
+    for name in SEQUENCES:
+        window.content_area.verticalScrollBar().setValue(0)
+        window.resize(*WINDOW_SIZE)
+        app.processEvents()
+        frame_ms, paint_ms = recorder.run(sequences[name](window, frames))
+        for p in (50, 95, 99):
+            results[f"frame_{name}_p{p}"] = {"median": percentile(frame_ms, p), "unit": "ms"}
+        results[f"paint_{name}_p95"] = {"median": percentile(paint_ms, 95), "unit": "ms"}
+        results[f"frames_over_budget_{name}"] = {"median": sum(ms > budget_ms for ms in frame_ms),
+                                                 "unit": f"of {len(frame_ms)}"}
+    window.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=500, help="cards in the grid")
+    parser.add_argument("--frames", type=int, default=240, help="frames per sequence")
+    parser.add_argument("--budget-ms", type=float, default=FRAME_MS)
+    parser.add_argument("--baseline", help="report (from this script or run_benchmarks.py) to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    os.environ["PYITSU_HOME"] = tempfile.mkdtemp(prefix="pyitsu-bench-")
+    with StubKitsuServer(catalog_size=max(2000, args.results)) as server:
+        os.environ["PYITSU_API_URL"] = server.api_url
+
+        from PySide6.QtWidgets import QApplication
+        from api.rate_limit import shared_rate_limiter
+        from ui.theme import apply_theme
+
+        shared_rate_limiter.configure(10000)
+        app = QApplication.instance() or QApplication(sys.argv)
+        apply_theme(app)
+        results = bench_frames(app, server, args.results, args.frames, args.budget_ms)
+
+    print(f"{args.results} cards, {args.frames} frames per sequence, {args.budget_ms:.1f} ms budget")
+    print(f"{'sequence':10s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'paint p95':>10s} {'over budget':>12s}")
+    for name in SEQUENCES:
+        print(f"{name:10s} {results[f'frame_{name}_p50']['median']:8.2f} {results[f'frame_{name}_p95']['median']:8.2f} "
+              f"{results[f'frame_{name}_p99']['median']:8.2f} {results[f'paint_{name}_p95']['median']:10.2f} "
+              f"{results[f'frames_over_budget_{name}']['median']:12d}")
+
+    if args.baseline:
+        from run_benchmarks import compare
+
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare({"results": results}, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
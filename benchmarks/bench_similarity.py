@@ -0,0 +1,69 @@
+"""Benchmark: similar-titles lookups over a large local catalog.
+
+Indexes synthetic titles (genres, categories and studio as the stub server
+assigns them) and times a first, uncached lookup for random titles, the
+refresh after more titles arrive, and a memoized repeat.
+
+Usage:
+    python benchmarks/bench_similarity.py [--titles 20000] [--lookups 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from stub_server import CATEGORIES, GENRES, STUDIOS, Catalog
+from models.similarity import SimilarityIndex
+
+
+def make_titles(count):
+    return [{"id": entry["id"], "title": entry["title"],
+             "genres": [GENRES[g] for g in entry["genres"]],
+             "categories": [CATEGORIES[c] for c in entry["categories"]],
+             "studios": [STUDIOS[entry["studio"]]]}
+            for entry in Catalog(count).entries]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=50)
+    args = parser.parse_args()
+
+    titles = make_titles(args.titles)
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    index.add(titles[:-20])
+    add_ms = (time.perf_counter() - start) * 1000
+    ids = [title["id"] for title in random.Random(1).sample(titles[:-20], args.lookups)]
+
+    index.similar(ids[0])  # first query builds the columns
+    lookups = []
+    for anime_id in ids:
+        index.memo.clear()
+        start = time.perf_counter()
+        index.similar(anime_id)
+        lookups.append((time.perf_counter() - start) * 1000)
+
+    # A new page of titles arrives, then a details view opens
+    index.add(titles[-20:])
+    start = time.perf_counter()
+    index.similar(ids[0])
+    refresh_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    index.similar(ids[0])
+    memo_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.titles} titles, {len(index.vocabulary)} features, indexed in {add_ms:.0f} ms")
+    print(f"  lookup          median {statistics.median(lookups):6.2f} ms   max {max(lookups):6.2f} ms")
+    print(f"  after 20 added         {refresh_ms:6.2f} ms")
+    print(f"  memoized               {memo_ms:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
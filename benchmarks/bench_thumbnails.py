@@ -0,0 +1,123 @@
+"""Benchmark: showing a warm grid's posters from the thumbnail atlas vs. the disk cache.
+
+With the posters' JPEGs in the disk cache (a warm start), each card used to
+read its file and decode it again; with the memory-mapped thumbnail atlas the
+pixels are already there at card size. Reports the per-poster cost of both
+paths, then the time to give a grid of cards their posters from the atlas
+and paint a window-sized view of it, against a 60 Hz frame.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_thumbnails.py [--cards 100] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["PYITSU_HOME"] = tempfile.mkdtemp(prefix="pyitsu-bench-")
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QApplication, QGridLayout, QScrollArea, QWidget
+
+from stub_server import StubKitsuServer
+from ui.components.anime_card import AnimeCard
+from ui.components.image_loader import ImageLoader
+from ui.theme import apply_theme
+
+FRAME_MS = 1000 / 60
+
+
+def make_posters(count):
+    server = StubKitsuServer(catalog_size=1)
+    try:
+        return {f"http://stub/images/{i}.jpg": server.poster(str(i % 16)) for i in range(count)}
+    finally:
+        server.httpd.server_close()
+
+
+def median_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    apply_theme(app)
+    size = AnimeCard.IMAGE_SIZE
+    loader = ImageLoader(thumbnail_size=size)
+    posters = make_posters(args.cards)
+    for url, content in posters.items():
+        loader.disk_cache.put(url, content)
+        loader._store_thumbnail(url, size, loader._decode_image(content, size))
+
+    def from_disk():
+        for url in posters:
+            QPixmap.fromImage(loader._decode_image(loader.disk_cache.get(url), size))
+
+    def from_atlas():
+        loader.pixmaps.clear()
+        for url in posters:
+            loader.cached_pixmap(url, size)
+
+    disk_ms = median_ms(from_disk, args.runs)
+    atlas_ms = median_ms(from_atlas, args.runs)
+    print(f"{args.cards} posters at {size[0]}x{size[1]}")
+    print(f"  disk cache + decode  {disk_ms / args.cards:8.3f} ms/poster")
+    print(f"  thumbnail atlas      {atlas_ms / args.cards:8.3f} ms/poster  ({disk_ms / atlas_ms:.0f}x)")
+
+    grid = QWidget()
+    layout = QGridLayout(grid)
+    cards = [AnimeCard({"id": str(i), "title": f"Anime {i}", "image_url": url, "score": "80.00",
+                        "episodes": 12, "status": "finished"}, loader, load_image=False)
+             for i, url in enumerate(posters)]
+    for i, card in enumerate(cards):
+        layout.addWidget(card, i // 4, i % 4)
+    view = QScrollArea()
+    view.setWidgetResizable(True)
+    view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    view.setWidget(grid)
+    view.resize(1280, 780)
+    view.show()
+    app.processEvents()
+
+    def show_posters():
+        loader.pixmaps.clear()
+        for card in cards:
+            card.release_image()
+        start = time.perf_counter()
+        for card in cards:
+            card.ensure_image()
+        return (time.perf_counter() - start) * 1000
+
+    def paint():
+        start = time.perf_counter()
+        view.grab()
+        return (time.perf_counter() - start) * 1000
+
+    posters_ms = statistics.median(show_posters() for _ in range(args.runs))
+    paint_ms = statistics.median(paint() for _ in range(args.runs))
+    total = posters_ms + paint_ms
+    print(f"Warm grid of {args.cards} cards")
+    print(f"  posters from atlas   {posters_ms:8.2f} ms")
+    print(f"  paint (1280x780)     {paint_ms:8.2f} ms")
+    print(f"  total                {total:8.2f} ms  ({total / FRAME_MS:.2f} frames at 60 Hz)")
+    loader.atlas.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Offline benchmark suite.
+
+Starts the stub Kitsu server (``stub_server.py``), points the app at it and
+measures:
+
+- client_throughput: ``JikanClient`` pages per second (cache off)
+- search_to_first_card: search submitted -> first card in the grid
+- time_to_visible_posters: search submitted -> every card in or near the
+  viewport shows its poster (offscreen cards load theirs when scrolled to)
+- detail_open: card clicked -> details view built
+- detail_open_hovered: same, for a card hovered long enough to prefetch its details and cover
+- back_to_results: Back pressed in the details view -> the results grid shown and painted again
+- grid_build: ``display_results`` for a large page into an empty grid, until
+  every card is built
+- grid_first_cards: the same, until the first cards are painted
+- grid_build_longest_turn: the longest event-loop turn while it builds the
+  cards, i.e. how long input could wait
+- grid_resort: re-sorting that page, which reuses and moves the cards
+- frame_*/paint_*/frames_over_budget_*: frame and paint time percentiles while
+  scrolling, resizing and hovering a large grid (see ``bench_frames.py``)
+
+Each run writes a JSON report; pass ``--baseline`` to compare against a
+previous report and fail on regressions.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/run_benchmarks.py
+    QT_QPA_PLATFORM=offscreen python benchmarks/run_benchmarks.py --latency 0.05 --bandwidth 2e6
+    QT_QPA_PLATFORM=offscreen python benchmarks/run_benchmarks.py --save-baseline
+    QT_QPA_PLATFORM=offscreen python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bench_frames import bench_frames
+from stub_server import StubKitsuServer
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+def wait_until(app, predicate, timeout=30.0):
+    """Pump the Qt event loop until ``predicate()`` is true. Returns elapsed seconds."""
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("benchmark condition not reached")
+        app.processEvents()
+        time.sleep(0.0005)
+    return time.perf_counter() - start
+
+
+def summarize(samples, unit="ms"):
+    return {"median": statistics.median(samples), "min": min(samples), "max": max(samples),
+            "runs": len(samples), "unit": unit}
+
+
+def bench_client_throughput(server, pages, concurrency):
+    from api.jikan_client import JikanClient
+    from utils.metrics import registry
+
+    client = JikanClient(use_cache=False)
+    params = JikanClient.top_params()
+    offsets = [i * client.page_limit for i in range(pages)]
+    transferred = registry.counter("net.bytes_transferred", kind="api")
+    before = transferred.value
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        records = sum(len(results) for results, _ in executor.map(lambda o: client.fetch_anime_page(params, o), offsets))
+    elapsed = time.perf_counter() - start
+    return {"pages_per_s": {"median": pages / elapsed, "unit": "pages/s", "higher_is_better": True},
+            "records_per_s": {"median": records / elapsed, "unit": "records/s", "higher_is_better": True},
+            "bytes_per_page": {"median": (transferred.value - before) / pages, "unit": "bytes"}}
+
+
+def bench_gui(app, runs, grid_size):
+    from ui.main_window import MainWindow
+    from ui.components.anime_details import AnimeDetails
+
+    window = MainWindow()
+    window.show()
+    wait_until(app, lambda: not window.search_thread.isRunning() and window.cards)
+
+    first_card, visible_posters, detail_open, detail_open_hovered, back = [], [], [], [], []
+    for run in range(runs):
+        # Fresh query each run so neither the response cache nor the poster caches are warm
+        window.search_input.setText(f"benchmark query {run} {time.time()}")
+        start = time.perf_counter()
+        window.search_anime()
+        wait_until(app, lambda: window.cards and not window.loading_overlay.isVisible())
+        first_card.append((time.perf_counter() - start) * 1000)
+        wait_until(app, lambda: all(card.has_image() or card.image_failed for card in window.cards if card.wants_image))
+        visible_posters.append((time.perf_counter() - start) * 1000)
+
+        card = window.cards[0]
+        start = time.perf_counter()
+        card.clicked.emit(card.anime_data)
+        wait_until(app, lambda: any(view.isVisible() for view in window.findChildren(AnimeDetails)))
+        detail_open.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        window.go_home()
+        wait_until(app, lambda: window.cards and window.cards[0].isVisible())
+        app.processEvents()
+        back.append((time.perf_counter() - start) * 1000)
+
+        card = window.cards[1]
+        card.hovered.emit(card.anime_data)
+        prefetcher = window.prefetcher
+        wait_until(app, lambda: card.anime_data["id"] in prefetcher.details)
+        cover = prefetcher.details[card.anime_data["id"]]["cover_url"]
+        wait_until(app, lambda: window.image_loader.pixmaps.find(cover, prefetcher.COVER_SIZE) is not None)
+        start = time.perf_counter()
+        card.clicked.emit(card.anime_data)
+        wait_until(app, lambda: any(view.isVisible() for view in window.findChildren(AnimeDetails)))
+        detail_open_hovered.append((time.perf_counter() - start) * 1000)
+        window.go_home()
+        wait_until(app, lambda: window.cards)
+
+    results = [dict(card.anime_data) for card in window.cards]
+    synthetic = [dict(results[i % len(results)], id=str(100000 + i)) for i in range(grid_size)]
+    grid_build, grid_first, grid_turn, grid_resort = [], [], [], []
+    for _ in range(runs):
+        window.clear_content()
+        app.processEvents()
+        start = time.perf_counter()
+        window.display_results(synthetic)
+        app.processEvents()
+        grid_first.append((time.perf_counter() - start) * 1000)
+        turns = []
+        while len(window.cards) < grid_size:
+            turn_start = time.perf_counter()
+            app.processEvents()
+            turns.append((time.perf_counter() - turn_start) * 1000)
+        app.processEvents()
+        grid_build.append((time.perf_counter() - start) * 1000)
+        grid_turn.append(max(turns, default=grid_first[-1]))
+
+        window.config["sort_by"] = "Title" if window.config["sort_by"] == "Score" else "Score"
+        start = time.perf_counter()
+        window.refresh_current_view()
+        app.processEvents()
+        grid_resort.append((time.perf_counter() - start) * 1000)
+
+    window.close()
+    return {
+        "search_to_first_card": summarize(first_card),
+        "time_to_visible_posters": summarize(visible_posters),
+        "detail_open": summarize(detail_open),
+        "detail_open_hovered": summarize(detail_open_hovered),
+        "back_to_results": summarize(back),
+        f"grid_build_{grid_size}": summarize(grid_build),
+        f"grid_first_cards_{grid_size}": summarize(grid_first),
+        f"grid_build_longest_turn_{grid_size}": summarize(grid_turn),
+        f"grid_resort_{grid_size}": summarize(grid_resort),
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print a comparison table; return the names of metrics that regressed beyond ``tolerance``."""
+    regressions = []
+    print(f"\n{'metric':32s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    for name, current in report["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        change = (current["median"] - base["median"]) / base["median"] if base["median"] else 0.0
+        worse = -change if current.get("higher_is_better") else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:32s} {base['median']:12.1f} {current['median']:12.1f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server latency in seconds")
+    parser.add_argument("--bandwidth", type=float, default=None, help="stub server bytes per second")
+    parser.add_argument("--pages", type=int, default=50, help="pages for the client throughput test")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--grid-size", type=int, default=200)
+    parser.add_argument("--frame-results", type=int, default=500, help="cards in the grid for the frame-time test")
+    parser.add_argument("--frames", type=int, default=240, help="frames per sequence in the frame-time test")
+    parser.add_argument("--output", help="report path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the report to {BASELINE_PATH}")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Isolated caches and session so every run starts cold
+    os.environ["PYITSU_HOME"] = tempfile.mkdtemp(prefix="pyitsu-bench-")
+
+    with StubKitsuServer(latency=args.latency, bandwidth=args.bandwidth) as server:
+        os.environ["PYITSU_API_URL"] = server.api_url
+
+        from PySide6.QtWidgets import QApplication
+        from api.rate_limit import shared_rate_limiter
+        from ui.theme import apply_theme
+
+        # Measure the app, not the politeness limit meant for the real API
+        shared_rate_limiter.configure(10000)
+        app = QApplication.instance() or QApplication(sys.argv)
+        apply_theme(app)
+
+        results = {}
+        results.update(bench_client_throughput(server, args.pages, args.concurrency))
+        results.update(bench_gui(app, args.runs, args.grid_size))
+        results.update(bench_frames(app, server, args.frame_results, args.frames))
+
+    report = {
+        "timestamp": time.time(),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "config": {"runs": args.runs, "latency": args.latency, "bandwidth": args.bandwidth,
+                   "pages": args.pages, "concurrency": args.concurrency, "grid_size": args.grid_size,
+                   "frame_results": args.frame_results, "frames": args.frames},
+        "results": results,
+    }
+
+    for name, result in results.items():
+        print(f"{name:32s} {result['median']:12.1f} {result['unit']}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    paths = [output] + ([BASELINE_PATH] if args.save_baseline else [])
+    for path in paths:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"\nReport written to {', '.join(paths)}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
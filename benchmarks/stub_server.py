@@ -0,0 +1,371 @@
+"""Local stand-in for the Kitsu API, for offline benchmarks.
+
+Serves canned JSON:API documents for ``/anime`` (search, ``filter[id]``,
+sort and offset pagination, ``fields[...]`` sparse fieldsets, ``include`` of
+genres, categories and productions) and ``/anime/{id}``, plus
+synthetic JPEG posters under ``/images/{id}.jpg``. ``/anime/{id}/episodes``
+pages through each title's episodes (up to 1100), with thumbnails under
+``/images/episodes/{id}-{number}.jpg``. JSON is gzip (or brotli,
+when installed) compressed if the client accepts it. Latency and bandwidth
+can be throttled to mimic slow networks.
+
+Can also be run on its own:
+    python benchmarks/stub_server.py --port 8765 --latency 0.05
+    PYITSU_API_URL=http://127.0.0.1:8765 python src/main.py
+"""
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from io import BytesIO
+from urllib.parse import urlparse, parse_qs
+
+from PIL import Image, ImageDraw
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATUSES = ["finished", "current", "upcoming", "tba"]
+SUBTYPES = ["TV", "movie", "OVA", "ONA", "special"]
+AGE_RATINGS = ["G", "PG", "R", "R18"]
+SEASONS = ["winter", "spring", "summer", "fall"]
+CATEGORIES = ["Action", "Adventure", "Comedy", "Drama", "Fantasy", "Horror", "Mecha", "Music",
+              "Mystery", "Psychological", "Romance", "Sci-Fi", "Slice of Life", "Sports",
+              "Supernatural", "Thriller", "Shounen", "Shoujo", "Seinen", "Josei"]
+GENRES = ["Action", "Comedy", "Drama", "Fantasy", "Horror", "Mystery", "Romance", "Sci-Fi", "Slice of Life",
+          "Sports"]
+STUDIOS = ["Sunrise", "Madhouse", "Bones", "Production I.G", "Kyoto Animation", "MAPPA", "Wit Studio",
+           "Toei Animation", "Ufotable", "Trigger"]
+
+
+class Catalog:
+    """Deterministic synthetic catalog; entry ``i`` always has the same attributes."""
+
+    def __init__(self, size: int, seed: int = 1):
+        self.size = size
+        self.entries = [self._make_entry(i, random.Random(seed * 100003 + i)) for i in range(1, size + 1)]
+
+    @staticmethod
+    def _make_entry(i: int, rng: random.Random) -> dict:
+        year = rng.randint(1980, 2024)
+        episodes = rng.choice([1, 12, 13, 24, 26, 50, 100, 500, 1100])
+        return {
+            "id": str(i),
+            "title": f"Synthetic Anime {i}",
+            "score": f"{rng.uniform(40, 90):.2f}",
+            "episodes": episodes,
+            "status": rng.choice(STATUSES),
+            "subtype": rng.choice(SUBTYPES),
+            "age_rating": rng.choice(AGE_RATINGS),
+            "season": rng.choice(SEASONS),
+            "start": f"{year}-{rng.randint(1, 12):02d}-01",
+            "end": f"{year + 1}-{rng.randint(1, 12):02d}-01",
+            "popularity": rng.randint(1, 20000),
+            "categories": rng.sample(range(len(CATEGORIES)), rng.randint(1, 4)),
+            "studio": rng.randrange(len(STUDIOS)),
+            "synopsis": " ".join(rng.choice(["lorem", "ipsum", "dolor", "sit", "amet", "anime"]) for _ in range(120)),
+            "genres": rng.sample(range(len(GENRES)), rng.randint(1, 3)),
+        }
+
+    def search(self, text: str = None, sort: str = None, ids: str = None) -> list:
+        entries = self.entries
+        if ids:
+            entries = [self.entries[int(i) - 1] for i in ids.split(",") if i.isdigit() and 0 < int(i) <= self.size]
+        if text:
+            # Stable pseudo-random subset per query so different queries return different titles
+            rng = random.Random(text)
+            entries = rng.sample(entries, min(len(entries), max(20, len(entries) // 10)))
+        if sort:
+            field = sort.lstrip("-")
+            key = {"averageRating": lambda e: float(e["score"]),
+                   "popularityRank": lambda e: e["popularity"]}.get(field)
+            if key:
+                entries = sorted(entries, key=key, reverse=sort.startswith("-"))
+        return entries
+
+
+class StubKitsuServer:
+    """Threaded HTTP server serving a :class:`Catalog`. Use as a context manager or call start/stop."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, bandwidth=None, catalog_size=2000,
+                 poster_size=(550, 780)):
+        self.latency = latency
+        self.bandwidth = bandwidth  # bytes per second, None for unlimited
+        self.catalog = Catalog(catalog_size)
+        self.poster_size = poster_size
+        self.poster_cache = {}
+        self.poster_lock = threading.Lock()
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return self.base_url
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # Documents
+
+    def anime_resource(self, entry: dict, full: bool = True, fields: str = None, include=()) -> dict:
+        poster = f"{self.base_url}/images/{entry['id']}.jpg"
+        attributes = {
+            "canonicalTitle": entry["title"],
+            "titles": {"en": entry["title"], "ja_jp": f"合成アニメ {entry['id']}"},
+            "averageRating": entry["score"],
+            "episodeCount": entry["episodes"],
+            "status": entry["status"],
+            "subtype": entry["subtype"],
+            "showType": entry["subtype"],
+            "ageRating": entry["age_rating"],
+            "startDate": entry["start"],
+            "endDate": entry["end"],
+            # Titles airing now get a weekly slot in July 2024
+            "nextRelease": (f"2024-07-{int(entry['id']) % 28 + 1:02d}T15:00:00.000Z"
+                            if entry["status"] == "current" else None),
+            "popularityRank": entry["popularity"],
+            "ratingRank": entry["popularity"],
+            "userCount": entry["popularity"] * 7,
+            "favoritesCount": entry["popularity"] // 3,
+            "episodeLength": 24,
+            "synopsis": entry["synopsis"],
+            "description": entry["synopsis"],
+            "posterImage": {"tiny": poster, "small": poster, "medium": poster, "large": poster, "original": poster},
+            "coverImage": {"original": poster},
+        }
+        relationships = {}
+        if "genres" in include:
+            relationships["genres"] = {"data": [{"type": "genres", "id": str(g + 1)} for g in entry["genres"]]}
+        if "categories" in include:
+            relationships["categories"] = {"data": [{"type": "categories", "id": str(c + 1)}
+                                                    for c in entry["categories"]]}
+        if "animeProductions" in include:
+            relationships["animeProductions"] = {"data": [{"type": "animeProductions", "id": production["id"]}
+                                                          for production in self.productions(entry)]}
+        if fields:
+            wanted = fields.split(",")
+            attributes = {key: value for key, value in attributes.items() if key in wanted}
+            relationships = {key: value for key, value in relationships.items() if key in wanted}
+        resource = {"id": entry["id"], "type": "anime", "attributes": attributes,
+                    "links": {"self": f"{self.base_url}/anime/{entry['id']}"}}
+        if relationships:
+            resource["relationships"] = relationships
+        return resource
+
+    @staticmethod
+    def productions(entry: dict) -> list:
+        """The entry's studio, plus another company credited as producer."""
+        producer = (entry["studio"] + 3) % len(STUDIOS)
+        return [{"id": f"{entry['id']}-{role}", "type": "animeProductions", "attributes": {"role": role},
+                 "relationships": {"producer": {"data": {"type": "producers", "id": str(index + 1)}}}}
+                for role, index in (("studio", entry["studio"]), ("producer", producer))]
+
+    def included(self, entries: list, include: set, query: dict) -> list:
+        """Compound document ``included`` resources for ``entries``, each listed once."""
+        resources = {}
+        for entry in entries:
+            if "genres" in include:
+                for g in entry["genres"]:
+                    resources[("genres", g)] = {"id": str(g + 1), "type": "genres",
+                                                "attributes": {"name": GENRES[g]}}
+            if "categories" in include:
+                for c in entry["categories"]:
+                    resources[("categories", c)] = {"id": str(c + 1), "type": "categories",
+                                                    "attributes": {"title": CATEGORIES[c]}}
+            if "animeProductions" in include:
+                for production in self.productions(entry):
+                    resources[("animeProductions", production["id"])] = production
+                    if "animeProductions.producer" in include:
+                        producer = production["relationships"]["producer"]["data"]
+                        resources[("producers", producer["id"])] = {
+                            "id": producer["id"], "type": "producers",
+                            "attributes": {"name": STUDIOS[int(producer["id"]) - 1]}}
+        for resource in resources.values():
+            fields = query.get(f"fields[{resource['type']}]")
+            if fields:
+                resource["attributes"] = {key: value for key, value in resource["attributes"].items()
+                                          if key in fields.split(",")}
+        return list(resources.values())
+
+    @staticmethod
+    def include_paths(query: dict) -> set:
+        """``include=a.b,c`` -> {"a", "a.b", "c"}"""
+        paths = set()
+        for path in filter(None, query.get("include", "").split(",")):
+            parts = path.split(".")
+            paths.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+        return paths
+
+    def episode_resource(self, entry: dict, number: int) -> dict:
+        thumbnail = f"{self.base_url}/images/episodes/{entry['id']}-{number}.jpg"
+        attributes = {
+            "canonicalTitle": f"Episode {number} of {entry['title']}",
+            "number": number,
+            "seasonNumber": 1,
+            "airdate": entry["start"],
+            "length": 24,
+            "synopsis": entry["synopsis"][:200],
+            "thumbnail": {"original": thumbnail},
+        }
+        return {"id": f"{entry['id']}{number:05d}", "type": "episodes", "attributes": attributes}
+
+    def poster(self, anime_id: str, size: tuple = None) -> bytes:
+        size = size or self.poster_size
+        with self.poster_lock:
+            if (anime_id, size) not in self.poster_cache:
+                rng = random.Random(anime_id)
+                image = Image.new("RGB", size, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+                draw = ImageDraw.Draw(image)
+                for _ in range(40):
+                    x, y = rng.randrange(size[0]), rng.randrange(size[1])
+                    draw.ellipse((x, y, x + rng.randint(20, 200), y + rng.randint(20, 200)),
+                                 fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+                buffer = BytesIO()
+                image.save(buffer, "JPEG", quality=85)
+                self.poster_cache[(anime_id, size)] = buffer.getvalue()
+            return self.poster_cache[(anime_id, size)]
+
+    def route(self, path: str, query: dict):
+        """Return (status, content type, body bytes) for a request."""
+        if path == "/anime":
+            entries = self.catalog.search(query.get("filter[text]"), query.get("sort"), query.get("filter[id]"))
+            limit = int(query.get("page[limit]", 10))
+            offset = int(query.get("page[offset]", 0))
+            page = entries[offset:offset + limit]
+            fields = query.get("fields[anime]")
+            include = self.include_paths(query)
+            document = {"data": [self.anime_resource(entry, fields=fields, include=include) for entry in page],
+                        "meta": {"count": len(entries)},
+                        "links": {}}
+            if include:
+                document["included"] = self.included(page, include, query)
+            return 200, "application/vnd.api+json", json.dumps(document).encode()
+
+        match = re.fullmatch(r"/anime/(\d+)", path)
+        if match:
+            index = int(match.group(1)) - 1
+            if not 0 <= index < self.catalog.size:
+                return 404, "application/vnd.api+json", b'{"errors":[{"status":"404"}]}'
+            entry = self.catalog.entries[index]
+            include = self.include_paths(query)
+            document = {"data": self.anime_resource(entry, include=include)}
+            if include:
+                document["included"] = self.included([entry], include, query)
+            return 200, "application/vnd.api+json", json.dumps(document).encode()
+
+        match = re.fullmatch(r"/anime/(\d+)/episodes", path)
+        if match:
+            index = int(match.group(1)) - 1
+            if not 0 <= index < self.catalog.size:
+                return 404, "application/vnd.api+json", b'{"errors":[{"status":"404"}]}'
+            entry = self.catalog.entries[index]
+            limit = int(query.get("page[limit]", 10))
+            offset = int(query.get("page[offset]", 0))
+            numbers = range(offset + 1, min(entry["episodes"], offset + limit) + 1)
+            document = {"data": [self.episode_resource(entry, number) for number in numbers],
+                        "meta": {"count": entry["episodes"]},
+                        "links": {}}
+            return 200, "application/vnd.api+json", json.dumps(document).encode()
+
+        match = re.fullmatch(r"/images/(\d+)\.jpg", path)
+        if match:
+            return 200, "image/jpeg", self.poster(match.group(1))
+
+        match = re.fullmatch(r"/images/episodes/(\d+-\d+)\.jpg", path)
+        if match:
+            return 200, "image/jpeg", self.poster(match.group(1), (400, 225))
+
+        return 404, "text/plain", b"not found"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                status, content_type, body = server.route(url.path, query)
+                encoding, body = self.encode(content_type, body)
+                if server.latency:
+                    time.sleep(server.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.write_body(body)
+
+            def encode(self, content_type: str, body: bytes):
+                """Compress JSON bodies with the best encoding the client accepts."""
+                if "json" not in content_type:
+                    return None, body
+                accepted = [part.split(";")[0].strip() for part in self.headers.get("Accept-Encoding", "").split(",")]
+                if brotli is not None and "br" in accepted:
+                    return "br", brotli.compress(body)
+                if "gzip" in accepted:
+                    return "gzip", gzip.compress(body, compresslevel=6)
+                return None, body
+
+            def write_body(self, body: bytes):
+                if not server.bandwidth:
+                    self.wfile.write(body)
+                    return
+                chunk = max(1024, int(server.bandwidth / 50))
+                for start in range(0, len(body), chunk):
+                    self.wfile.write(body[start:start + chunk])
+                    time.sleep(len(body[start:start + chunk]) / server.bandwidth)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the stub Kitsu server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes per second per response")
+    parser.add_argument("--catalog-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = StubKitsuServer(port=args.port, latency=args.latency, bandwidth=args.bandwidth,
+                             catalog_size=args.catalog_size)
+    print(f"Serving stub Kitsu API at {server.api_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
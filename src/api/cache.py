@@ -0,0 +1,73 @@
+import hashlib
+import os
+import tempfile
+import time
+from typing import Iterator, Optional
+
+from utils.metrics import registry
+from utils.paths import app_data_dir
+
+
+class DiskCache:
+    """Stores byte blobs on disk, keyed by an arbitrary string (usually a URL)."""
+
+    def __init__(self, name: str, max_age: Optional[float] = None, directory: Optional[str] = None):
+        self.name = name
+        self.directory = directory or app_data_dir("cache", name)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_age = max_age
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since the entry was written, or None if it is not cached."""
+        try:
+            return max(0.0, time.time() - os.path.getmtime(self._path(key)))
+        except OSError:
+            return None
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[bytes]:
+        """Return the cached bytes, or None if missing or older than ``max_age``."""
+        max_age = self.max_age if max_age is None else max_age
+        age = self.age(key)
+        if age is None or (max_age is not None and age > max_age):
+            registry.counter("cache.misses", tier=f"disk:{self.name}").inc()
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            registry.counter("cache.misses", tier=f"disk:{self.name}").inc()
+            return None
+        registry.counter("cache.hits", tier=f"disk:{self.name}").inc()
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Write an entry atomically so readers never see a partial file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Error writing cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def values(self) -> Iterator[bytes]:
+        """Every entry's bytes, in no particular order. Entries that vanish while iterating are skipped."""
+        for name in os.listdir(self.directory):
+            if name.startswith(".tmp-"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "rb") as f:
+                    yield f.read()
+            except OSError:
+                continue
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
@@ -1,162 +1,366 @@
+import json
+import logging
+import os
 import requests
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from utils.metrics import registry
+from utils.profiler import span
+from .cache import DiskCache
+from .rate_limit import RateLimiter, shared_rate_limiter
+from .transport import Transport, get_transport
+
+logger = logging.getLogger(__name__)
+
+try:
+    # requests decodes brotli only when one of these is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "br, gzip, deflate"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
 
 class JikanClient:
-    BASE_URL = "https://kitsu.io/api/edge"
+    # PYITSU_API_URL points the client at another server, e.g. the benchmark stub
+    BASE_URL = os.environ.get("PYITSU_API_URL", "https://kitsu.io/api/edge")
     DEFAULT_PAGE_LIMIT = 20
     MAX_PAGE_LIMIT = 20
-    
-    def __init__(self, page_limit=None):
+    CACHE_MAX_AGE = 15 * 60  # seconds
+    # Attributes list pages need (JSON:API sparse fieldset); details fetch everything.
+    # Genres, categories and the rest are what the facet filters work on.
+    LIST_FIELDS = ["canonicalTitle", "posterImage", "averageRating", "episodeCount", "status",
+                   "startDate", "endDate", "ageRating", "subtype", "popularityRank", "genres", "categories"]
+    # Relationships resolved in the same request, with just the attribute we show
+    LIST_INCLUDE = {"include": "genres,categories", "fields[genres]": "name", "fields[categories]": "title"}
+    # Watchlist refreshes also want the next episode's air date
+    TRACKED_FIELDS = LIST_FIELDS + ["nextRelease"]
+    DETAILS_INCLUDE = {"include": "genres,categories,animeProductions.producer"}
+    SEASONS = {12: "winter", 1: "winter", 2: "winter", 3: "spring", 4: "spring", 5: "spring",
+               6: "summer", 7: "summer", 8: "summer", 9: "fall", 10: "fall", 11: "fall"}
+
+    def __init__(self, page_limit=None, use_cache=True, cache: DiskCache = None,
+                 rate_limiter: RateLimiter = None, transport: Transport = None, sparse=True):
         self.headers = {
             'Accept': 'application/vnd.api+json',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Content-Type': 'application/vnd.api+json'
         }
+        # Request only LIST_FIELDS on list pages; results then have no synopsis
+        self.sparse = sparse
         self.page_limit = min(page_limit or self.DEFAULT_PAGE_LIMIT, self.MAX_PAGE_LIMIT)
+        # Responses are cached on disk and shared by the GUI and the CLI
+        self.cache = (cache or DiskCache("api", max_age=self.CACHE_MAX_AGE)) if use_cache else None
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        # None means the process-wide transport (network, recording or replay)
+        self.transport = transport
+
+    def _cache_key(self, path: str, params: dict = None) -> str:
+        return f"{self.BASE_URL}{path}?{urlencode(sorted((params or {}).items()))}"
+
+    def _get(self, path: str, params: dict = None, endpoint: str = None, refresh: bool = False) -> dict:
+        """GET a JSON:API document, going through the response cache and the rate limiter.
+
+        ``endpoint`` is the path template used to label metrics (defaults to ``path``).
+        ``refresh`` skips the cache lookup but still stores the new response.
+        Raises ``requests.RequestException`` on network or HTTP errors.
+        """
+        endpoint = endpoint or path
+        url = f"{self.BASE_URL}{path}"
+        key = self._cache_key(path, params)
+        if self.cache and not refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                with span("parse"):
+                    return json.loads(cached)
+
+        self.rate_limiter.acquire()
+        registry.counter("api.requests", endpoint=endpoint).inc()
+        try:
+            with registry.timer("api.latency_ms", endpoint=endpoint):
+                transport = self.transport or get_transport()
+                response = transport.get(url, params=params, headers=self.headers, timeout=15)
+            logger.debug("GET %s -> %s", response.url, response.status_code)
+            response.raise_for_status()
+        except requests.RequestException:
+            registry.counter("api.errors", endpoint=endpoint).inc()
+            raise
+        registry.counter("net.bytes_downloaded", kind="api").inc(len(response.content))
+        # Content-Length is the size on the wire, before decompression
+        registry.counter("net.bytes_transferred", kind="api").inc(
+            int(response.headers.get("Content-Length") or len(response.content)))
+
+        if self.cache:
+            self.cache.put(key, response.content)
+        with span("parse"):
+            return response.json()
+
+    @staticmethod
+    def _included_index(data: dict) -> dict:
+        """Map ``(type, id)`` to the included resources of a JSON:API document."""
+        return {(item.get("type"), item.get("id")): item for item in data.get("included") or []}
+
+    @staticmethod
+    def _related(anime_data: dict, relationship: str, included: dict) -> List[dict]:
+        """Included resources an anime links to through ``relationship``, in order."""
+        linkage = ((anime_data.get("relationships") or {}).get(relationship) or {}).get("data") or []
+        if isinstance(linkage, dict):
+            linkage = [linkage]
+        return [included[(ref.get("type"), ref.get("id"))] for ref in linkage
+                if (ref.get("type"), ref.get("id")) in included]
 
-    def _process_anime_data(self, anime_data: dict) -> dict:
+    @classmethod
+    def _companies(cls, anime_data: dict, included: dict) -> Dict[str, List[str]]:
+        """Names of the companies credited on an anime, by production role."""
+        companies = {'studio': [], 'producer': [], 'licensor': []}
+        for production in cls._related(anime_data, 'animeProductions', included):
+            role = (production.get('attributes') or {}).get('role')
+            for producer in cls._related(production, 'producer', included):
+                if role in companies:
+                    companies[role].append(producer['attributes'].get('name'))
+        return companies
+
+    @classmethod
+    def _season(cls, start_date: Optional[str]) -> Optional[str]:
+        try:
+            return cls.SEASONS[int(start_date.split("-")[1])]
+        except (AttributeError, IndexError, KeyError, ValueError):
+            return None
+
+    def _process_anime_data(self, anime_data: dict, included: dict = None) -> dict:
         """Helper method to process anime data into a consistent format."""
         attributes = anime_data.get("attributes", {})
-        return {
+        included = included or {}
+        start_date = attributes.get("startDate")
+        processed = {
             "id": anime_data.get("id"),
             "title": attributes.get("canonicalTitle", "Unknown Title"),
-            "image_url": attributes.get("posterImage", {}).get("original", ""),
+            "image_url": (attributes.get("posterImage") or {}).get("original", ""),
             "score": attributes.get("averageRating", "N/A"),
             "synopsis": attributes.get("synopsis", "No synopsis available"),
             "episodes": attributes.get("episodeCount", "N/A"),
             "status": attributes.get("status", "Unknown"),
-            "aired": f"{attributes.get('startDate', 'Unknown')} to {attributes.get('endDate', 'Unknown')}"
+            "aired": f"{attributes.get('startDate', 'Unknown')} to {attributes.get('endDate', 'Unknown')}",
+            "genres": [item["attributes"].get("name") for item in self._related(anime_data, "genres", included)],
+            "categories": [item["attributes"].get("title")
+                           for item in self._related(anime_data, "categories", included)],
+            "age_rating": attributes.get("ageRating"),
+            "subtype": attributes.get("subtype"),
+            "year": start_date.split("-")[0] if start_date else None,
+            "season": self._season(start_date),
+            "next_airing": attributes.get("nextRelease"),
+            "popularity": attributes.get("popularityRank"),
         }
+        if self.sparse:
+            # Not requested for lists; get_anime_details has it
+            del processed["synopsis"]
+        return processed
+
+    def _page_params(self, params: dict, offset: int) -> dict:
+        params = dict(params, **self.LIST_INCLUDE, **{"page[limit]": self.page_limit, "page[offset]": offset})
+        if self.sparse:
+            params["fields[anime]"] = ",".join(self.LIST_FIELDS)
+        return params
+
+    def _parse_anime_page(self, data: dict) -> Tuple[List[Dict], int]:
+        with span("parse"):
+            included = self._included_index(data)
+            results = [self._process_anime_data(anime, included) for anime in data.get("data") or []]
+        total = (data.get("meta") or {}).get("count", len(results))
+        return results, total
+
+    def fetch_anime_page(self, params: dict, offset: int = 0, refresh: bool = False) -> Tuple[List[Dict], int]:
+        """Fetch one page of ``/anime`` results.
+
+        Returns the processed results and the total number of matches reported
+        by the API. ``refresh`` bypasses the response cache. Raises
+        ``requests.RequestException`` on failure.
+        """
+        data = self._get("/anime", self._page_params(params, offset), refresh=refresh)
+        return self._parse_anime_page(data)
+
+    def fetch_anime_by_ids(self, anime_ids: List[str], refresh: bool = False) -> List[Dict]:
+        """Fetch up to ``MAX_PAGE_LIMIT`` anime in a single request (``filter[id]``).
+
+        Ids the API doesn't know are left out of the result. Raises
+        ``requests.RequestException`` on failure.
+        """
+        anime_ids = list(anime_ids)
+        if len(anime_ids) > self.MAX_PAGE_LIMIT:
+            raise ValueError(f"At most {self.MAX_PAGE_LIMIT} ids per request")
+        if not anime_ids:
+            return []
+        params = dict(self.LIST_INCLUDE, **{"filter[id]": ",".join(map(str, anime_ids)),
+                                            "page[limit]": len(anime_ids)})
+        if self.sparse:
+            params["fields[anime]"] = ",".join(self.TRACKED_FIELDS)
+        data = self._get("/anime", params, endpoint="/anime?filter[id]", refresh=refresh)
+        return self._parse_anime_page(data)[0]
+
+    def cached_anime_page(self, params: dict, offset: int = 0,
+                          max_age: float = None) -> Optional[Tuple[List[Dict], float]]:
+        """Return ``(results, age in seconds)`` for a page held in the response cache.
+
+        Never touches the network. Returns None if the page is not cached or is
+        older than ``max_age``, however old the cache's own expiry allows.
+        """
+        if not self.cache:
+            return None
+        key = self._cache_key("/anime", self._page_params(params, offset))
+        age = self.cache.age(key)
+        cached = self.cache.get(key, max_age=float("inf") if max_age is None else max_age)
+        if cached is None:
+            return None
+        try:
+            results, _ = self._parse_anime_page(json.loads(cached))
+        except ValueError:
+            return None
+        return results, age
 
-    def get_top_anime(self):
+    def cached_titles(self) -> Iterator[Dict]:
+        """Every anime found in the response cache, pages and details alike, expired or not.
+
+        Titles from details responses also have their ``studios``. Never
+        touches the network; a title may be yielded more than once.
+        """
+        if not self.cache:
+            return
+        for content in self.cache.values():
+            try:
+                data = json.loads(content)
+            except ValueError:
+                continue
+            resources = data.get("data") if isinstance(data, dict) else None
+            if isinstance(resources, dict):
+                resources = [resources]
+            if not isinstance(resources, list):
+                continue
+            included = self._included_index(data)
+            for resource in resources:
+                if isinstance(resource, dict) and resource.get("type") == "anime":
+                    title = self._process_anime_data(resource, included)
+                    title["studios"] = self._companies(resource, included)["studio"]
+                    yield title
+
+    def iter_anime_pages(self, params: dict, max_pages: int = None) -> Iterator[List[Dict]]:
+        """Yield successive pages of ``/anime`` results until exhausted or ``max_pages``."""
+        offset = 0
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            results, total = self.fetch_anime_page(params, offset)
+            if not results:
+                return
+            yield results
+            pages += 1
+            offset += len(results)
+            if offset >= total:
+                return
+
+    def _process_episode_data(self, episode: dict) -> dict:
+        attributes = episode.get("attributes", {})
+        return {
+            "id": episode.get("id"),
+            "number": attributes.get("number"),
+            "title": attributes.get("canonicalTitle") or f"Episode {attributes.get('number', '?')}",
+            "airdate": attributes.get("airdate"),
+            "length": attributes.get("length"),
+            "thumbnail_url": (attributes.get("thumbnail") or {}).get("original", ""),
+        }
+
+    def fetch_episodes_page(self, anime_id, offset: int = 0) -> Tuple[List[Dict], int]:
+        """Fetch one page of an anime's episodes, in episode order.
+
+        Returns the processed episodes and the total episode count. Raises
+        ``requests.RequestException`` on failure.
+        """
+        params = {"sort": "number", "page[limit]": self.page_limit, "page[offset]": offset}
+        data = self._get(f"/anime/{anime_id}/episodes", params, endpoint="/anime/{id}/episodes")
+        with span("parse"):
+            episodes = [self._process_episode_data(episode) for episode in data.get("data") or []]
+        total = (data.get("meta") or {}).get("count", len(episodes))
+        return episodes, total
+
+    def iter_episode_pages(self, anime_id, offset: int = 0) -> Iterator[Tuple[List[Dict], int]]:
+        """Yield ``(episodes, total)`` page by page, fetching each page only when asked for it."""
+        while True:
+            episodes, total = self.fetch_episodes_page(anime_id, offset)
+            if not episodes:
+                return
+            yield episodes, total
+            offset += len(episodes)
+            if offset >= total:
+                return
+
+    @staticmethod
+    def top_params() -> dict:
+        return {"sort": "-averageRating"}
+
+    @staticmethod
+    def search_params(query: str) -> dict:
+        return {"filter[text]": query}
+
+    @classmethod
+    def query_params(cls, query: str) -> dict:
+        """Parameters for what the main window shows: the top list for an empty query."""
+        return cls.search_params(query) if query else cls.top_params()
+
+    def get_top_anime(self, refresh=False, offset=0):
         """Get top anime list."""
         try:
-            response = requests.get(
-                f"{self.BASE_URL}/anime", 
-                params={
-                    "sort": "-averageRating",
-                    "page[limit]": self.page_limit
-                },
-                headers=self.headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data.get("data"):
-                print(f"No data in response: {data}")
-                return []
-                
-            results = []
-            for anime in data.get("data", []):
-                attributes = anime.get("attributes", {})
-                results.append({
-                    "id": anime.get("id"),
-                    "title": attributes.get("canonicalTitle", "Unknown Title"),
-                    "image_url": attributes.get("posterImage", {}).get("original", ""),
-                    "score": attributes.get("averageRating", "N/A"),
-                    "synopsis": attributes.get("synopsis", "No synopsis available"),
-                    "episodes": attributes.get("episodeCount", "N/A"),
-                    "status": attributes.get("status", "Unknown"),
-                    "aired": f"{attributes.get('startDate', 'Unknown')} to {attributes.get('endDate', 'Unknown')}"
-                })
+            results, _ = self.fetch_anime_page(self.top_params(), offset, refresh=refresh)
+            if not results:
+                logger.warning("No data in top anime response")
             return results
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching top anime: {e}")
+            logger.error("Error fetching top anime: %s", e)
             return []
 
-    def search_anime(self, query):
+    def search_anime(self, query, refresh=False, offset=0):
         """Search for anime."""
         try:
             if not query or query.strip() == "":
                 return []
-            
-            print(f"Searching for: {query}")  # Debug print
-            
-            response = requests.get(
-                f"{self.BASE_URL}/anime", 
-                params={
-                    "filter[text]": query,
-                    "page[limit]": self.page_limit
-                },
-                headers=self.headers
-            )
-            
-            # Debug prints
-            print(f"Response status: {response.status_code}")
-            print(f"Response URL: {response.url}")
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data.get("data"):
-                print(f"No data in response: {data}")
-                return []
-            
-            results = []
-            for anime in data.get("data", []):
-                attributes = anime.get("attributes", {})
-                results.append({
-                    "id": anime.get("id"),
-                    "title": attributes.get("canonicalTitle", "Unknown Title"),
-                    "image_url": attributes.get("posterImage", {}).get("original", ""),
-                    "score": attributes.get("averageRating", "N/A"),
-                    "synopsis": attributes.get("synopsis", "No synopsis available"),
-                    "episodes": attributes.get("episodeCount", "N/A"),
-                    "status": attributes.get("status", "Unknown"),
-                    "aired": f"{attributes.get('startDate', 'Unknown')} to {attributes.get('endDate', 'Unknown')}"
-                })
-            
-            print(f"Found {len(results)} results")  # Debug print
+
+            logger.debug("Searching for: %s", query)
+            results, _ = self.fetch_anime_page(self.search_params(query), offset, refresh=refresh)
+            logger.debug("Found %d results", len(results))
             return results
-            
+
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching anime data: {e}")
+            logger.error("Error fetching anime data: %s", e)
             return []
 
     def get_anime_details(self, anime_id: int) -> dict:
         """Get detailed information about a specific anime."""
         try:
-            response = requests.get(
-                f"{self.BASE_URL}/anime/{anime_id}",
-                headers=self.headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
+            data = self._get(f"/anime/{anime_id}", self.DETAILS_INCLUDE, endpoint="/anime/{id}")
+
             if not data.get('data'):
-                print(f"No data found for anime ID: {anime_id}")
+                logger.warning("No data found for anime ID: %s", anime_id)
                 return None
-                
+
             anime = data['data']
             attributes = anime.get('attributes', {})
-            
+
             # Extract images with safe fallbacks
             poster_image = attributes.get('posterImage') or {}
             cover_image = attributes.get('coverImage') or {}
-            
+
+            included = self._included_index(data)
+
             # Extract genres
-            genres = []
-            if 'genres' in data.get('included', []):
-                for item in data['included']:
-                    if item['type'] == 'genres':
-                        genres.append(item['attributes']['name'])
-            
+            genres = [item['attributes'].get('name') for item in self._related(anime, 'genres', included)]
+
             # Extract categories (themes)
-            themes = []
-            if 'categories' in data.get('included', []):
-                for item in data['included']:
-                    if item['type'] == 'categories':
-                        themes.append(item['attributes']['title'])
-            
-            # Extract studios
-            studios = []
-            if 'animeProductions' in data.get('included', []):
-                for item in data['included']:
-                    if item['type'] == 'animeProductions':
-                        studio_id = item['relationships']['producer']['data']['id']
-                        for studio in data['included']:
-                            if studio['type'] == 'producers' and studio['id'] == studio_id:
-                                studios.append(studio['attributes']['name'])
-            
+            themes = [item['attributes'].get('title') for item in self._related(anime, 'categories', included)]
+
+            # Extract companies, by their role in the production
+            companies = self._companies(anime, included)
+
             return {
                 'id': anime.get('id'),
                 'title': attributes.get('canonicalTitle'),
@@ -179,9 +383,9 @@ class JikanClient:
                 'aired': f"{attributes.get('startDate')} to {attributes.get('endDate')}",
                 'premiered': attributes.get('startDate'),
                 'broadcast': None,
-                'producers': [],
-                'licensors': [],
-                'studios': studios,
+                'producers': companies['producer'],
+                'licensors': companies['licensor'],
+                'studios': companies['studio'],
                 'genres': genres,
                 'themes': themes,
                 'demographics': [],
@@ -189,9 +393,12 @@ class JikanClient:
                 'rating': attributes.get('ageRating'),
                 'trailer_url': attributes.get('youtubeVideoId'),
                 'year': attributes.get('startDate', '').split('-')[0] if attributes.get('startDate') else None,
-                'season': attributes.get('season'),
+                'season': self._season(attributes.get('startDate')),
+                'age_rating': attributes.get('ageRating'),
+                'next_airing': attributes.get('nextRelease'),
+                'categories': themes,
                 'url': f"https://kitsu.io/anime/{anime.get('id')}"
             }
         except requests.RequestException as e:
-            print(f"Error fetching anime details: {e}")
-            return None 
+            logger.error("Error fetching anime details: %s", e)
+            return None
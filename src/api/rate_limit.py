@@ -0,0 +1,57 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that talks to the API.
+
+    ``rate`` tokens are added per second up to ``burst``; each request takes one
+    token and blocks until one is available.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, reserve: float = 0):
+        """Take a token, blocking until one is free.
+
+        With ``reserve``, wait until that many tokens would still be left, so
+        background work never uses up what foreground requests need.
+        """
+        reserve = min(reserve, self.burst - 1)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1 + reserve:
+                    self.tokens -= 1
+                    return
+                wait = (1 + reserve - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def configure(self, rate: float, burst: int = None):
+        with self.lock:
+            self.rate = rate
+            self.burst = burst or max(1, int(rate))
+            self.tokens = min(self.tokens, self.burst)
+
+
+class BackgroundRateLimiter:
+    """Low-priority view of another limiter: same budget, but leaves ``reserve`` tokens alone."""
+
+    def __init__(self, limiter: RateLimiter, reserve: float = 3):
+        self.limiter = limiter
+        self.reserve = reserve
+
+    def acquire(self):
+        self.limiter.acquire(reserve=self.reserve)
+
+
+# Every JikanClient uses this limiter unless given its own, so GUI threads,
+# prefetchers and CLI workers in one process stay within the same budget.
+shared_rate_limiter = RateLimiter()
@@ -0,0 +1,225 @@
+"""Pluggable HTTP transport for the API client and the image loader.
+
+By default requests go to the network. A recording transport also saves every
+response into an archive, and a replay transport serves responses from such
+an archive without any network access, optionally with simulated latency.
+This makes demos and performance runs deterministic and offline.
+
+Select a transport with ``set_transport`` or with environment variables:
+
+    PYITSU_TRANSPORT=record:/path/session.har.zip
+    PYITSU_TRANSPORT=replay:/path/session.har.zip
+    PYITSU_REPLAY_LATENCY=0.05     # seconds added to each replayed response
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zipfile
+from typing import Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+# Only these response headers are kept in archives
+KEPT_HEADERS = ("Content-Type", "Content-Encoding", "ETag", "Last-Modified", "Cache-Control")
+
+
+def request_key(url: str, params: dict = None) -> str:
+    """Canonical key for a GET request: the URL with its query parameters sorted."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class Transport:
+    """Performs GET requests and returns ``requests.Response`` objects."""
+
+    def get(self, url: str, params: dict = None, headers: dict = None, timeout: float = None) -> requests.Response:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """Talks to the network, reusing one connection pool per thread."""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        return session
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        return self._session().get(url, params=params, headers=headers, timeout=timeout)
+
+
+class HttpArchive:
+    """Zip file holding an index of responses plus their bodies.
+
+    Bodies are stored once per distinct content (by SHA-1), deflate-compressed,
+    so repeated or identical responses cost almost nothing.
+    """
+
+    def __init__(self, path: str, mode: str = "r"):
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.index = {}
+        if mode == "r":
+            self.zip = zipfile.ZipFile(path, "r")
+            self.index = json.loads(self.zip.read(INDEX_NAME))
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            if os.path.exists(path):
+                # Keep earlier recordings and add to them
+                with zipfile.ZipFile(path, "r") as existing:
+                    self.index = json.loads(existing.read(INDEX_NAME))
+                self.zip = zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED)
+            else:
+                self.zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self.bodies = set(name for name in self.zip.namelist() if name != INDEX_NAME)
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, key: str, response: requests.Response):
+        body = response.content
+        name = "bodies/" + hashlib.sha1(body).hexdigest()
+        entry = {
+            "status": response.status_code,
+            "url": response.url,
+            "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+            "body": name,
+            "elapsed": response.elapsed.total_seconds() if response.elapsed else 0.0,
+        }
+        with self.lock:
+            if name not in self.bodies:
+                self.zip.writestr(name, body)
+                self.bodies.add(name)
+            self.index[key] = entry
+
+    def lookup(self, key: str) -> Optional[requests.Response]:
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        with self.lock:
+            body = self.zip.read(entry["body"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        # Bodies are stored decoded, so drop the encoding header
+        response.headers.pop("Content-Encoding", None)
+        response._content = body
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        with self.lock:
+            if self.zip is None:
+                return
+            if self.mode != "r":
+                # A zip can't replace an entry, so the index is written once, last
+                if INDEX_NAME in self.zip.namelist():
+                    self._rewrite_without_index()
+                self.zip.writestr(INDEX_NAME, json.dumps(self.index, separators=(",", ":")))
+            self.zip.close()
+            self.zip = None
+
+    def _rewrite_without_index(self):
+        tmp_path = self.path + ".tmp"
+        self.zip.close()
+        with zipfile.ZipFile(self.path, "r") as source, \
+                zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                if item.filename != INDEX_NAME:
+                    target.writestr(item, source.read(item.filename))
+        os.replace(tmp_path, self.path)
+        self.zip = zipfile.ZipFile(self.path, "a", compression=zipfile.ZIP_DEFLATED)
+
+
+class RecordingTransport(Transport):
+    """Forwards requests to ``inner`` and saves every response to an archive."""
+
+    def __init__(self, path: str, inner: Transport = None):
+        self.inner = inner or RequestsTransport()
+        self.archive = HttpArchive(path, mode="a")
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        response = self.inner.get(url, params=params, headers=headers, timeout=timeout)
+        self.archive.add(request_key(url, params), response)
+        return response
+
+    def close(self):
+        self.archive.close()
+        logger.info("Recorded %d responses to %s", len(self.archive), self.archive.path)
+
+
+class ReplayTransport(Transport):
+    """Serves responses from an archive. Unknown requests fail like a network error."""
+
+    def __init__(self, path: str, latency: float = 0.0):
+        self.archive = HttpArchive(path, mode="r")
+        self.latency = latency
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        key = request_key(url, params)
+        response = self.archive.lookup(key)
+        if self.latency:
+            time.sleep(self.latency)
+        if response is None:
+            raise requests.ConnectionError(f"No recorded response for {key}")
+        return response
+
+    def close(self):
+        self.archive.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def transport_from_env() -> Transport:
+    spec = os.environ.get("PYITSU_TRANSPORT", "")
+    mode, _, path = spec.partition(":")
+    if mode == "record" and path:
+        return RecordingTransport(path)
+    if mode == "replay" and path:
+        return ReplayTransport(path, latency=float(os.environ.get("PYITSU_REPLAY_LATENCY", 0) or 0))
+    if spec:
+        logger.warning("Ignoring invalid PYITSU_TRANSPORT=%r", spec)
+    return RequestsTransport()
+
+
+def get_transport() -> Transport:
+    """Return the process-wide transport, creating it from the environment on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = transport_from_env()
+                atexit.register(_transport.close)
+    return _transport
+
+
+def set_transport(transport: Transport):
+    """Replace the process-wide transport, closing the previous one."""
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    if previous is not None:
+        previous.close()
+    atexit.register(transport.close)
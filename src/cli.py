@@ -0,0 +1,209 @@
+"""Headless command line interface for pyitsu.
+
+Runs on top of JikanClient without importing Qt, so it can be used from
+scripts and scheduled jobs. Records are written as soon as each page or
+detail request completes.
+
+Examples:
+    python src/cli.py search "cowboy bebop" --pages 3
+    python src/cli.py --format csv --output top.csv top --pages 10
+    python src/cli.py details 1 7442
+    python src/cli.py --concurrency 8 --output details.ndjson bulk ids.txt
+    python src/cli.py local --years 2010-2019 --min-score 80 --top 20
+    python src/cli.py --record session.zip top --pages 5
+    python src/cli.py --replay session.zip top --pages 5
+"""
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from api.jikan_client import JikanClient
+from api.rate_limit import shared_rate_limiter
+from api.transport import RecordingTransport, ReplayTransport, set_transport
+from models.catalog_store import CatalogStore
+from utils.metrics import registry
+
+# Sort keys of the local command -> whether the highest value comes first
+LOCAL_SORTS = {"score": True, "popularity": False, "year": True, "episodes": True, "title": False}
+
+
+class RecordWriter:
+    """Streams records to a file object as NDJSON or CSV."""
+
+    def __init__(self, stream, fmt: str):
+        self.stream = stream
+        self.format = fmt
+        self.csv_writer = None
+        self.count = 0
+
+    @staticmethod
+    def _flatten(record: dict) -> dict:
+        return {key: "; ".join(map(str, value)) if isinstance(value, list) else value
+                for key, value in record.items()}
+
+    def write_many(self, records: Iterable[dict]):
+        for record in records:
+            if self.format == "csv":
+                if self.csv_writer is None:
+                    # The first record decides the columns
+                    self.csv_writer = csv.DictWriter(self.stream, fieldnames=list(record), extrasaction="ignore")
+                    self.csv_writer.writeheader()
+                self.csv_writer.writerow(self._flatten(record))
+            else:
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.count += 1
+        self.stream.flush()
+
+
+def iter_pages(client: JikanClient, params: dict, pages: int, concurrency: int) -> Iterator[List[dict]]:
+    """Yield result pages in order. The first page reports the total, the rest are fetched concurrently."""
+    first, total = client.fetch_anime_page(params, 0)
+    if not first:
+        return
+    yield first
+
+    offsets = list(range(len(first), total, client.page_limit))[:max(0, pages - 1)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for results, _ in executor.map(lambda offset: client.fetch_anime_page(params, offset), offsets):
+            yield results
+
+
+def iter_details(client: JikanClient, anime_ids: List[str], concurrency: int) -> Iterator[List[dict]]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for details in executor.map(client.get_anime_details, anime_ids):
+            if details:
+                yield [details]
+
+
+def parse_years(text: Optional[str]) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """'2010-2019' -> (2010, 2019); '2015' -> (2015, 2015); '2010-' and '-2019' leave a bound open."""
+    if not text:
+        return None
+    low, dash, high = text.partition("-")
+    low = int(low) if low else None
+    return low, int(high) if high else (None if dash else low)
+
+
+def iter_local(client: JikanClient, args) -> Iterator[List[dict]]:
+    """Titles in the response cache, filtered and sorted offline by a CatalogStore."""
+    titles = list({title["id"]: title for title in client.cached_titles()}.values())
+    store = CatalogStore(titles)
+    rows = store.select(score=None if args.min_score is None else (args.min_score, None),
+                        year=parse_years(args.years), status=args.status)
+    if args.season_counts:
+        yield [{"year": year, "season": season, "titles": count}
+               for (year, season), count in store.season_counts(rows).items()]
+        return
+    descending = LOCAL_SORTS[args.sort]
+    if args.top:
+        rows = store.top_k(args.sort, args.top, descending, rows)
+    else:
+        rows = store.order(args.sort, descending, rows)
+    yield [titles[row] for row in rows]
+
+
+def read_ids(path: str) -> List[str]:
+    """Read anime ids from a file (or '-' for stdin), one per line; '#' starts a comment."""
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        ids = [line.split("#", 1)[0].strip() for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return [anime_id for anime_id in ids if anime_id]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pyitsu", description="Query anime data from the command line.")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="output format")
+    parser.add_argument("--output", "-o", default="-", help="output file (default: stdout)")
+    parser.add_argument("--concurrency", "-j", type=int, default=4, help="parallel requests")
+    parser.add_argument("--rate", type=float, default=10.0, help="maximum requests per second")
+    parser.add_argument("--page-limit", type=int, default=JikanClient.DEFAULT_PAGE_LIMIT, help="results per page")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the response cache")
+    parser.add_argument("--full-attributes", action="store_true",
+                        help="fetch every attribute on search/top pages, including the synopsis")
+    parser.add_argument("--metrics-out", help="write request metrics as JSON to this file when done")
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--record", metavar="ARCHIVE", help="save every response to this archive")
+    transport.add_argument("--replay", metavar="ARCHIVE", help="serve responses from this archive, offline")
+    parser.add_argument("--replay-latency", type=float, default=0.0, help="seconds added to each replayed response")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="search anime by title")
+    search.add_argument("query")
+    search.add_argument("--pages", type=int, default=1)
+
+    top = commands.add_parser("top", help="list top rated anime")
+    top.add_argument("--pages", type=int, default=1)
+
+    details = commands.add_parser("details", help="full details for one or more ids")
+    details.add_argument("ids", nargs="+")
+
+    bulk = commands.add_parser("bulk", help="full details for ids read from a file")
+    bulk.add_argument("file", help="file with one anime id per line, or '-' for stdin")
+
+    local = commands.add_parser("local", help="filter and sort the titles in the response cache, offline")
+    local.add_argument("--sort", choices=list(LOCAL_SORTS), default="score")
+    local.add_argument("--top", type=int, help="only the first N titles")
+    local.add_argument("--min-score", type=float)
+    local.add_argument("--years", help="start year or range, e.g. 2010-2019")
+    local.add_argument("--status", action="append", help="only titles with this status (repeatable)")
+    local.add_argument("--season-counts", action="store_true", help="output the number of titles per start season")
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    shared_rate_limiter.configure(args.rate)
+    if args.record:
+        set_transport(RecordingTransport(args.record))
+    elif args.replay:
+        set_transport(ReplayTransport(args.replay, latency=args.replay_latency))
+    client = JikanClient(page_limit=args.page_limit, use_cache=not args.no_cache,
+                         sparse=not args.full_attributes)
+    concurrency = max(1, args.concurrency)
+
+    if args.command == "search":
+        pages = iter_pages(client, JikanClient.search_params(args.query), args.pages, concurrency)
+    elif args.command == "top":
+        pages = iter_pages(client, JikanClient.top_params(), args.pages, concurrency)
+    elif args.command == "details":
+        pages = iter_details(client, args.ids, concurrency)
+    elif args.command == "local":
+        pages = iter_local(client, args)
+    else:
+        pages = iter_details(client, read_ids(args.file), concurrency)
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    writer = RecordWriter(stream, args.format)
+    try:
+        for records in pages:
+            writer.write_many(records)
+    except requests.RequestException as e:
+        print(f"Request failed: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output closed early, e.g. piped into head
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        if args.metrics_out:
+            registry.dump_json(args.metrics_out)
+
+    print(f"{writer.count} records", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,13 @@
 import sys
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
+from ui.theme import apply_theme
 from ui.components.splash_screen import SplashScreen
 from PySide6.QtCore import QTimer
 
 def main():
     app = QApplication(sys.argv)
+    apply_theme(app)
     
     # Create and show splash screen
     splash = SplashScreen()
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, List, Set
+
+# Facet name -> result field holding its value(s); list fields give several values per title
+FACETS = {
+    "genre": "genres",
+    "category": "categories",
+    "status": "status",
+    "season": "season",
+    "year": "year",
+    "age_rating": "age_rating",
+}
+
+
+class FacetIndex:
+    """Bitmap index over result dicts for faceted filtering.
+
+    Every facet value has a Python int used as a bitset: bit ``i`` is set
+    when result ``i`` has that value. A selection ORs the bitsets of the
+    values checked within a facet and ANDs across facets, so filtering and
+    counting are a handful of big-int operations however many titles are
+    loaded.
+
+    A selection maps facet names to sets of values; facets without values
+    don't filter.
+    """
+
+    def __init__(self, results: Iterable[dict] = ()):
+        self.results = []
+        self.bits = {facet: {} for facet in FACETS}  # facet -> value -> bitset
+        self.extend(results)
+
+    @property
+    def all(self) -> int:
+        return (1 << len(self.results)) - 1
+
+    @staticmethod
+    def _values(result: dict, field: str) -> List[str]:
+        value = result.get(field)
+        if value in (None, "", "N/A"):
+            return []
+        return [str(v) for v in value if v] if isinstance(value, list) else [str(value)]
+
+    def extend(self, results: Iterable[dict]):
+        """Index more results after those already indexed."""
+        for result in results:
+            bit = 1 << len(self.results)
+            self.results.append(result)
+            for facet, field in FACETS.items():
+                values = self.bits[facet]
+                for value in self._values(result, field):
+                    values[value] = values.get(value, 0) | bit
+
+    def values(self, facet: str) -> List[str]:
+        return sorted(self.bits[facet])
+
+    def mask(self, selection: Dict[str, Set[str]], skip: str = None) -> int:
+        """Bitset of the results matching ``selection``, ignoring facet ``skip``."""
+        mask = self.all
+        for facet, checked in selection.items():
+            if facet == skip or not checked:
+                continue
+            values = self.bits[facet]
+            matching = 0
+            for value in checked:
+                matching |= values.get(value, 0)
+            mask &= matching
+        return mask
+
+    def rows(self, selection: Dict[str, Set[str]]) -> List[int]:
+        """Positions of the results matching ``selection``, in order."""
+        if not any(selection.values()):
+            return list(range(len(self.results)))
+        # Scan the bits as text, lowest first; find() skips runs of zeros in C
+        bits = bin(self.mask(selection))[:1:-1]
+        matched = []
+        i = bits.find("1")
+        while i >= 0:
+            matched.append(i)
+            i = bits.find("1", i + 1)
+        return matched
+
+    def filter(self, selection: Dict[str, Set[str]]) -> List[dict]:
+        """Results matching ``selection``, in their original order."""
+        return [self.results[i] for i in self.rows(selection)]
+
+    def counts(self, facet: str, selection: Dict[str, Set[str]]) -> Dict[str, int]:
+        """How many results each value of ``facet`` would match, given the other facets' selection."""
+        base = self.mask(selection, skip=facet)
+        return {value: (bits & base).bit_count() for value, bits in self.bits[facet].items()}
@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from utils.paths import app_data_dir
+from .session import RESULT_FIELDS
+
+# List name -> column flagging the titles on it
+LISTS = {"watchlist": "watchlist", "favorites": "favorite"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    id TEXT PRIMARY KEY,
+    watchlist INTEGER NOT NULL DEFAULT 0,
+    favorite INTEGER NOT NULL DEFAULT 0,
+    status TEXT,
+    next_airing TEXT,
+    added REAL NOT NULL,
+    refreshed REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS watchlist_by_status ON titles (status, next_airing) WHERE watchlist = 1;
+CREATE INDEX IF NOT EXISTS watchlist_by_airing ON titles (next_airing) WHERE watchlist = 1;
+CREATE INDEX IF NOT EXISTS favorites_by_status ON titles (status, next_airing) WHERE favorite = 1;
+CREATE INDEX IF NOT EXISTS favorites_by_airing ON titles (next_airing) WHERE favorite = 1;
+CREATE INDEX IF NOT EXISTS titles_by_refreshed ON titles (refreshed);
+"""
+
+
+class LibraryStore:
+    """The user's watchlist and favorites, in SQLite.
+
+    Each saved title is one row holding its result fields as JSON, plus the
+    status and next airing date as columns. Both lists have partial indexes on
+    those, so listing a list (optionally by status) or its next airings is a
+    single index scan. ``refreshed`` records when the API last confirmed a
+    title's data; :meth:`stale` picks what a background refresh should fetch.
+
+    One connection shared by every thread, serialized by a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(app_data_dir(), "library.sqlite3")
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    @staticmethod
+    def _column(list_name: str) -> str:
+        try:
+            return LISTS[list_name]
+        except KeyError:
+            raise ValueError(f"Unknown list: {list_name!r}") from None
+
+    @staticmethod
+    def _pack(anime: dict) -> str:
+        return json.dumps({field: anime.get(field) for field in RESULT_FIELDS}, separators=(",", ":"))
+
+    def set(self, list_name: str, anime: dict, on: bool = True):
+        """Add ``anime`` to a list, or take it off; titles on no list are forgotten."""
+        column = self._column(list_name)
+        with self.lock, self.connection:
+            if on:
+                self.connection.execute(
+                    f"INSERT INTO titles (id, {column}, status, next_airing, added, data) VALUES (?, 1, ?, ?, ?, ?) "
+                    f"ON CONFLICT (id) DO UPDATE SET {column} = 1",
+                    (str(anime["id"]), anime.get("status"), anime.get("next_airing"), time.time(),
+                     self._pack(anime)))
+            else:
+                self.connection.execute(f"UPDATE titles SET {column} = 0 WHERE id = ?", (str(anime["id"]),))
+                self.connection.execute("DELETE FROM titles WHERE id = ? AND watchlist = 0 AND favorite = 0",
+                                        (str(anime["id"]),))
+
+    def lists(self, anime_id) -> Dict[str, bool]:
+        """Which lists ``anime_id`` is on, by list name."""
+        with self.lock:
+            row = self.connection.execute("SELECT watchlist, favorite FROM titles WHERE id = ?",
+                                          (str(anime_id),)).fetchone()
+        return {name: bool(row and row[i]) for i, name in enumerate(LISTS)}
+
+    def count(self, list_name: str) -> int:
+        column = self._column(list_name)
+        with self.lock:
+            return self.connection.execute(f"SELECT count(*) FROM titles WHERE {column} = 1").fetchone()[0]
+
+    def titles(self, list_name: str, status: str = None) -> List[dict]:
+        """The titles on a list, soonest next airing first and those without one after."""
+        column = self._column(list_name)
+        query = f"SELECT data FROM titles WHERE {column} = 1"
+        params = ()
+        if status is not None:
+            query += " AND status = ?"
+            params = (status,)
+        with self.lock:
+            rows = self.connection.execute(query + " ORDER BY next_airing", params).fetchall()
+        titles = [json.loads(data) for data, in rows]
+        # NULLs sort first in SQLite; a stable sort moves them last without another query
+        return sorted(titles, key=lambda anime: anime.get("next_airing") is None)
+
+    def upcoming(self, list_name: str, after: str, limit: int = 10) -> List[dict]:
+        """Titles on a list whose next episode airs at or after ``after`` (ISO 8601), soonest first."""
+        column = self._column(list_name)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT data FROM titles WHERE {column} = 1 AND next_airing >= ? ORDER BY next_airing LIMIT ?",
+                (after, limit)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def stale(self, before: float, limit: int) -> List[str]:
+        """Ids of up to ``limit`` titles not refreshed since ``before``, least recently refreshed first."""
+        with self.lock:
+            rows = self.connection.execute("SELECT id FROM titles WHERE refreshed < ? ORDER BY refreshed LIMIT ?",
+                                           (before, limit)).fetchall()
+        return [anime_id for anime_id, in rows]
+
+    def update(self, titles: Iterable[dict], refreshed: Iterable[str] = ()):
+        """Store fresh data for saved titles and mark them, and the ids in ``refreshed``, as refreshed.
+
+        Fields missing from the new data (e.g. the synopsis, which list
+        requests leave out) keep their saved values. Titles that are not
+        saved are ignored.
+        """
+        titles = {str(anime["id"]): anime for anime in titles}
+        ids = set(titles) | {str(anime_id) for anime_id in refreshed}
+        now = time.time()
+        with self.lock, self.connection:
+            placeholders = ",".join("?" * len(titles))
+            saved = dict(self.connection.execute(
+                f"SELECT id, data FROM titles WHERE id IN ({placeholders})", list(titles)).fetchall())
+            rows = []
+            for anime_id, anime in titles.items():
+                if anime_id in saved:
+                    data = dict(json.loads(saved[anime_id]), **{field: anime[field] for field in RESULT_FIELDS
+                                                                if field in anime})
+                    rows.append((data.get("status"), data.get("next_airing"), now, self._pack(data), anime_id))
+            self.connection.executemany(
+                "UPDATE titles SET status = ?, next_airing = ?, refreshed = ?, data = ? WHERE id = ?", rows)
+            self.connection.executemany("UPDATE titles SET refreshed = ? WHERE id = ?",
+                                        [(now, anime_id) for anime_id in ids - set(titles)])
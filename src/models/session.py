@@ -0,0 +1,78 @@
+import json
+import os
+import time
+from typing import List, Optional
+
+from utils.paths import app_data_dir
+
+# Fields kept per result. Rows are stored as lists in this order to keep the file small.
+RESULT_FIELDS = ["id", "title", "image_url", "score", "synopsis", "episodes", "status", "aired",
+                 "genres", "categories", "age_rating", "subtype", "year", "season",
+                 "next_airing", "popularity"]
+
+
+def pack_results(results: List[dict]) -> dict:
+    """Convert a list of result dicts into a compact column header plus rows."""
+    return {
+        "fields": RESULT_FIELDS,
+        "rows": [[anime.get(field) for field in RESULT_FIELDS] for anime in results],
+    }
+
+
+def unpack_results(packed: dict) -> List[dict]:
+    """Inverse of :func:`pack_results`."""
+    fields = packed.get("fields", [])
+    return [dict(zip(fields, row)) for row in packed.get("rows", [])]
+
+
+class SessionStore:
+    """Saves the state of the last session so the next launch can start warm.
+
+    A snapshot holds the configuration, the last query, the results it
+    produced, the scroll position and the ids of anime whose posters had been
+    decoded (so those can be loaded first, from the disk cache).
+    """
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(app_data_dir(), "session.json")
+
+    def age(self) -> Optional[float]:
+        """Seconds since the snapshot was saved, or None if there is none."""
+        try:
+            return max(0.0, time.time() - os.path.getmtime(self.path))
+        except OSError:
+            return None
+
+    def load(self) -> Optional[dict]:
+        """Return the last snapshot, or None if there is none or it can't be read."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error loading session: {e}")
+            return None
+
+        if snapshot.get("version") != self.VERSION:
+            return None
+        snapshot["results"] = unpack_results(snapshot.get("results", {}))
+        return snapshot
+
+    def save(self, config: dict, query: str, results: List[dict], scroll: int, thumbnails: List[str]):
+        snapshot = {
+            "version": self.VERSION,
+            "config": config,
+            "query": query,
+            "results": pack_results(results),
+            "scroll": scroll,
+            "thumbnails": thumbnails,
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving session: {e}")
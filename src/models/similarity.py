@@ -0,0 +1,118 @@
+import threading
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+# Result field -> feature kind and how much a shared value of that kind counts
+FEATURE_FIELDS = {
+    "genres": ("genre", 1.0),
+    "categories": ("category", 1.0),
+    "studios": ("studio", 0.7),
+}
+# Fields kept from each title, for showing it as a recommendation
+TITLE_FIELDS = ("id", "title", "image_url", "score", "episodes", "status")
+
+
+class SimilarityIndex:
+    """Finds titles with similar genres, categories and studios among every title seen locally.
+
+    Each title is a sparse binary vector over "kind:value" features, stored
+    column-wise: one array of title rows per feature. Features are weighted by
+    inverse document frequency, so sharing a rare category counts for more
+    than sharing "Action". Similarity to a title is the cosine between the
+    weighted vectors; the dot products with the whole catalog come from a
+    single ``np.bincount`` over the query's feature columns (a sparse
+    matrix-vector product), followed by an ``argpartition`` top-k.
+
+    Titles can be added from any thread. Results are memoized per title
+    until more titles are added.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = {}  # anime id -> row
+        self.titles = []  # row -> title fields
+        self.features = []  # row -> set of feature ids
+        self.vocabulary = {}  # "kind:value" -> feature id
+        self.boost = []  # feature id -> kind weight
+        self.postings = []  # feature id -> rows having it
+        self.memo = {}  # (anime id, k) -> results
+        # Arrays derived from the above, refreshed on the first query after additions
+        self._changed = set()  # feature ids whose rows changed
+        self._columns = []  # feature id -> rows as an array
+        self._weights = None
+        self._norms = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, titles: Iterable[dict]):
+        """Add titles, or merge new features (e.g. studios from details) into known ones."""
+        with self.lock:
+            for title in titles:
+                anime_id = title.get("id")
+                if anime_id is None:
+                    continue
+                features = set()
+                for field, (kind, weight) in FEATURE_FIELDS.items():
+                    for value in title.get(field) or []:
+                        key = f"{kind}:{value}"
+                        if key not in self.vocabulary:
+                            self.vocabulary[key] = len(self.boost)
+                            self.boost.append(weight)
+                            self.postings.append([])
+                        features.add(self.vocabulary[key])
+                row = self.rows.get(anime_id)
+                if row is None:
+                    row = self.rows[anime_id] = len(self.titles)
+                    self.titles.append({field: title.get(field) for field in TITLE_FIELDS})
+                    self.features.append(set())
+                new = features - self.features[row]
+                self.features[row] |= new
+                for feature in new:
+                    self.postings[feature].append(row)
+                self._changed |= new
+
+    def _refresh(self):
+        """Bring columns, IDF weights and row norms up to date after additions."""
+        self._columns.extend(None for _ in range(len(self.postings) - len(self._columns)))
+        for feature in self._changed:
+            self._columns[feature] = np.array(self.postings[feature], dtype=np.int32)
+        self._changed.clear()
+        lengths = np.array([len(rows) for rows in self._columns])
+        # Every title counts in document frequencies, so all weights and norms move
+        idf = np.log((1 + len(self.titles)) / (1 + lengths)) + 1
+        self._weights = (idf * np.array(self.boost)) ** 2
+        squared = np.bincount(np.concatenate(self._columns), weights=np.repeat(self._weights, lengths),
+                              minlength=len(self.titles))
+        self._norms = np.sqrt(squared)
+        self.memo.clear()
+
+    def similar(self, anime_id, k: int = 10) -> List[Tuple[dict, float]]:
+        """Up to ``k`` ``(title, cosine similarity)`` pairs, most similar first, excluding the title itself."""
+        with self.lock:
+            row = self.rows.get(anime_id)
+            if row is None or not self.features[row]:
+                return []
+            if self._changed or self._norms is None or len(self._norms) != len(self.titles):
+                self._refresh()
+            if (anime_id, k) in self.memo:
+                return self.memo[(anime_id, k)]
+
+            features = list(self.features[row])
+            columns = [self._columns[feature] for feature in features]
+            weights = np.repeat(self._weights[features], [len(rows) for rows in columns])
+            dots = np.bincount(np.concatenate(columns), weights=weights, minlength=len(self.titles))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = dots / (self._norms * self._norms[row])
+            scores[row] = 0
+            scores = np.nan_to_num(scores)
+            candidates = min(k, int(np.count_nonzero(scores)))
+            if candidates == 0:
+                top = np.array([], dtype=np.int64)
+            else:
+                top = np.argpartition(-scores, candidates - 1)[:candidates]
+                top = top[np.argsort(-scores[top], kind="stable")]
+            results = [(self.titles[i], float(scores[i])) for i in top]
+            self.memo[(anime_id, k)] = results
+            return results
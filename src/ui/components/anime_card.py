@@ -1,55 +1,86 @@
 from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, 
                             QWidget, QSizePolicy)
-from PySide6.QtCore import Qt, Signal, QPropertyAnimation, QEasingCurve, QPoint
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, Signal, QPointF, QRectF
+from PySide6.QtGui import QPixmap, QPainter, QPainterPath, QColor, QPen
+from utils.profiler import span
+from ..theme import ACCENT, SURFACE_HIGHLIGHT
+from .hover_driver import HoverDriver
+
+
+class _HoverOverlay(QWidget):
+    """Paints a card's hover effect over its children: the poster zoomed in
+    a little and an accent outline, both scaled by the card's hover progress.
+    
+    Only ever repainted, never moved or resized, so hovering doesn't touch
+    the grid's layout.
+    """
+    ZOOM = 0.04
+    RADIUS = 12
+    
+    def __init__(self, card):
+        super().__init__(card)
+        self.card = card
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setGeometry(card.rect())
+    
+    def paintEvent(self, event):
+        progress = self.card.hover_progress
+        if progress <= 0:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        outline = QRectF(self.rect()).adjusted(1, 1, -1, -1)
+        
+        pixmap = self.card.image_label.pixmap()
+        if not pixmap.isNull():
+            image_rect = QRectF(self.card.image_label.geometry())
+            # The info panel overlaps the bottom of the image label
+            visible = QRectF(image_rect)
+            visible.setBottom(self.card.info_container.geometry().top())
+            clip = QPainterPath()
+            clip.addRoundedRect(outline, self.RADIUS, self.RADIUS)
+            painter.save()
+            painter.setClipPath(clip)
+            painter.setClipRect(visible, Qt.ClipOperation.IntersectClip)
+            painter.fillRect(visible, QColor(SURFACE_HIGHLIGHT))
+            painter.translate(image_rect.center())
+            painter.scale(1 + self.ZOOM * progress, 1 + self.ZOOM * progress)
+            painter.drawPixmap(QPointF(-pixmap.width() / 2, -pixmap.height() / 2), pixmap)
+            painter.restore()
+        
+        color = QColor(ACCENT)
+        color.setAlphaF(progress)
+        painter.setPen(QPen(color, 2))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(outline, self.RADIUS, self.RADIUS)
 
 class AnimeCard(QFrame):
     clicked = Signal(dict)
+    # Pointer entered / left the card; the main window turns a long enough hover into a prefetch
+    hovered = Signal(dict)
+    unhovered = Signal(dict)
+    IMAGE_SIZE = (280, 380)
     
-    def __init__(self, anime_data, image_loader):
+    def __init__(self, anime_data, image_loader, show_score=True, show_episodes=True, show_status=True,
+                 load_image=True):
         super().__init__()
         self.image_loader = image_loader
         self.image_url = anime_data['image_url']
         self.anime_data = anime_data
+        # Whether the poster should be shown; offscreen cards release theirs
+        self.wants_image = False
+        self.image_failed = False
         
-        self.setStyleSheet("""
-            AnimeCard {
-                background-color: #1a1a1a;
-                border-radius: 12px;
-                border: 1px solid #2a2a2a;
-            }
-            AnimeCard:hover {
-                background-color: #2a2a2a;
-                border: 1px solid #00b4d8;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            .title {
-                font-size: 15px;
-                font-weight: bold;
-                margin-bottom: 8px;
-                color: #ffffff;
-            }
-            .score {
-                color: #00b4d8;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            .info {
-                color: #a0a0a0;
-                font-size: 13px;
-            }
-        """)
+        self.setObjectName("AnimeCard")
         
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         self.setFixedSize(280, 420)
         
-        # Create animation for hover effect
-        self.animation = QPropertyAnimation(self, b"pos")
-        self.animation.setDuration(200)
-        self.animation.setEasingCurve(QEasingCurve.Type.OutQuad)
+        # Hover effect, from 0 (resting) to 1 (hovered); animated by the shared HoverDriver
+        self.hover_progress = 0.0
+        # Removed from the grid mid-animation: the driver stops moving it
+        HoverDriver.instance().watch(self)
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -60,80 +91,158 @@ class AnimeCard(QFrame):
         self.image_label = QLabel()
         self.image_label.setFixedSize(280, 380)
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setStyleSheet("""
-            QLabel {
-                background-color: #2a2a2a;
-                border-top-left-radius: 12px;
-                border-top-right-radius: 12px;
-            }
-        """)
+        self.image_label.setObjectName("CardImage")
         layout.addWidget(self.image_label)
         
         # Info container
         info_container = QWidget()
-        info_container.setStyleSheet("""
-            QWidget {
-                background-color: #1a1a1a;
-                border-bottom-left-radius: 12px;
-                border-bottom-right-radius: 12px;
-                padding: 16px;
-            }
-        """)
+        info_container.setObjectName("CardInfo")
+        self.info_container = info_container
         info_layout = QVBoxLayout(info_container)
         info_layout.setContentsMargins(16, 16, 16, 16)
         info_layout.setSpacing(8)
         
         # Title
-        title = QLabel(anime_data['title'])
-        title.setProperty("class", "title")
-        title.setWordWrap(True)
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        info_layout.addWidget(title)
+        self.title_label = QLabel(anime_data['title'])
+        self.title_label.setProperty("class", "title")
+        self.title_label.setWordWrap(True)
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        info_layout.addWidget(self.title_label)
         
         # Score and info row
         info_row = QHBoxLayout()
         info_row.setSpacing(12)
         
         # Score
-        score = float(anime_data['score']) if anime_data['score'] != 'N/A' else 0
-        score_label = QLabel(f"★ {score:.1f}" if score else "★ N/A")
-        score_label.setProperty("class", "score")
-        info_row.addWidget(score_label)
+        self.score_label = QLabel(self._score_text(anime_data['score']))
+        self.score_label.setProperty("class", "score")
+        info_row.addWidget(self.score_label)
         
         # Episodes
-        episodes = QLabel(f"{anime_data['episodes']} eps")
-        episodes.setProperty("class", "info")
-        info_row.addWidget(episodes)
+        self.episodes_label = QLabel(f"{anime_data['episodes']} eps")
+        self.episodes_label.setProperty("class", "info")
+        info_row.addWidget(self.episodes_label)
         
         # Status
-        status = QLabel(anime_data['status'])
-        status.setProperty("class", "info")
-        info_row.addWidget(status)
+        self.status_label = QLabel(anime_data['status'])
+        self.status_label.setProperty("class", "info")
+        info_row.addWidget(self.status_label)
         
         info_layout.addLayout(info_row)
+        self.set_field_visibility(show_score, show_episodes, show_status)
         layout.addWidget(info_container)
         
+        # Created last so it stacks above the other children
+        self.hover_overlay = _HoverOverlay(self)
+        
         # Request image loading
         if self.image_url:
-            self.image_loader.image_loaded.connect(self.on_image_loaded)
-            self.image_loader.enqueue(self.image_url, (280, 380))
+            self._connect_loader()
+        if load_image:
+            self.ensure_image()
+    
+    @staticmethod
+    def _score_text(score) -> str:
+        score = float(score) if score not in ('N/A', None) else 0
+        return f"★ {score:.1f}" if score else "★ N/A"
+    
+    def update_data(self, anime_data):
+        """Show new data for the same anime, touching only what changed."""
+        old = self.anime_data
+        self.anime_data = anime_data
+        if anime_data['title'] != old['title']:
+            self.title_label.setText(anime_data['title'])
+        if anime_data['score'] != old['score']:
+            self.score_label.setText(self._score_text(anime_data['score']))
+        if anime_data['episodes'] != old['episodes']:
+            self.episodes_label.setText(f"{anime_data['episodes']} eps")
+        if anime_data['status'] != old['status']:
+            self.status_label.setText(anime_data['status'])
+        if anime_data['image_url'] != self.image_url:
+            if not self.image_url:
+                self._connect_loader()
+            self.image_url = anime_data['image_url']
+            if self.wants_image:
+                self.release_image()
+                self.ensure_image()
+    
+    def _connect_loader(self):
+        self.image_loader.image_loaded.connect(self.on_image_loaded)
+        self.image_loader.image_failed.connect(self.on_image_failed)
+    
+    def ensure_image(self):
+        """Show the poster: from memory if it is still there, otherwise queue it.
+        
+        Queued posters come from the disk cache when possible, so bringing back
+        a released poster normally costs a decode, not a download.
+        """
+        if self.wants_image or not self.image_url:
+            return
+        self.wants_image = True
+        if self.image_loader.has_failed(self.image_url):
+            self.show_placeholder()
+            return
+        pixmap = self.image_loader.cached_pixmap(self.image_url, self.IMAGE_SIZE)
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
+        else:
+            self.image_loader.enqueue(self.image_url, self.IMAGE_SIZE)
+    
+    def release_image(self):
+        """Drop the poster so its memory can be reclaimed; ``ensure_image`` brings it back."""
+        if not self.wants_image:
+            return
+        self.wants_image = False
+        self.image_failed = False
+        self.image_label.clear()
+    
+    def show_placeholder(self):
+        self.image_failed = True
+        self.image_label.setText("No image")
+    
+    def set_field_visibility(self, show_score: bool, show_episodes: bool, show_status: bool):
+        """Show or hide the score, episodes and status labels in place."""
+        self.score_label.setVisible(show_score)
+        self.episodes_label.setVisible(show_episodes)
+        self.status_label.setVisible(show_status)
+    
+    def apply_display_config(self, config: dict):
+        """Apply the ``show_*`` flags of the main window configuration."""
+        self.set_field_visibility(config["show_score"], config["show_episodes"], config["show_status"])
     
     def enterEvent(self, event):
-        self.animation.setStartValue(self.pos())
-        self.animation.setEndValue(self.pos() + QPoint(0, -10))
-        self.animation.start()
+        HoverDriver.instance().animate(self, 1.0)
+        self.hovered.emit(self.anime_data)
         super().enterEvent(event)
     
     def leaveEvent(self, event):
-        self.animation.setStartValue(self.pos())
-        self.animation.setEndValue(self.pos() + QPoint(0, 10))
-        self.animation.start()
+        HoverDriver.instance().animate(self, 0.0)
+        self.unhovered.emit(self.anime_data)
         super().leaveEvent(event)
     
+    def set_hover_progress(self, progress: float):
+        self.hover_progress = progress
+        self.hover_overlay.update()
+    
     def on_image_loaded(self, url, pixmap):
-        if url == self.image_url:
+        # The same URL may also be loaded at a larger size, e.g. as a details cover
+        if (url == self.image_url and self.wants_image
+                and pixmap.width() <= self.IMAGE_SIZE[0] and pixmap.height() <= self.IMAGE_SIZE[1]):
+            self.image_failed = False
             self.image_label.setPixmap(pixmap)
     
+    def on_image_failed(self, url):
+        if url == self.image_url and self.wants_image:
+            self.show_placeholder()
+    
+    def has_image(self) -> bool:
+        """Whether the poster has been decoded and is being shown."""
+        return not self.image_label.pixmap().isNull()
+    
+    def paintEvent(self, event):
+        with span("paint"):
+            super().paintEvent(event)
+    
     def mousePressEvent(self, event):
         self.clicked.emit(self.anime_data)
         super().mousePressEvent(event) 
@@ -1,63 +1,27 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QScrollArea, QFrame, QSizePolicy)
-from PySide6.QtCore import Qt, QSize
+                             QScrollArea, QFrame, QSizePolicy, QPushButton)
+from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QPixmap, QImage, QPainter
 import requests
 from io import BytesIO
 from PIL import Image
 
 class AnimeDetails(QWidget):
-    def __init__(self, anime_data, image_loader):
+    # A similar title was clicked
+    title_selected = Signal(dict)
+    # List name, anime and whether it was added to or removed from the list
+    list_toggled = Signal(str, dict, bool)
+    LIST_BUTTONS = {
+        "watchlist": ("+ Watchlist", "✓ In watchlist"),
+        "favorites": ("♡ Favorite", "♥ Favorite"),
+    }
+    
+    def __init__(self, anime_data, image_loader, similar=None, lists=None):
         super().__init__()
         self.anime_data = anime_data
         self.image_loader = image_loader
         
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #0a0a0a;
-                color: #ffffff;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            .title {
-                font-size: 36px;
-                font-weight: bold;
-                color: #ffffff;
-            }
-            .subtitle {
-                font-size: 24px;
-                color: #00b4d8;
-            }
-            .info-label {
-                font-size: 16px;
-                color: #ffffff;
-            }
-            .info-value {
-                font-size: 16px;
-                color: #00b4d8;
-            }
-            .synopsis {
-                font-size: 16px;
-                color: #ffffff;
-                line-height: 1.6;
-            }
-            .genre-tag {
-                background-color: #00b4d8;
-                color: #ffffff;
-                padding: 6px 12px;
-                border-radius: 15px;
-                font-size: 14px;
-                margin: 4px;
-            }
-            .section-title {
-                font-size: 20px;
-                font-weight: bold;
-                color: #ffffff;
-                margin-top: 20px;
-                margin-bottom: 10px;
-            }
-        """)
+        self.setObjectName("AnimeDetails")
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -68,28 +32,6 @@ class AnimeDetails(QWidget):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-                padding-right: 20px;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #1a1a1a;
-                width: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #00b4d8;
-                border-radius: 5px;
-                min-height: 30px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-            }
-        """)
         
         content = QWidget()
         content_layout = QVBoxLayout(content)
@@ -105,30 +47,24 @@ class AnimeDetails(QWidget):
         # Cover image
         cover_container = QWidget()
         cover_container.setFixedSize(400, 600)
-        cover_container.setStyleSheet("""
-            QWidget {
-                background-color: #1a1a1a;
-                border-radius: 12px;
-                overflow: hidden;
-            }
-        """)
+        cover_container.setObjectName("CoverContainer")
         cover_layout = QVBoxLayout(cover_container)
         cover_layout.setContentsMargins(0, 0, 0, 0)
         
         self.cover_label = QLabel()
         self.cover_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.cover_label.setFixedSize(400, 600)
-        self.cover_label.setStyleSheet("""
-            QLabel {
-                background-color: transparent;
-            }
-        """)
+        self.cover_label.setObjectName("CoverImage")
         cover_layout.addWidget(self.cover_label)
         
         # Load cover image
         if self.anime_data.get('cover_url'):
-            self.image_loader.image_loaded.connect(self.on_cover_loaded)
-            self.image_loader.enqueue(self.anime_data['cover_url'], (400, 600))
+            cover = self.image_loader.cached_pixmap(self.anime_data['cover_url'], (400, 600))
+            if cover is not None:
+                self.on_cover_loaded(self.anime_data['cover_url'], cover)
+            else:
+                self.image_loader.image_loaded.connect(self.on_cover_loaded)
+                self.image_loader.enqueue(self.anime_data['cover_url'], (400, 600))
         
         # Info section
         info_section = QWidget()
@@ -155,6 +91,23 @@ class AnimeDetails(QWidget):
             alt_title_label.setWordWrap(True)
             info_layout.addWidget(alt_title_label)
         
+        # Watchlist and favorites toggles, given which lists the title is on
+        if lists is not None:
+            lists_section = QWidget()
+            lists_layout = QHBoxLayout(lists_section)
+            lists_layout.setContentsMargins(0, 0, 0, 0)
+            lists_layout.setSpacing(10)
+            for list_name, (off_text, on_text) in self.LIST_BUTTONS.items():
+                button = QPushButton(on_text if lists.get(list_name) else off_text)
+                button.setObjectName("ListButton")
+                button.setCheckable(True)
+                button.setChecked(bool(lists.get(list_name)))
+                button.toggled.connect(
+                    lambda checked, button=button, list_name=list_name: self.on_list_toggled(button, list_name, checked))
+                lists_layout.addWidget(button)
+            lists_layout.addStretch()
+            info_layout.addWidget(lists_section)
+        
         # Score and rank
         score_section = QWidget()
         score_layout = QHBoxLayout(score_section)
@@ -262,11 +215,6 @@ class AnimeDetails(QWidget):
             synopsis.setWordWrap(True)
             synopsis.setAlignment(Qt.AlignmentFlag.AlignJustify)
             synopsis.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            synopsis.setStyleSheet("""
-                QLabel {
-                    padding-right: 20px;
-                }
-            """)
             synopsis_container_layout.addWidget(synopsis)
             
             content_layout.addWidget(synopsis_container)
@@ -286,18 +234,30 @@ class AnimeDetails(QWidget):
             background.setWordWrap(True)
             background.setAlignment(Qt.AlignmentFlag.AlignJustify)
             background.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            background.setStyleSheet("""
-                QLabel {
-                    padding-right: 20px;
-                }
-            """)
             background_container_layout.addWidget(background)
             
             content_layout.addWidget(background_container)
         
+        # Similar titles from the local catalog, as (title, similarity) pairs
+        if similar:
+            from .similar_titles import SimilarTitles
+            similar_titles = SimilarTitles(similar, self.image_loader)
+            similar_titles.title_selected.connect(self.title_selected)
+            content_layout.addWidget(similar_titles)
+        
+        # Episodes, paged in as the list scrolls
+        if self.anime_data.get('id'):
+            from .episodes_panel import EpisodesPanel
+            content_layout.addWidget(EpisodesPanel(self.anime_data['id'], self.image_loader))
+        
         scroll.setWidget(content)
         layout.addWidget(scroll)
     
+    def on_list_toggled(self, button, list_name, checked):
+        off_text, on_text = self.LIST_BUTTONS[list_name]
+        button.setText(on_text if checked else off_text)
+        self.list_toggled.emit(list_name, self.anime_data, checked)
+    
     def on_cover_loaded(self, url, pixmap):
         if url == self.anime_data.get('cover_url'):
             # Calculate the scaled size maintaining aspect ratio
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal, Qt
+
+from api.jikan_client import JikanClient
+from api.rate_limit import BackgroundRateLimiter, shared_rate_limiter
+from utils.metrics import registry
+
+
+class DetailsPrefetcher(QObject):
+    """Fetches anime details ahead of a click, and keeps recent ones in memory.
+
+    ``prefetch`` is for hover intent: the details are fetched at low priority
+    (leaving part of the shared rate limit to foreground requests), followed
+    by the cover, so that opening the details view finds both in memory.
+    ``cancel`` drops whatever has not started yet. ``fetch`` is for a click
+    and delivers through ``details_ready`` unless ``cached`` already has it.
+
+    GUI thread only; the fetching runs in worker threads.
+    """
+    MAX_ENTRIES = 64
+    COVER_SIZE = (400, 600)
+
+    # Anime id and details, or None when they could not be loaded
+    details_ready = Signal(str, object)
+    _fetched = Signal(str, object)
+
+    def __init__(self, image_loader, parent=None):
+        super().__init__(parent)
+        self.image_loader = image_loader
+        self.client = JikanClient()
+        self.background_client = JikanClient(rate_limiter=BackgroundRateLimiter(shared_rate_limiter))
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="details")
+        self.details = OrderedDict()  # anime id -> details, least recently used first
+        self.futures = {}  # anime id -> future, while fetching
+        self.hovered = None  # anime id whose cover may be prefetched
+        self.wanted = None  # anime id the user clicked and is waiting for
+        self._fetched.connect(self._on_fetched, Qt.ConnectionType.QueuedConnection)
+
+    def cached(self, anime_id):
+        """Details already in memory, or None."""
+        details = self.details.get(anime_id)
+        registry.counter("cache.hits" if details else "cache.misses", tier="memory:details").inc()
+        if details:
+            self.details.move_to_end(anime_id)
+        return details
+
+    def prefetch(self, anime_id):
+        """Start loading details and cover in the background (hover intent)."""
+        self.hovered = anime_id
+        if anime_id in self.details:
+            self._prefetch_cover(self.details[anime_id])
+        elif anime_id not in self.futures:
+            self._submit(anime_id, self.background_client)
+            registry.counter("details.prefetches").inc()
+
+    def cancel(self, anime_id):
+        """The pointer left: drop the prefetch if it has not started."""
+        if self.hovered == anime_id:
+            self.hovered = None
+        future = self.futures.get(anime_id)
+        if future is not None and anime_id != self.wanted and future.cancel():
+            del self.futures[anime_id]
+        details = self.details.get(anime_id)
+        if details and details.get('cover_url'):
+            self.image_loader.cancel(details['cover_url'], self.COVER_SIZE)
+
+    def fetch(self, anime_id):
+        """Load details now; ``details_ready`` is emitted when they arrive."""
+        self.wanted = anime_id
+        # Nothing else queued is worth waiting behind
+        for other, future in list(self.futures.items()):
+            if other != anime_id and future.cancel():
+                del self.futures[other]
+        if anime_id not in self.futures:
+            self._submit(anime_id, self.client)
+
+    def _submit(self, anime_id, client):
+        future = self.executor.submit(client.get_anime_details, anime_id)
+        self.futures[anime_id] = future
+        future.add_done_callback(
+            lambda f: None if f.cancelled() else self._fetched.emit(anime_id, f.exception() or f.result()))
+
+    def _prefetch_cover(self, details):
+        url = details.get('cover_url')
+        if url and self.image_loader.cached_pixmap(url, self.COVER_SIZE) is None:
+            self.image_loader.enqueue(url, self.COVER_SIZE, self.image_loader.PRIORITY_PREFETCH)
+
+    def _on_fetched(self, anime_id, details):
+        self.futures.pop(anime_id, None)
+        if isinstance(details, Exception):
+            details = None
+        if details:
+            self.details[anime_id] = details
+            self.details.move_to_end(anime_id)
+            while len(self.details) > self.MAX_ENTRIES:
+                self.details.popitem(last=False)
+            if anime_id == self.hovered:
+                self._prefetch_cover(details)
+        if anime_id == self.wanted:
+            self.wanted = None
+            self.details_ready.emit(anime_id, details)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
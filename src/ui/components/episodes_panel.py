@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QPixmap
+from PySide6.QtWidgets import QLabel, QListView, QVBoxLayout, QWidget
+
+from api.jikan_client import JikanClient
+from ..theme import SURFACE_HIGHLIGHT
+from .error_handler import ErrorHandler
+
+
+class EpisodeListModel(QAbstractListModel):
+    """Episodes of one anime, fetched a page at a time as the view asks for more.
+
+    The view calls ``fetchMore`` when scrolled to the end; each call advances
+    the client's page iterator in a worker thread. Thumbnails are requested
+    from the shared image loader only when a row is painted, and are kept
+    by its pixmap manager rather than by the model.
+    """
+    THUMBNAIL_SIZE = (160, 90)
+
+    # Emitted once every episode is loaded, or there turned out to be none
+    finished = Signal()
+    # A page of episodes, or None once there are no more
+    _page_loaded = Signal(object)
+
+    def __init__(self, anime_id, image_loader, parent=None):
+        super().__init__(parent)
+        self.image_loader = image_loader
+        self.episodes = []
+        self.total = None
+        self.rows_by_thumbnail = {}  # thumbnail URL -> row, while loading
+        # Shown until a thumbnail arrives; also gives every row the same height
+        self.placeholder = QPixmap(*self.THUMBNAIL_SIZE)
+        self.placeholder.fill(QColor(SURFACE_HIGHLIGHT))
+        self.pages = JikanClient().iter_episode_pages(anime_id)
+        # One worker: the page iterator must be advanced one step at a time
+        self.executor = executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="episodes")
+        # Not a method: the Python side of the model may be gone by the time this fires
+        self.destroyed.connect(lambda: executor.shutdown(wait=False, cancel_futures=True))
+        self.loading = False
+        self.exhausted = False
+        self._page_loaded.connect(self._on_page_loaded, Qt.ConnectionType.QueuedConnection)
+        self.image_loader.image_loaded.connect(self._on_thumbnail_loaded)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.episodes)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        episode = self.episodes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            details = [part for part in (episode['airdate'],
+                                         f"{episode['length']} min" if episode['length'] else None) if part]
+            return f"{episode['number']}. {episode['title']}\n{' · '.join(details)}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._thumbnail(episode['thumbnail_url'], index.row())
+        return None
+
+    def _thumbnail(self, url, row):
+        if not url or self.image_loader.has_failed(url):
+            return self.placeholder
+        pixmap = self.image_loader.cached_pixmap(url, self.THUMBNAIL_SIZE)
+        if pixmap is None:
+            self.rows_by_thumbnail[url] = row
+            self.image_loader.enqueue(url, self.THUMBNAIL_SIZE)
+            return self.placeholder
+        return pixmap
+
+    def cancel_thumbnails(self, first_row, last_row):
+        """Stop loading thumbnails of rows scrolled out of ``first_row..last_row`` before they start."""
+        for url, row in list(self.rows_by_thumbnail.items()):
+            if not first_row <= row <= last_row and self.image_loader.cancel(
+                    url, self.THUMBNAIL_SIZE, self.image_loader.PRIORITY_VISIBLE):
+                del self.rows_by_thumbnail[url]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.loading or self.exhausted:
+            return
+        self.loading = True
+        self.executor.submit(self._next_page)
+
+    def _next_page(self):
+        try:
+            page = next(self.pages, None)
+        except Exception as e:
+            ErrorHandler.handle_api_error(e)
+            page = None
+        try:
+            self._page_loaded.emit(page)
+        except RuntimeError:
+            # The details view was closed while the page loaded
+            pass
+
+    def _on_page_loaded(self, page):
+        self.loading = False
+        if page is None:
+            self.exhausted = True
+            self.finished.emit()
+            return
+        episodes, self.total = page
+        self.beginInsertRows(QModelIndex(), len(self.episodes), len(self.episodes) + len(episodes) - 1)
+        self.episodes.extend(episodes)
+        self.endInsertRows()
+        self.exhausted = len(self.episodes) >= self.total
+        if self.exhausted:
+            self.finished.emit()
+
+    def _on_thumbnail_loaded(self, url, pixmap):
+        row = self.rows_by_thumbnail.pop(url, None)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class EpisodesPanel(QWidget):
+    """Episode list for the details view; stays cheap however long the series is.
+
+    The list is virtualized (uniform row heights, only visible rows are
+    painted and only their thumbnails loaded) and pages in as it scrolls.
+    """
+    ROW_HEIGHT = 100
+    VISIBLE_ROWS = 5
+
+    def __init__(self, anime_id, image_loader, parent=None):
+        super().__init__(parent)
+        self.setObjectName("EpisodesPanel")
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.title_label = QLabel("Episodios")
+        self.title_label.setProperty("class", "section-title")
+        layout.addWidget(self.title_label)
+
+        self.model = EpisodeListModel(anime_id, image_loader, self)
+        self.model.rowsInserted.connect(self.update_title)
+        self.model.finished.connect(self.update_title)
+
+        self.list_view = QListView()
+        self.list_view.setObjectName("EpisodeList")
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setIconSize(QSize(*EpisodeListModel.THUMBNAIL_SIZE))
+        self.list_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.list_view.setFixedHeight(self.ROW_HEIGHT * self.VISIBLE_ROWS)
+        self.list_view.setModel(self.model)
+        self.list_view.verticalScrollBar().valueChanged.connect(self.on_scroll)
+        layout.addWidget(self.list_view)
+
+    def on_scroll(self):
+        viewport = self.list_view.viewport().rect()
+        first = self.list_view.indexAt(viewport.topLeft()).row()
+        last = self.list_view.indexAt(viewport.bottomLeft()).row()
+        self.model.cancel_thumbnails(max(first, 0), last if last >= 0 else self.model.rowCount())
+
+    def update_title(self):
+        if self.model.total:
+            self.title_label.setText(f"Episodios ({self.model.total})")
+        elif self.model.exhausted:
+            # Nothing to list, e.g. no episode data for this title
+            self.hide()
@@ -1,68 +1,116 @@
-from PySide6.QtWidgets import QMessageBox, QWidget
-from PySide6.QtCore import Qt
+import logging
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QTimer, Signal, Qt
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorReporter(QObject):
+    """Collects errors from any thread and summarizes them without blocking.
+
+    ``report`` may be called from worker threads; the error is queued to the
+    GUI thread, where identical errors are counted instead of repeated. The
+    summary is published through ``summary_changed`` at most every
+    ``THROTTLE_MS``, and cleared once no new errors arrive for ``CLEAR_AFTER_MS``.
+    """
+    THROTTLE_MS = 500
+    CLEAR_AFTER_MS = 10000
+
+    # Summary text and details for a tooltip; both empty when cleared
+    summary_changed = Signal(str, str)
+    _reported = Signal(str, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.errors = OrderedDict()  # (title, message) -> [count, latest details], most recent last
+        self._reported.connect(self._on_reported, Qt.ConnectionType.QueuedConnection)
+
+        self.publish_timer = QTimer(self)
+        self.publish_timer.setSingleShot(True)
+        self.publish_timer.setInterval(self.THROTTLE_MS)
+        self.publish_timer.timeout.connect(self._publish)
+
+        self.clear_timer = QTimer(self)
+        self.clear_timer.setSingleShot(True)
+        self.clear_timer.setInterval(self.CLEAR_AFTER_MS)
+        self.clear_timer.timeout.connect(self.clear)
+
+    def report(self, title: str, message: str, details: str = ""):
+        """Record an error. Thread-safe and never blocks."""
+        self._reported.emit(title, message, details or "")
+
+    def total(self) -> int:
+        return sum(count for count, _ in self.errors.values())
+
+    def clear(self):
+        self.errors.clear()
+        self.summary_changed.emit("", "")
+
+    def _on_reported(self, title, message, details):
+        key = (title, message)
+        entry = self.errors.pop(key, None)
+        if entry is None:
+            logger.warning("%s: %s %s", title, message, details)
+            entry = [0, details]
+        entry[0] += 1
+        entry[1] = details
+        self.errors[key] = entry
+        self.clear_timer.start()
+        if not self.publish_timer.isActive():
+            self.publish_timer.start()
+
+    def _publish(self):
+        if not self.errors:
+            return
+        (title, message), (count, _) = next(reversed(self.errors.items()))
+        text = f"⚠ {title}: {message}" + (f" (×{count})" if count > 1 else "")
+        if len(self.errors) > 1:
+            text += f" · {self.total() - count} more"
+        details = "\n".join(f"{title} (×{count}): {message}\n    {details}"
+                            for (title, message), (count, details) in reversed(self.errors.items()))
+        self.summary_changed.emit(text, details)
+
+
+error_reporter = ErrorReporter()
+
 
 class ErrorHandler:
     @staticmethod
-    def show_error(parent: QWidget, title: str, message: str, details: str = None):
-        """Shows an error message to the user"""
-        msg = QMessageBox(parent)
-        msg.setIcon(QMessageBox.Icon.Critical)
-        msg.setWindowTitle(title)
-        msg.setText(message)
-        if details:
-            msg.setDetailedText(details)
-        msg.setStyleSheet("""
-            QMessageBox {
-                background-color: #1e1e1e;
-            }
-            QMessageBox QLabel {
-                color: white;
-            }
-            QMessageBox QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QMessageBox QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
-        msg.exec()
+    def show_error(title: str, message: str, details: str = None):
+        """Reports an error to the user, through the status bar rather than a dialog.
+
+        Safe to call from any thread."""
+        error_reporter.report(title, message, details)
 
     @staticmethod
-    def handle_api_error(parent: QWidget, error: Exception):
+    def handle_api_error(error: Exception):
         """Handles API specific errors"""
         error_message = str(error)
         if "connection" in error_message.lower():
             ErrorHandler.show_error(
-                parent,
                 "Connection Error",
                 "Could not connect to the server. Please check your internet connection.",
                 f"Details: {error_message}"
             )
         elif "timeout" in error_message.lower():
             ErrorHandler.show_error(
-                parent,
                 "Request Timeout",
                 "The request took too long to respond. Please try again.",
                 f"Details: {error_message}"
             )
         else:
             ErrorHandler.show_error(
-                parent,
                 "API Error",
                 "An error occurred while fetching data. Please try again.",
                 f"Details: {error_message}"
             )
 
     @staticmethod
-    def handle_image_error(parent: QWidget, error: Exception):
+    def handle_image_error(error: Exception):
         """Handles image loading specific errors"""
         ErrorHandler.show_error(
-            parent,
             "Image Error",
-            "Could not load the image. A placeholder will be shown instead.",
+            "Could not load some images. Placeholders are shown instead.",
             f"Details: {str(error)}"
         )
@@ -0,0 +1,127 @@
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QHBoxLayout, QMenu, QPushButton, QToolButton, QWidget
+
+from models.facet_index import FACETS, FacetIndex
+
+
+class _StickyMenu(QMenu):
+    """Menu that stays open while its checkable actions are toggled."""
+
+    def mouseReleaseEvent(self, event):
+        action = self.activeAction()
+        if action is not None and action.isCheckable() and action.isEnabled():
+            action.trigger()
+            return
+        super().mouseReleaseEvent(event)
+
+
+class FacetBar(QWidget):
+    """One drop-down of checkable values per facet, each showing how many results it would match.
+
+    Counts come from the :class:`FacetIndex` given to ``set_index`` and are
+    recomputed on every toggle, which the bitsets make cheap enough to do
+    while the menu is open.
+    """
+    LABELS = {"genre": "Genre", "category": "Category", "status": "Status", "season": "Season",
+              "year": "Year", "age_rating": "Age rating"}
+
+    selection_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("FacetBar")
+        self.index = FacetIndex()
+        self.selected = {facet: set() for facet in FACETS}
+        self.buttons = {}
+        self.menus = {}
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+        for facet in FACETS:
+            button = QToolButton()
+            button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+            menu = _StickyMenu(button)
+            menu.setObjectName("FacetMenu")
+            menu.aboutToShow.connect(lambda facet=facet: self.populate(facet))
+            button.setMenu(menu)
+            layout.addWidget(button)
+            self.buttons[facet] = button
+            self.menus[facet] = menu
+        layout.addStretch()
+
+        self.clear_button = QPushButton("Clear filters")
+        self.clear_button.setObjectName("ClearFiltersButton")
+        self.clear_button.clicked.connect(lambda: self.clear())
+        layout.addWidget(self.clear_button)
+        self.update_buttons()
+
+    def selection(self) -> dict:
+        return {facet: set(values) for facet, values in self.selected.items()}
+
+    def is_active(self) -> bool:
+        return any(self.selected.values())
+
+    def set_index(self, index: FacetIndex):
+        """Count against ``index`` from now on; values it doesn't have are unchecked."""
+        self.index = index
+        for facet, values in self.selected.items():
+            values &= set(index.bits[facet])
+        self.update_buttons()
+
+    def clear(self, notify=True):
+        for values in self.selected.values():
+            values.clear()
+        self.update_buttons()
+        if notify:
+            self.selection_changed.emit()
+
+    @staticmethod
+    def _label(facet, value):
+        return value.capitalize() if facet in ("status", "season") else value
+
+    def populate(self, facet):
+        menu = self.menus[facet]
+        menu.clear()
+        counts = self.index.counts(facet, self.selected)
+        if facet == "year":
+            values = sorted(counts, reverse=True)
+        else:
+            values = sorted(counts, key=lambda value: (-counts[value], value))
+        for value in values:
+            action = menu.addAction("")
+            action.setCheckable(True)
+            action.setChecked(value in self.selected[facet])
+            action.setData(value)
+            action.toggled.connect(lambda checked, facet=facet, value=value: self.toggle(facet, value, checked))
+        self.update_counts(facet, counts)
+        if not values:
+            menu.addAction("Nothing to filter").setEnabled(False)
+
+    def update_counts(self, facet, counts=None):
+        counts = counts if counts is not None else self.index.counts(facet, self.selected)
+        for action in self.menus[facet].actions():
+            value = action.data()
+            if value is None:
+                continue
+            action.setText(f"{self._label(facet, value)} ({counts.get(value, 0)})")
+            # Values that would leave nothing to show can still be unchecked
+            action.setEnabled(counts.get(value, 0) > 0 or action.isChecked())
+
+    def toggle(self, facet, value, checked):
+        if checked:
+            self.selected[facet].add(value)
+        else:
+            self.selected[facet].discard(value)
+        self.update_buttons()
+        self.selection_changed.emit()
+        self.update_counts(facet)
+
+    def update_buttons(self):
+        for facet, button in self.buttons.items():
+            checked = len(self.selected[facet])
+            button.setText(f"{self.LABELS[facet]} ({checked}) ▾" if checked else f"{self.LABELS[facet]} ▾")
+            button.setProperty("active", bool(checked))
+            button.style().unpolish(button)
+            button.style().polish(button)
+        self.clear_button.setVisible(self.is_active())
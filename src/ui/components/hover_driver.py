@@ -0,0 +1,78 @@
+import time
+import weakref
+from functools import partial
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class HoverDriver(QObject):
+    """One timer animating the hover effect of every card.
+
+    Cards ask for a target (1 hovered, 0 not) with ``animate``; on each tick
+    the driver moves every card that isn't there yet towards its target and
+    hands it the new progress through ``set_hover_progress``. The timer only
+    runs while some card is still moving, however many cards are animating.
+    Cards are forgotten when they are destroyed, even mid-animation.
+
+    GUI thread only.
+    """
+    DURATION_MS = 150
+    FRAME_MS = 16
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "HoverDriver":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.targets = {}  # card -> target progress, while moving
+        self.last_tick = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self.tick)
+
+    def animate(self, card, target: float):
+        self.targets[card] = target
+        if not self.timer.isActive():
+            self.last_tick = time.perf_counter()
+            self.timer.start()
+
+    def watch(self, card):
+        """Forget ``card`` when it is destroyed; only a weak reference to it is kept."""
+        card.destroyed.connect(partial(self._forget_ref, weakref.ref(card)))
+
+    def _forget_ref(self, ref, *_):
+        card = ref()
+        if card is not None:
+            self.forget(card)
+
+    def forget(self, card):
+        if card in self.targets:
+            del self.targets[card]
+            if not self.targets:
+                try:
+                    self.timer.stop()
+                except RuntimeError:
+                    # Cards outliving the driver at exit; its timer is already gone
+                    pass
+
+    def tick(self):
+        now = time.perf_counter()
+        step = (now - self.last_tick) * 1000 / self.DURATION_MS
+        self.last_tick = now
+        for card, target in list(self.targets.items()):
+            progress = card.hover_progress
+            progress = min(target, progress + step) if target > progress else max(target, progress - step)
+            if progress == target:
+                del self.targets[card]
+            try:
+                card.set_hover_progress(progress)
+            except RuntimeError:
+                # Deleted while animating (e.g. removed from the grid)
+                self.targets.pop(card, None)
+        if not self.targets:
+            self.timer.stop()
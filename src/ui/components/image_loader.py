@@ -1,100 +1,275 @@
-from PySide6.QtCore import QThread, Signal, QSize
+from PySide6.QtCore import QThread, Signal, QSize, Qt
 from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtWidgets import QWidget
 import requests
-from io import BytesIO
-from PIL import Image
+import os
+import itertools
 import queue
 import threading
 from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache
 import time
+from api.cache import DiskCache
+from api.transport import Transport, get_transport
+from utils.image_decode import ProcessDecoder, SharedPixels, decode_rgba
+from utils.metrics import registry
+from utils.profiler import span
+from utils.thumbnail_atlas import ThumbnailAtlas
 from .error_handler import ErrorHandler
+from .pixmap_manager import PixmapManager
 
 class ImageLoader(QThread):
+    # Seconds a failed URL shows its placeholder before it may be tried again
+    FAILURE_TTL = 60
+    # Queued images start in priority order, lowest first
+    PRIORITY_VISIBLE = 0
+    PRIORITY_PREFETCH = 1
+    # Decoded images are premultiplied ARGB32, what the raster engine paints from
+    IMAGE_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
     image_loaded = Signal(str, QPixmap)
+    # Worker threads hand decoded images to the GUI thread, where they become
+    # pixmaps; QPixmap is not safe to create outside the GUI thread
+    image_decoded = Signal(str, int, int, QImage)
+    # Emitted (queued, in the GUI thread) for images that could not be loaded
+    image_failed = Signal(str)
     
-    def __init__(self, parent: QWidget = None, max_workers=4, cache_size=100):
+    def __init__(self, parent: QWidget = None, max_workers=4, memory_budget=PixmapManager.DEFAULT_BUDGET,
+                 disk_cache: DiskCache = None, transport: Transport = None, decode_backend=None,
+                 thumbnail_size: tuple = None):
         super().__init__()
-        self.queue = queue.Queue()
+        self.queue = queue.PriorityQueue()
+        self.order = itertools.count()
         self.running = True
         self.parent = parent
+        # Threads fetch; decoding happens in them too, or in worker processes
+        # with decode_backend="process" (or PYITSU_DECODE=process)
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.cache_size = cache_size
-        self._load_image = lru_cache(maxsize=cache_size)(self._load_image_impl)
+        # Tasks are only taken off the queue when a thread is free for them,
+        # so priorities decide what starts next
+        self.slots = threading.Semaphore(max_workers)
+        decode_backend = decode_backend or os.environ.get("PYITSU_DECODE", "thread")
+        self.decoder = ProcessDecoder() if decode_backend == "process" else None
+        # Decoded images live in the pixmap manager, encoded ones in the disk cache
+        self.pixmaps = PixmapManager(memory_budget)
+        self.image_decoded.connect(self._on_image_decoded, Qt.ConnectionType.QueuedConnection)
+        self.disk_cache = disk_cache or DiskCache("images")
+        # Images of thumbnail_size are also kept decoded in a memory-mapped atlas,
+        # so a warm grid skips both the file read and the decode
+        self.atlas = None
+        if thumbnail_size:
+            try:
+                self.atlas = ThumbnailAtlas(thumbnail_size)
+            except (OSError, ValueError) as e:
+                print(f"Error opening thumbnail atlas: {e}")
+        self.transport = transport
         self.lock = threading.Lock()
+        # (url, size) -> priority while queued, None once started
+        self.pending = {}
+        # URL -> time of failure; recent failures get a placeholder instead of new attempts
+        self.failed = {}
+        self.queue_depth = registry.gauge("image_loader.queue_depth")
     
-    def enqueue(self, url, size):
-        """Enqueue an image to be loaded with the specified size."""
+    def enqueue(self, url, size, priority=PRIORITY_VISIBLE):
+        """Enqueue an image to be loaded with the specified size.
+        
+        Callers check ``cached_pixmap`` first; queued images are always decoded.
+        Enqueuing an image that is already queued at a lower priority raises it.
+        """
         if not url:
             return
-        self.queue.put((url, size))
+        key = (url, tuple(size))
+        with self.lock:
+            # Cards sharing a poster all listen to the same image_loaded signal
+            if key in self.pending:
+                queued = self.pending[key]
+                if queued is None or queued <= priority:
+                    return
+            self.pending[key] = priority
+            self.queue_depth.set(len(self.pending))
+        # A raised entry is queued again; run() skips the outdated one
+        self.queue.put((priority, next(self.order), url, key[1]))
+    
+    def cancel(self, url, size, priority=PRIORITY_PREFETCH) -> bool:
+        """Drop a queued image that has not started loading, unless something raised
+        it above ``priority``. Returns whether it was dropped."""
+        with self.lock:
+            queued = self.pending.get((url, tuple(size)))
+            if queued is None or queued < priority:
+                return False
+            del self.pending[(url, tuple(size))]
+            self.queue_depth.set(len(self.pending))
+            return True
+    
+    def has_failed(self, url) -> bool:
+        failed_at = self.failed.get(url)
+        return failed_at is not None and time.monotonic() - failed_at < self.FAILURE_TTL
+    
+    def cached_pixmap(self, url, size):
+        """The decoded image if it is still in memory or in the thumbnail atlas, else None. GUI thread only."""
+        if not url:
+            return None
+        pixmap = self.pixmaps.find(url, size)
+        if pixmap is None and self.atlas is not None and tuple(size) == self.atlas.size:
+            pixmap = self._atlas_pixmap(url, size)
+        return pixmap
+    
+    def has_thumbnail(self, url, size) -> bool:
+        """Whether ``cached_pixmap`` can return the image without loading it."""
+        return self.atlas is not None and tuple(size) == self.atlas.size and url in self.atlas
+    
+    def _atlas_pixmap(self, url, size):
+        with span("atlas"), self.atlas.open(url) as found:
+            if found is None:
+                return None
+            pixels, width, height = found
+            # The image is a view of the mapped slot. copy() is the only copy of
+            # the pixels: fromImage shares an image already in the pixmap's
+            # format instead of copying it again, and without copy() it would
+            # share the slot, which may be reused later. Scanning for an
+            # all-opaque image would cost more than the copy, so skip it
+            image = QImage(pixels, width, height, width * 4, self.IMAGE_FORMAT).copy()
+            pixmap = QPixmap.fromImage(image, Qt.ImageConversionFlag.NoOpaqueDetection)
+        self.pixmaps.insert(url, tuple(size), pixmap)
+        return pixmap
+    
+    def is_cached(self, url: str) -> bool:
+        """Whether the image is in the disk cache, i.e. can load without network."""
+        return self.disk_cache.contains(url)
     
     def stop(self):
         """Stop the image loader and cleanup resources."""
         self.running = False
-        self.queue.put((None, None))
+        self.queue.put((-1, -1, None, None))
         self.executor.shutdown(wait=True)
+        if self.decoder is not None:
+            self.decoder.shutdown()
+        if self.atlas is not None:
+            self.atlas.close()
     
-    @staticmethod
-    def _optimize_image_size(image: Image.Image, target_size: tuple) -> Image.Image:
-        """Optimize image size before loading into memory."""
-        # Calculate the scaling factor
-        width_ratio = target_size[0] / image.size[0]
-        height_ratio = target_size[1] / image.size[1]
-        scale_factor = min(width_ratio, height_ratio)
+    def _fetch_image_bytes(self, url: str) -> bytes:
+        """Return the encoded image, from the disk cache or the network with retries."""
+        content = self.disk_cache.get(url)
+        if content is not None:
+            return content
         
-        # Only resize if the image is larger than target
-        if scale_factor < 1:
-            new_size = (int(image.size[0] * scale_factor), int(image.size[1] * scale_factor))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
-        
-        return image
-    
-    def _load_image_impl(self, url: str, size: tuple) -> QPixmap:
-        """Internal method to load an image with retries."""
         max_retries = 3
         retry_delay = 1  # seconds
         
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, timeout=10)
+                with registry.timer("image.fetch_ms"):
+                    response = (self.transport or get_transport()).get(url, timeout=10)
                 response.raise_for_status()
-                
-                image = Image.open(BytesIO(response.content))
-                image = self._optimize_image_size(image, size)
-                image = image.convert("RGBA")
-                
-                data = image.tobytes("raw", "RGBA")
-                qim = QImage(data, image.size[0], image.size[1], QImage.Format.Format_RGBA8888)
-                return QPixmap.fromImage(qim)
+                registry.counter("net.bytes_downloaded", kind="image").inc(len(response.content))
+                self.disk_cache.put(url, response.content)
+                return response.content
                 
             except requests.RequestException as e:
-                if attempt == max_retries - 1:
+                # Only connection problems and server errors are worth retrying
+                status = e.response.status_code if e.response is not None else None
+                if attempt == max_retries - 1 or (status is not None and status < 500):
                     raise
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
     
+    def _decode_image(self, content: bytes, size: tuple) -> QImage:
+        """Decode an image in the calling thread."""
+        with registry.timer("image.decode_ms"), span("decode"):
+            data, width, height = decode_rgba(content, size)
+            qim = QImage(data, width, height, width * 4, QImage.Format.Format_RGBA8888)
+            # The QImage only borrows ``data``; converting makes a copy that can outlive this call
+            return qim.convertToFormat(self.IMAGE_FORMAT)
+    
+    def _store_thumbnail(self, url: str, size: tuple, image: QImage):
+        if self.atlas is not None and tuple(size) == self.atlas.size:
+            try:
+                self.atlas.put(url, image.constBits(), image.width(), image.height())
+            except (OSError, ValueError) as e:
+                print(f"Error writing thumbnail: {e}")
+    
     def _process_image(self, url: str, size: tuple):
         """Process a single image loading task."""
+        handed_off = False
+        # The thread is free once the image is decoded or handed to a worker process
+        try:
+            content = self._fetch_image_bytes(url)
+            if self.decoder is not None:
+                # Free this I/O thread while a worker process decodes
+                future = self.decoder.submit(content, size)
+                future.add_done_callback(lambda f: self._on_process_decoded(url, size, f))
+                handed_off = True
+                return
+            image = self._decode_image(content, size)
+            self._store_thumbnail(url, size, image)
+            self.image_decoded.emit(url, size[0], size[1], image)
+        except Exception as e:
+            self._fail(url, e)
+        finally:
+            self.slots.release()
+            if not handed_off:
+                self._done(url, size)
+    
+    def _on_process_decoded(self, url: str, size: tuple, future):
+        """Runs in the process pool's result thread once a worker has decoded an image.
+
+        Also runs, in the thread shutting the decoder down, for images it cancelled.
+        """
+        pixels = None
         try:
-            pixmap = self._load_image(url, size)
-            self.image_loaded.emit(url, pixmap)
+            if future.cancelled():
+                # Never decoded, so there is no block to free
+                return
+            name, width, height, decode_ms = future.result()
+            pixels = SharedPixels(name, width, height)
+            registry.histogram("image.decode_ms").observe(decode_ms)
+            with span("decode"):
+                image = QImage(pixels.buffer, width, height, width * 4,
+                               QImage.Format.Format_RGBA8888).convertToFormat(self.IMAGE_FORMAT)
+            self._store_thumbnail(url, size, image)
+            self.image_decoded.emit(url, size[0], size[1], image)
         except Exception as e:
-            ErrorHandler.handle_image_error(self.parent, e)
+            self._fail(url, e)
+        finally:
+            if pixels is not None:
+                pixels.close()
+            self._done(url, size)
+    
+    def _fail(self, url: str, error: Exception):
+        registry.counter("image.errors").inc()
+        self.failed[url] = time.monotonic()
+        self.image_failed.emit(url)
+        ErrorHandler.handle_image_error(error)
+    
+    def _done(self, url: str, size: tuple):
+        with self.lock:
+            self.pending.pop((url, size), None)
+            self.queue_depth.set(len(self.pending))
+    
+    def _on_image_decoded(self, url, width, height, image):
+        pixmap = QPixmap.fromImage(image)
+        self.pixmaps.insert(url, (width, height), pixmap)
+        self.image_loaded.emit(url, pixmap)
     
     def run(self):
         """Main thread loop for processing image loading tasks."""
         while self.running:
+            if not self.slots.acquire(timeout=1):
+                continue
             try:
-                url, size = self.queue.get(timeout=1)
+                priority, _, url, size = self.queue.get(timeout=1)
                 if url is None:
                     break
+                with self.lock:
+                    # Cancelled, or queued again at a higher priority
+                    if self.pending.get((url, size), -1) != priority:
+                        self.slots.release()
+                        continue
+                    self.pending[(url, size)] = None
                 
                 # Submit the task to the thread pool
                 self.executor.submit(self._process_image, url, size)
                 
             except queue.Empty:
+                self.slots.release()
                 continue
             except Exception as e:
-                ErrorHandler.handle_image_error(self.parent, e) 
+                ErrorHandler.handle_image_error(e) 
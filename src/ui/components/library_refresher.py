@@ -0,0 +1,69 @@
+import threading
+import time
+
+import requests
+from PySide6.QtCore import QObject, Signal
+
+from api.jikan_client import JikanClient
+from api.rate_limit import BackgroundRateLimiter, shared_rate_limiter
+from utils.metrics import registry
+from .error_handler import error_reporter
+
+
+class LibraryRefresher(QObject):
+    """Keeps saved titles up to date in the background.
+
+    Titles not refreshed for ``MAX_AGE`` are fetched ``BATCH_SIZE`` at a time
+    with one ``filter[id]`` request per batch, rather than a details request
+    per title, at low priority on the shared rate limit. ``wake`` starts a
+    pass right away (e.g. after a title is saved); otherwise one runs every
+    ``INTERVAL``.
+    """
+    BATCH_SIZE = JikanClient.MAX_PAGE_LIMIT
+    MAX_AGE = 6 * 3600  # seconds
+    INTERVAL = 15 * 60  # seconds
+
+    # Titles whose saved data was just refreshed
+    refreshed = Signal(list)
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.client = JikanClient(rate_limiter=BackgroundRateLimiter(shared_rate_limiter))
+        self.woken = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="library-refresh", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def wake(self):
+        self.woken.set()
+
+    def stop(self):
+        self.stopping = True
+        self.woken.set()
+
+    def run(self):
+        while not self.stopping:
+            self.woken.clear()
+            self.refresh_stale()
+            self.woken.wait(self.INTERVAL)
+
+    def refresh_stale(self):
+        """Refresh batches of stale titles until none are left (or a request fails)."""
+        started = time.time()
+        while not self.stopping:
+            anime_ids = self.store.stale(started - self.MAX_AGE, self.BATCH_SIZE)
+            if not anime_ids:
+                return
+            try:
+                titles = self.client.fetch_anime_by_ids(anime_ids, refresh=True)
+            except requests.RequestException as e:
+                error_reporter.report("Watchlist refresh failed", str(e))
+                return
+            # Ids the API no longer knows count as refreshed too, so they aren't retried every pass
+            self.store.update(titles, refreshed=anime_ids)
+            registry.counter("library.refreshed").inc(len(titles))
+            if titles:
+                self.refreshed.emit(titles)
@@ -4,16 +4,8 @@ from PySide6.QtCore import Qt
 class LoadingOverlay(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(0, 0, 0, 0.7);
-            }
-            QLabel {
-                color: white;
-                font-size: 18px;
-                background-color: transparent;
-            }
-        """)
+        self.setObjectName("LoadingOverlay")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
         layout = QVBoxLayout(self)
         label = QLabel("Loading...")
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -0,0 +1,73 @@
+import time
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import QObject, QTimer
+from utils.metrics import registry
+
+
+class EventLoopMonitor(QObject):
+    """Measures GUI event-loop lag: how late a fixed-interval timer actually fires."""
+    INTERVAL_MS = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lag = registry.histogram("gui.event_loop_lag_ms")
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.INTERVAL_MS)
+        self.timer.timeout.connect(self.on_tick)
+        self.last_tick = None
+    
+    def start(self):
+        self.last_tick = time.perf_counter()
+        self.timer.start()
+    
+    def stop(self):
+        self.timer.stop()
+    
+    def on_tick(self):
+        now = time.perf_counter()
+        self.lag.observe(max(0.0, (now - self.last_tick) * 1000 - self.INTERVAL_MS))
+        self.last_tick = now
+
+
+class MetricsPanel(QLabel):
+    """One-line metrics summary for the status bar, refreshed once a second."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("MetricsPanel")
+        self.monitor = EventLoopMonitor(self)
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+    
+    def set_active(self, active: bool):
+        # The lag monitor only runs while the panel is shown, so it costs nothing otherwise
+        if active:
+            self.monitor.start()
+            self.timer.start()
+            self.refresh()
+        else:
+            self.monitor.stop()
+            self.timer.stop()
+        self.setVisible(active)
+    
+    @staticmethod
+    def _p(name, q=50, **labels):
+        return registry.histogram(name, **labels).percentile(q)
+    
+    def refresh(self):
+        ratios = registry.cache_hit_ratios()
+        cache = " ".join(f"{tier} {ratio:.0%}" for tier, ratio in sorted(ratios.items())) or "-"
+        downloaded = sum(registry.counter("net.bytes_downloaded", kind=kind).value for kind in ("api", "image"))
+        self.setText(
+            f"API p50 {self._p('api.latency_ms', endpoint='/anime'):.0f} ms"
+            f" · details p50 {self._p('api.latency_ms', endpoint='/anime/{id}'):.0f} ms"
+            f" · decode p50 {self._p('image.decode_ms'):.1f} ms"
+            f" · queue {registry.gauge('image_loader.queue_depth').value}"
+            f" · {downloaded / 1048576:.1f} MB"
+            f" · pixmaps {registry.gauge('pixmaps.cache_bytes').value / 1048576:.0f}"
+            f"/{registry.gauge('pixmaps.budget_bytes').value / 1048576:.0f} MB"
+            f" · cache {cache}"
+            f" · lag p95 {self._p('gui.event_loop_lag_ms', 95):.1f} ms"
+        )
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtGui import QPixmap, QPixmapCache
+
+from utils.metrics import registry
+
+
+class PixmapManager:
+    """Keeps decoded images in memory within a byte budget, on top of ``QPixmapCache``.
+
+    ``QPixmapCache`` does the storing. The manager sets its limit from the
+    budget and keeps its own account of what is cached, evicting least
+    recently used images itself once the budget is exceeded, so usage can be
+    reported.
+    Pixmaps are shared with the labels showing them, so memory is only really
+    returned once offscreen cards drop theirs too (see ``AnimeCard.release_image``).
+
+    GUI thread only, like ``QPixmapCache`` itself.
+    """
+    DEFAULT_BUDGET = 128 * 1024 * 1024
+    # Qt's styles cache their own pixmaps in QPixmapCache too; leave them
+    # the room they get by default on top of the budget
+    QT_RESERVE_KB = 10240
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.entries = OrderedDict()  # cache key -> bytes, least recently used first
+        self.used = 0
+        self.usage_gauge = registry.gauge("pixmaps.cache_bytes")
+        self.budget_gauge = registry.gauge("pixmaps.budget_bytes")
+        self.set_budget(budget)
+
+    @staticmethod
+    def _key(url: str, size: tuple) -> str:
+        return f"{size[0]}x{size[1]}:{url}"
+
+    @staticmethod
+    def pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def set_budget(self, budget: int):
+        self.budget = budget
+        QPixmapCache.setCacheLimit(budget // 1024 + self.QT_RESERVE_KB)
+        self.budget_gauge.set(budget)
+        self._trim()
+
+    def find(self, url: str, size: tuple) -> Optional[QPixmap]:
+        """Return the cached pixmap, or None if it was never cached or has been evicted."""
+        key = self._key(url, size)
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            registry.counter("cache.misses", tier="memory:images").inc()
+            self._forget(key)
+            return None
+        registry.counter("cache.hits", tier="memory:images").inc()
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        return pixmap
+
+    def insert(self, url: str, size: tuple, pixmap: QPixmap):
+        key = self._key(url, size)
+        self._forget(key)
+        if not QPixmapCache.insert(key, pixmap):
+            # Larger than the whole budget
+            return
+        self.entries[key] = self.pixmap_bytes(pixmap)
+        self.used += self.entries[key]
+        self._trim()
+
+    def usage(self) -> int:
+        """Bytes of pixmaps currently held by the cache."""
+        # QPixmapCache evicts on its own; drop entries it no longer has
+        for key in list(self.entries):
+            pixmap = QPixmapCache.find(key)
+            if pixmap is None or pixmap.isNull():
+                self._forget(key)
+        return self.used
+
+    def clear(self):
+        QPixmapCache.clear()
+        self.entries.clear()
+        self.used = 0
+        self.usage_gauge.set(0)
+
+    def _forget(self, key: str):
+        size = self.entries.pop(key, None)
+        if size is not None:
+            self.used -= size
+            self.usage_gauge.set(self.used)
+
+    def _trim(self):
+        # Keep our account within budget even when QPixmapCache's own cost differs
+        while self.used > self.budget and self.entries:
+            key = next(iter(self.entries))
+            QPixmapCache.remove(key)
+            self._forget(key)
+        self.usage_gauge.set(self.used)
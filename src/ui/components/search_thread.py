@@ -1,24 +1,46 @@
 from PySide6.QtCore import QThread, Signal
-from PySide6.QtWidgets import QWidget
 from api.jikan_client import JikanClient
+from utils.profiler import span
 from .error_handler import ErrorHandler
 
 class SearchThread(QThread):
+    # Each page's results as soon as it is parsed
+    batch_ready = Signal(list)
+    # Every page's results, once done
     results_ready = Signal(list)
+    # Instead of results_ready when a page could not be fetched; pages already sent by batch_ready stay
+    failed = Signal()
     
-    def __init__(self, query, parent=None, page_limit=20):
+    def __init__(self, query, parent=None, page_limit=20, refresh=False, offset=0, pages=1):
         super().__init__(parent)
         self.query = query
         self.page_limit = page_limit
+        self.offset = offset
+        self.pages = pages
+        # Revalidate: ask the API even if the response cache has the page
+        self.refresh = refresh
         
     def run(self):
         try:
             client = JikanClient(page_limit=self.page_limit)
-            if self.query == "":
-                results = client.get_top_anime()
-            else:
-                results = client.search_anime(self.query)
+            results = []
+            # A query of only spaces matches nothing; an empty one lists the top anime
+            with span("search"):
+                if not self.query or self.query.strip():
+                    params = JikanClient.query_params(self.query)
+                    offset = self.offset
+                    for _ in range(self.pages):
+                        # Not the get_top_anime/search_anime wrappers: they swallow errors
+                        batch, total = client.fetch_anime_page(params, offset, refresh=self.refresh)
+                        if not batch:
+                            break
+                        results.extend(batch)
+                        self.batch_ready.emit(batch)
+                        offset += len(batch)
+                        if offset >= total:
+                            break
             self.results_ready.emit(results)
         except Exception as e:
-            ErrorHandler.handle_api_error(self.parent, e)
-            self.results_ready.emit([])
+            # Reported in the status bar; receivers keep what they show
+            ErrorHandler.handle_api_error(e)
+            self.failed.emit()
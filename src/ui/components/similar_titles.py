@@ -0,0 +1,85 @@
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QScrollArea, QVBoxLayout, QWidget
+
+
+class SimilarTitle(QFrame):
+    """Small poster tile for a recommended title."""
+    clicked = Signal(dict)
+    IMAGE_SIZE = (140, 200)
+
+    def __init__(self, anime_data, score, image_loader):
+        super().__init__()
+        self.anime_data = anime_data
+        self.image_url = anime_data.get('image_url')
+        self.setObjectName("SimilarTitle")
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setFixedWidth(self.IMAGE_SIZE[0])
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.image_label = QLabel()
+        self.image_label.setObjectName("SimilarImage")
+        self.image_label.setFixedSize(*self.IMAGE_SIZE)
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.image_label)
+
+        title = QLabel(anime_data.get('title') or "")
+        title.setProperty("class", "similar-title")
+        title.setWordWrap(True)
+        layout.addWidget(title)
+
+        match = QLabel(f"{score:.0%} match")
+        match.setProperty("class", "similar-match")
+        layout.addWidget(match)
+
+        if self.image_url:
+            pixmap = image_loader.cached_pixmap(self.image_url, self.IMAGE_SIZE)
+            if pixmap is not None:
+                self.image_label.setPixmap(pixmap)
+            else:
+                image_loader.image_loaded.connect(self.on_image_loaded)
+                image_loader.enqueue(self.image_url, self.IMAGE_SIZE)
+
+    def on_image_loaded(self, url, pixmap):
+        if (url == self.image_url and pixmap.width() <= self.IMAGE_SIZE[0]
+                and pixmap.height() <= self.IMAGE_SIZE[1]):
+            self.image_label.setPixmap(pixmap)
+
+    def mousePressEvent(self, event):
+        self.clicked.emit(self.anime_data)
+        super().mousePressEvent(event)
+
+
+class SimilarTitles(QWidget):
+    """Horizontally scrolling row of similar titles, as ``(title, similarity)`` pairs."""
+    title_selected = Signal(dict)
+
+    def __init__(self, similar, image_loader, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        title = QLabel("Títulos similares")
+        title.setProperty("class", "section-title")
+        layout.addWidget(title)
+
+        row = QWidget()
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 10)
+        row_layout.setSpacing(20)
+        for anime, score in similar:
+            tile = SimilarTitle(anime, score, image_loader)
+            tile.clicked.connect(self.title_selected)
+            row_layout.addWidget(tile, alignment=Qt.AlignmentFlag.AlignTop)
+        row_layout.addStretch()
+
+        scroll = QScrollArea()
+        scroll.setObjectName("SimilarTitlesRow")
+        scroll.setWidgetResizable(True)
+        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll.setWidget(row)
+        scroll.setFixedHeight(SimilarTitle.IMAGE_SIZE[1] + 90)
+        layout.addWidget(scroll)
@@ -1,249 +1,40 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QPushButton, QLabel, QScrollArea,
                             QFrame, QGridLayout, QSplitter, QDialog, QCheckBox,
-                            QComboBox, QSpinBox, QFormLayout, QMenuBar, QMenu, QStatusBar)
-from PySide6.QtCore import Qt, QThread, Signal, QSize, QPoint
-from PySide6.QtGui import QPixmap, QImage, QIcon
-import requests
-from io import BytesIO
-from PIL import Image
+                            QComboBox, QSpinBox, QFormLayout, QMenuBar, QMenu, QStatusBar,
+                            QFileDialog, QApplication)
+from PySide6.QtCore import Qt, QEvent, QSize, QPoint, QTimer
+from PySide6.QtGui import QIcon, QAction
 from api.jikan_client import JikanClient
-import queue
-import threading
+from models.catalog_store import CatalogStore
+from models.facet_index import FacetIndex
+from models.library import LibraryStore
+from models.similarity import SimilarityIndex
+from models.session import SessionStore
+from utils.metrics import registry
+from utils.profiler import profiler, span
 import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 
 from .components.anime_card import AnimeCard
 from .components.loading_overlay import LoadingOverlay
 from .components.search_thread import SearchThread
 from .components.image_loader import ImageLoader
-
-class ImageLoader(QThread):
-    image_loaded = Signal(str, QPixmap)
-    
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.queue = queue.Queue()
-        self.running = True
-    
-    def enqueue(self, url, size):
-        self.queue.put((url, size))
-    
-    def stop(self):
-        self.running = False
-        self.queue.put((None, None))
-    
-    def run(self):
-        while self.running:
-            try:
-                url, size = self.queue.get(timeout=1)
-                if url is None:
-                    break
-                    
-                response = requests.get(url)
-                image = Image.open(BytesIO(response.content))
-                image = image.resize(size, Image.Resampling.LANCZOS)
-                image = image.convert("RGBA")
-                data = image.tobytes("raw", "RGBA")
-                qim = QImage(data, image.size[0], image.size[1], QImage.Format.Format_RGBA8888)
-                pixmap = QPixmap.fromImage(qim)
-                
-                self.image_loaded.emit(url, pixmap)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Error loading image: {e}")
-
-class AnimeCard(QFrame):
-    clicked = Signal(dict)
-    
-    def __init__(self, anime_data, image_loader):
-        super().__init__()
-        self.image_loader = image_loader
-        self.image_url = anime_data['image_url']
-        self.anime_data = anime_data
-        
-        self.setStyleSheet("""
-            AnimeCard {
-                background-color: #3c3f41;
-                border-radius: 12px;
-                padding: 15px;
-                margin: 8px;
-            }
-            AnimeCard:hover {
-                background-color: #454749;
-                cursor: pointer;
-            }
-            QLabel {
-                color: white;
-            }
-            .title {
-                font-size: 14px;
-                font-weight: bold;
-                margin-bottom: 8px;
-            }
-            .score {
-                color: #4CAF50;
-                font-weight: bold;
-            }
-        """)
-        
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        layout = QVBoxLayout(self)
-        layout.setSpacing(10)
-        
-        # Title
-        title = QLabel(anime_data['title'])
-        title.setProperty("class", "title")
-        title.setWordWrap(True)
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title)
-        
-        # Image placeholder
-        self.image_label = QLabel()
-        self.image_label.setFixedSize(200, 300)
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setStyleSheet("""
-            QLabel {
-                background-color: #2b2b2b;
-                border-radius: 8px;
-            }
-        """)
-        
-        # Loading text
-        loading_label = QLabel("loading...")
-        loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setText("loading...")
-        layout.addWidget(self.image_label)
-        
-        # Info container
-        info_container = QFrame()
-        info_layout = QVBoxLayout(info_container)
-        info_layout.setSpacing(5)
-        
-        # Score with star emoji
-        score = float(anime_data['score']) if anime_data['score'] != 'N/A' else 0
-        score_label = QLabel(f"★ {score:.1f}/100" if score else "★ N/A")
-        score_label.setProperty("class", "score")
-        score_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        info_layout.addWidget(score_label)
-        
-        # Episodes
-        episodes = QLabel(f"Episodes: {anime_data['episodes']}")
-        episodes.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        info_layout.addWidget(episodes)
-        
-        # Status
-        status = QLabel(f"Status: {anime_data['status']}")
-        status.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        info_layout.addWidget(status)
-        
-        layout.addWidget(info_container)
-        
-        # Request image loading
-        if self.image_url:
-            self.image_loader.image_loaded.connect(self.on_image_loaded)
-            self.image_loader.enqueue(self.image_url, (200, 300))
-    
-    def on_image_loaded(self, url, pixmap):
-        if url == self.image_url:
-            self.image_label.setPixmap(pixmap)
-
-    def mousePressEvent(self, event):
-        self.clicked.emit(self.anime_data)
-        super().mousePressEvent(event)
-
-class SearchThread(QThread):
-    results_ready = Signal(list)
-    
-    def __init__(self, query, parent):
-        super().__init__(parent)
-        self.query = query
-        
-    def run(self):
-        client = JikanClient()
-        if self.query == "":
-            results = client.get_top_anime()
-        else:
-            results = client.search_anime(self.query)
-        self.results_ready.emit(results)
-
-class LoadingOverlay(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(0, 0, 0, 0.7);
-            }
-            QLabel {
-                color: white;
-                font-size: 18px;
-                background-color: transparent;
-            }
-        """)
-        layout = QVBoxLayout(self)
-        label = QLabel("Looking for anime...")
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(label)
-        self.hide()
+from .components.details_prefetcher import DetailsPrefetcher
+from .components.library_refresher import LibraryRefresher
+from .components.facet_bar import FacetBar
+from .components.metrics_panel import MetricsPanel
+from .components.error_handler import error_reporter
 
 class ConfigDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Settings")
         self.setMinimumWidth(500)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #0a0a0a;
-                color: #ffffff;
-            }
-            QLabel {
-                color: #ffffff;
-                font-size: 14px;
-            }
-            QCheckBox {
-                color: #ffffff;
-                font-size: 14px;
-            }
-            QComboBox {
-                background-color: #1a1a1a;
-                color: #ffffff;
-                border: 1px solid #2a2a2a;
-                border-radius: 4px;
-                padding: 5px;
-                min-width: 150px;
-            }
-            QComboBox:focus {
-                border: 1px solid #00b4d8;
-            }
-            QSpinBox {
-                background-color: #1a1a1a;
-                color: #ffffff;
-                border: 1px solid #2a2a2a;
-                border-radius: 4px;
-                padding: 5px;
-                min-width: 100px;
-            }
-            QSpinBox:focus {
-                border: 1px solid #00b4d8;
-            }
-            QPushButton {
-                background-color: #00b4d8;
-                color: #ffffff;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 4px;
-                font-weight: bold;
-                font-size: 14px;
-                min-width: 100px;
-            }
-            QPushButton:hover {
-                background-color: #0096c7;
-            }
-            QPushButton:pressed {
-                background-color: #0077b6;
-            }
-        """)
+        self.setObjectName("ConfigDialog")
         
         layout = QVBoxLayout(self)
         layout.setSpacing(20)
@@ -278,6 +69,21 @@ class ConfigDialog(QDialog):
         self.cards_per_row.setValue(4)
         form_layout.addRow("Cards per row:", self.cards_per_row)
         
+        # How old cached results may be and still be shown while refreshing
+        self.max_stale_hours = QSpinBox()
+        self.max_stale_hours.setRange(0, 24 * 7)
+        self.max_stale_hours.setValue(24)
+        self.max_stale_hours.setSuffix(" h")
+        self.max_stale_hours.setSpecialValueText("Never")
+        form_layout.addRow("Show cached results up to:", self.max_stale_hours)
+        
+        # Memory for decoded posters
+        self.pixmap_budget_mb = QSpinBox()
+        self.pixmap_budget_mb.setRange(16, 2048)
+        self.pixmap_budget_mb.setValue(128)
+        self.pixmap_budget_mb.setSuffix(" MB")
+        form_layout.addRow("Image memory:", self.pixmap_budget_mb)
+        
         layout.addLayout(form_layout)
         
         # Buttons
@@ -304,20 +110,7 @@ class FloatingConfigButton(QPushButton):
         self.setIcon(QIcon(icon_path))
         self.setIconSize(QSize(24, 24))
         
-        self.setStyleSheet("""
-            QPushButton {
-                background-color: #00b4d8;
-                color: white;
-                border: none;
-                border-radius: 25px;
-            }
-            QPushButton:hover {
-                background-color: #0096c7;
-            }
-            QPushButton:pressed {
-                background-color: #0077b6;
-            }
-        """)
+        self.setObjectName("ConfigButton")
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         
     def mousePressEvent(self, event):
@@ -329,9 +122,24 @@ class FloatingConfigButton(QPushButton):
         self.move(self.pos() - QPoint(0, 2))
 
 class MainWindow(QMainWindow):
+    # How long the pointer must rest on a card before its details are prefetched
+    HOVER_INTENT_MS = 150
+    # Titles listed under "similar titles" in the details view
+    SIMILAR_TITLES = 12
+    # Details views kept alive for Back
+    DETAILS_VIEWS = 5
+    # "Sort by" choice -> catalog column and whether highest comes first
+    SORT_KEYS = {"Score": ("score", True), "Title": ("title", False), "Episodes": ("episodes", False),
+                 "Status": ("status", False)}
+    # Time spent building cards per event-loop turn; the rest are built in the next turns
+    CARD_BUILD_BUDGET_MS = 8
+    # Pages fetched when scrolling near the end, appended one by one as they arrive
+    PAGES_PER_LOAD = 2
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Pyitsu")
+        self.setObjectName("MainWindow")
         self.setMinimumSize(1400, 900)
         
         # Default configuration
@@ -340,69 +148,75 @@ class MainWindow(QMainWindow):
             "show_episodes": True,
             "show_status": True,
             "sort_by": "Score",
-            "cards_per_row": 4
+            "cards_per_row": 4,
+            "max_stale_hours": 24,
+            "pixmap_budget_mb": 128
         }
         
-        # Set window style
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0a0a0a;
-            }
-            QWidget {
-                background-color: #0a0a0a;
-                color: #ffffff;
-            }
-            QLineEdit {
-                padding: 16px;
-                border-radius: 8px;
-                border: 1px solid #2a2a2a;
-                background-color: #1a1a1a;
-                color: #ffffff;
-                font-size: 15px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #00b4d8;
-            }
-            QPushButton {
-                background-color: #00b4d8;
-                color: #ffffff;
-                border: none;
-                padding: 16px 32px;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 15px;
-            }
-            QPushButton:hover {
-                background-color: #0096c7;
-            }
-            QPushButton:pressed {
-                background-color: #0077b6;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #1a1a1a;
-                width: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #00b4d8;
-                border-radius: 5px;
-                min-height: 30px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-            }
-        """)
+        # Results currently shown in the grid and the cards rendering them
+        self.current_query = ""
+        self.current_results = []
+        self.cards = []
+        self.grid_layout = None
+        # (anime, card) in grid order; the card is None until build_cards gets to it
+        self.display_order = []
+        self.build_timer = QTimer(self)
+        self.build_timer.setSingleShot(True)
+        self.build_timer.setInterval(0)
+        self.build_timer.timeout.connect(self.build_cards)
+        self.session_store = SessionStore()
+        # Bitmap index of current_results for the facet filters, and the same rows as columns for sorting
+        self.facets = FacetIndex()
+        self.catalog = CatalogStore()
+        # Every title seen locally, for "similar titles"; cached responses are added in the background
+        self.similarity = SimilarityIndex()
+        threading.Thread(target=lambda: self.similarity.add(JikanClient().cached_titles()),
+                         name="similarity-catalog", daemon=True).start()
+        
+        # Watchlist and favorites, kept up to date in the background
+        self.library = LibraryStore()
+        self.library_refresher = LibraryRefresher(self.library, self)
+        self.library_refresher.refreshed.connect(self.on_library_refreshed)
+        self.library_refresher.start()
+        # List shown in the grid instead of search results, and the search it replaced
+        self.library_view = None
+        self.saved_search = ("", [])
+        
+        # Further pages of the current query are loaded when scrolling near the end
+        self.search_thread = None
+        self.page_thread = None
+        self.has_more = True
+        # Titles of the current query read from the API so far; duplicates dropped from the grid count too
+        self.next_offset = 0
+        self._pending_scroll = None
         
         # Initialize image loader
-        self.image_loader = ImageLoader(self)
+        self.image_loader = ImageLoader(self, memory_budget=self.config["pixmap_budget_mb"] * 1024 * 1024,
+                                        thumbnail_size=AnimeCard.IMAGE_SIZE)
         self.image_loader.start()
         
+        # Resting the pointer on a card prefetches its details and cover
+        self.prefetcher = DetailsPrefetcher(self.image_loader, self)
+        self.prefetcher.details_ready.connect(self.on_details_ready)
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(self.HOVER_INTENT_MS)
+        self.hover_timer.timeout.connect(self.on_hover_intent)
+        self.hovered_anime = None
+        # Anime whose details view is waiting for its data
+        self.details_id = None
+        
+        # Navigation: the grid is only hidden while details are shown, so Back returns to it
+        # as it was left. Recent details views are kept too (least recently shown first), with
+        # their own scroll positions; the ids of those opened before the current one are stacked.
+        self.details_views = OrderedDict()
+        self.details_stack = []
+        self.current_details = None
+        self.details_message = None
+        self.grid_scroll = 0
+        # Results changed while the grid was hidden; it is re-rendered on Back
+        self.grid_outdated = False
+        
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -415,18 +229,36 @@ class MainWindow(QMainWindow):
         
         # Create status bar
         self.status_bar = QStatusBar()
+        self.status_bar.setObjectName("StatusBar")
         self.setStatusBar(self.status_bar)
-        self.status_bar.setStyleSheet("""
-            QStatusBar {
-                background-color: #0a0a0a;
-                color: #ffffff;
-                border-top: 1px solid #2a2a2a;
-            }
-        """)
+        
+        # Errors from any thread, summarized instead of shown in dialogs
+        self.error_toast = QLabel()
+        self.error_toast.setObjectName("ErrorToast")
+        self.error_toast.hide()
+        self.status_bar.addPermanentWidget(self.error_toast)
+        error_reporter.summary_changed.connect(self.on_errors_changed)
+        
+        # Shown while the grid displays cached results that are being revalidated
+        self.stale_label = QLabel()
+        self.stale_label.setObjectName("StaleIndicator")
+        self.stale_label.hide()
+        self.status_bar.addPermanentWidget(self.stale_label)
+        
+        # Metrics panel (View > Show Metrics, or PYITSU_METRICS=1)
+        self.metrics_panel = MetricsPanel()
+        self.status_bar.addPermanentWidget(self.metrics_panel)
+        if os.environ.get("PYITSU_METRICS"):
+            self.metrics_action.setChecked(True)
+        
+        # PYITSU_PROFILE=<path> profiles the whole session and saves it there on exit
+        self.profile_path = os.environ.get("PYITSU_PROFILE")
+        if self.profile_path:
+            self.profile_action.setChecked(True)
         
         # Header section
         header = QWidget()
-        header.setFixedHeight(140)
+        header.setFixedHeight(190)
         header_layout = QVBoxLayout(header)
         header_layout.setContentsMargins(0, 0, 0, 0)
         header_layout.setSpacing(20)
@@ -439,52 +271,31 @@ class MainWindow(QMainWindow):
         
         # Title container
         title_container = QWidget()
-        title_container.setStyleSheet("""
-            QWidget {
-                background-color: transparent;
-                border-bottom: 2px solid #00b4d8;
-                padding-bottom: 10px;
-            }
-        """)
+        title_container.setObjectName("TitleContainer")
         title_layout = QHBoxLayout(title_container)
         title_layout.setContentsMargins(0, 0, 0, 0)
         title_layout.setSpacing(0)
         
         # Title
         title_label = QLabel("Pyitsu")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 42px;
-                font-weight: bold;
-                color: #ffffff;
-                letter-spacing: 2px;
-            }
-        """)
+        title_label.setObjectName("AppTitle")
         title_layout.addWidget(title_label)
         title_layout.addStretch()
         top_row_layout.addWidget(title_container)
         
+        # Watchlist and favorites
+        self.library_buttons = {}
+        for list_name in ("watchlist", "favorites"):
+            button = QPushButton()
+            button.setObjectName("LibraryButton")
+            button.clicked.connect(lambda checked=False, list_name=list_name: self.show_library(list_name))
+            top_row_layout.addWidget(button)
+            self.library_buttons[list_name] = button
+        self.update_library_buttons()
+        
         # Back button (initially hidden)
         self.back_button = QPushButton("← Back")
-        self.back_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #00b4d8;
-                border: 2px solid #00b4d8;
-                padding: 12px 24px;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 16px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #00b4d8;
-                color: #ffffff;
-            }
-            QPushButton:pressed {
-                background-color: #0096c7;
-            }
-        """)
+        self.back_button.setObjectName("BackButton")
         self.back_button.clicked.connect(self.go_home)
         self.back_button.hide()
         top_row_layout.addWidget(self.back_button)
@@ -493,73 +304,37 @@ class MainWindow(QMainWindow):
         
         # Search container
         search_container = QWidget()
-        search_container.setStyleSheet("""
-            QWidget {
-                background-color: transparent;
-            }
-        """)
+        search_container.setObjectName("SearchContainer")
         search_layout = QHBoxLayout(search_container)
         search_layout.setContentsMargins(0, 0, 0, 0)
         search_layout.setSpacing(15)
         
         # Search icon
         search_icon = QLabel("🔍")
-        search_icon.setStyleSheet("""
-            QLabel {
-                font-size: 20px;
-                color: #00b4d8;
-                padding: 0 10px;
-            }
-        """)
+        search_icon.setObjectName("SearchIcon")
         search_layout.addWidget(search_icon)
         
         # Search input
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search anime...")
-        self.search_input.setStyleSheet("""
-            QLineEdit {
-                padding: 15px;
-                border-radius: 8px;
-                border: 2px solid #2a2a2a;
-                background-color: #1a1a1a;
-                color: #ffffff;
-                font-size: 16px;
-                min-width: 400px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #00b4d8;
-                background-color: #2a2a2a;
-            }
-        """)
+        self.search_input.setObjectName("SearchInput")
         self.search_input.returnPressed.connect(self.search_anime)
         search_layout.addWidget(self.search_input)
         
         # Search button
         search_button = QPushButton("Search")
-        search_button.setStyleSheet("""
-            QPushButton {
-                background-color: #00b4d8;
-                color: #ffffff;
-                border: none;
-                padding: 15px 30px;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 16px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #0096c7;
-            }
-            QPushButton:pressed {
-                background-color: #0077b6;
-            }
-        """)
+        search_button.setObjectName("SearchButton")
         search_button.clicked.connect(self.search_anime)
         search_layout.addWidget(search_button)
         
         # Add search container to header
         header_layout.addWidget(search_container)
         
+        # Facet filters over the loaded results
+        self.facet_bar = FacetBar()
+        self.facet_bar.selection_changed.connect(self.on_facets_changed)
+        header_layout.addWidget(self.facet_bar)
+        
         main_layout.addWidget(header)
         
         # Content area
@@ -568,11 +343,15 @@ class MainWindow(QMainWindow):
         self.content_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         
         content_widget = QWidget()
+        # Growing as cards are added only paints the new area, not the rows on screen
+        content_widget.setAttribute(Qt.WidgetAttribute.WA_StaticContents)
         self.content_layout = QVBoxLayout(content_widget)
         self.content_layout.setContentsMargins(0, 0, 0, 0)
         self.content_layout.setSpacing(30)
         
         self.content_area.setWidget(content_widget)
+        self.content_area.verticalScrollBar().rangeChanged.connect(self.on_scroll_range_changed)
+        self.content_area.verticalScrollBar().valueChanged.connect(self.on_scroll)
         main_layout.addWidget(self.content_area)
         
         # Floating config button
@@ -584,12 +363,99 @@ class MainWindow(QMainWindow):
         self.loading_overlay = LoadingOverlay(self)
         self.loading_overlay.setGeometry(0, 0, self.width(), self.height())
         
-        # Show initial top anime
-        self.search_anime()
+        # Show the last session straight away and refresh it in the background,
+        # otherwise start with the top anime
+        if self.restore_session():
+            self.search_anime(show_loading=False)
+        else:
+            self.search_anime()
+    
+    def restore_session(self) -> bool:
+        """Render the snapshot saved by the previous session. Returns False if there is none."""
+        snapshot = self.session_store.load()
+        if not snapshot or not snapshot["results"]:
+            return False
+        
+        for key, value in snapshot.get("config", {}).items():
+            if key in self.config:
+                self.config[key] = value
+        self.image_loader.pixmaps.set_budget(self.config["pixmap_budget_mb"] * 1024 * 1024)
+        self.search_input.setText(snapshot.get("query", ""))
+        
+        # Posters decoded last time are in the disk cache; queue them ahead of the rest,
+        # unless the thumbnail atlas has them ready
+        decoded = set(snapshot.get("thumbnails", []))
+        for anime in snapshot["results"]:
+            if anime.get("id") in decoded and not self.image_loader.has_thumbnail(anime.get("image_url"),
+                                                                                  AnimeCard.IMAGE_SIZE):
+                self.image_loader.enqueue(anime.get("image_url"), AnimeCard.IMAGE_SIZE)
+        
+        self._pending_scroll = snapshot.get("scroll") or None
+        self.current_query = snapshot.get("query", "")
+        self.next_offset = len(snapshot["results"])
+        self.display_results(snapshot["results"])
+        self.set_stale(self.session_store.age())
+        return True
+    
+    def save_session(self):
+        # A list on screen is not a search; the next launch restores the search it replaced
+        query, results = self.saved_search if self.library_view else (self.current_query, self.current_results)
+        self.session_store.save(
+            config=self.config,
+            query=query,
+            results=results,
+            scroll=self.grid_position() if self.cards and not self.library_view else 0,
+            thumbnails=[card.anime_data.get("id") for card in self.cards if card.has_image()],
+        )
+    
+    def on_scroll_range_changed(self, minimum, maximum):
+        # Scroll positions can only be restored once the grid has been laid out
+        if self._pending_scroll is not None and maximum >= self._pending_scroll:
+            self.content_area.verticalScrollBar().setValue(self._pending_scroll)
+            self._pending_scroll = None
+    
+    def grid_position(self):
+        """Scroll position of the grid, also while a details view covers it."""
+        if self.back_button.isVisible():
+            return self.grid_scroll
+        return self.content_area.verticalScrollBar().value()
+    
+    def on_scroll(self, value):
+        # Scrolling a details view doesn't concern the grid under it
+        if self.back_button.isVisible():
+            return
+        self.update_visible_cards()
+        if value >= self.content_area.verticalScrollBar().maximum() - AnimeCard.IMAGE_SIZE[1]:
+            self.load_more()
+    
+    def update_visible_cards(self):
+        """Show posters for cards in or near the viewport and release the others.
+        
+        Rows are computed from the scroll position rather than widget geometry,
+        so this also works right after cards are added, before layout.
+        """
+        if not self.cards or self.grid_layout is None or self.back_button.isVisible():
+            return
+        viewport_height = self.content_area.viewport().height()
+        scroll = self.content_area.verticalScrollBar().value()
+        pitch = self.cards[0].height() + self.grid_layout.verticalSpacing()
+        # One screen above and below stays loaded so scrolling doesn't show blanks
+        first_row = max(0, scroll - viewport_height) // pitch
+        last_row = (scroll + 2 * viewport_height) // pitch
+        per_row = self.config["cards_per_row"]
+        # By grid position: while cards are being built, some positions have none yet
+        for i, (_, card) in enumerate(self.display_order):
+            if card is None:
+                continue
+            if first_row <= i // per_row <= last_row:
+                card.ensure_image()
+            else:
+                card.release_image()
     
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.loading_overlay.resize(self.size())
+        self.update_visible_cards()
         # Reposition config button
         self.config_button.move(self.width() - 70, self.height() - 70)
     
@@ -602,188 +468,589 @@ class MainWindow(QMainWindow):
         dialog.show_status.setChecked(self.config["show_status"])
         dialog.sort_by.setCurrentText(self.config["sort_by"])
         dialog.cards_per_row.setValue(self.config["cards_per_row"])
+        dialog.max_stale_hours.setValue(self.config["max_stale_hours"])
+        dialog.pixmap_budget_mb.setValue(self.config["pixmap_budget_mb"])
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
+            previous = dict(self.config)
+            
             # Guardar configuración
             self.config["show_score"] = dialog.show_score.isChecked()
             self.config["show_episodes"] = dialog.show_episodes.isChecked()
             self.config["show_status"] = dialog.show_status.isChecked()
             self.config["sort_by"] = dialog.sort_by.currentText()
             self.config["cards_per_row"] = dialog.cards_per_row.value()
+            self.config["max_stale_hours"] = dialog.max_stale_hours.value()
+            self.config["pixmap_budget_mb"] = dialog.pixmap_budget_mb.value()
+            self.image_loader.pixmaps.set_budget(self.config["pixmap_budget_mb"] * 1024 * 1024)
             
             # Actualizar la vista actual
-            self.refresh_current_view()
+            layout_changed = (previous["sort_by"] != self.config["sort_by"]
+                              or previous["cards_per_row"] != self.config["cards_per_row"])
+            self.refresh_current_view(layout_changed)
     
-    def refresh_current_view(self):
-        # Si estamos en la vista de detalles, volver a cargar los detalles
-        if self.back_button.isVisible():
-            # Obtener el ID del anime actual
-            for i in range(self.content_layout.count()):
-                widget = self.content_layout.itemAt(i).widget()
-                if hasattr(widget, 'anime_data'):
-                    self.show_anime_details(widget.anime_data)
-                    break
+    def refresh_current_view(self, layout_changed=True):
+        """Re-render the results grid from the results already loaded, without refetching."""
+        if layout_changed:
+            self.show_results(self.current_results)
         else:
-            # Si estamos en la vista principal, volver a cargar los resultados
-            self.search_anime()
+            self.apply_display_config()
+    
+    def apply_display_config(self):
+        """Update field visibility on the existing cards in place."""
+        for card in self.cards:
+            card.apply_display_config(self.config)
     
     def go_home(self):
+        """Back: to the previous details view, or to the grid as it was left. Nothing is refetched."""
+        self.loading_overlay.hide()
+        if self.details_stack:
+            self.open_details(self.details_stack.pop())
+            return
+        if self.grid_layout is None:
+            self.leave_details()
+            self.search_anime()
+            return
+        self.leave_details(self.grid_scroll)
+        if self.grid_outdated:
+            self.display_results(self.current_results)
+            if self.library_view:
+                self.show_library_status()
+        self.update_visible_cards()
+    
+    def leave_details(self, scroll=0):
+        """Drop the details history and show the grid again, scrolled to ``scroll``."""
+        if self.back_button.isHidden():
+            return
         self.back_button.hide()
-        self.search_input.clear()
-        self.search_anime()
+        self.details_stack.clear()
+        self.current_details = None
+        self.details_id = None
+        if self.grid_layout is not None:
+            self.show_content(self.grid_layout.parentWidget(), scroll)
+    
+    def show_content(self, widget, scroll=0):
+        """Show only ``widget`` (the grid or a details view) in the content area, scrolled to ``scroll``.
+        
+        The other views are hidden, not destroyed.
+        """
+        for i in range(self.content_layout.count()):
+            other = self.content_layout.itemAt(i).widget()
+            if other is not None and other is not widget:
+                other.hide()
+        if self.details_message is not None and self.details_message is not widget:
+            self.content_layout.removeWidget(self.details_message)
+            self.details_message.deleteLater()
+            self.details_message = None
+        if widget is not None:
+            widget.show()
+        # Applied now if the current range allows it, otherwise once the view is laid out
+        bar = self.content_area.verticalScrollBar()
+        self._pending_scroll = None
+        if scroll > bar.maximum():
+            self._pending_scroll = scroll
+        else:
+            bar.setValue(scroll)
         
-    def search_anime(self):
+    def search_anime(self, show_loading=True):
         query = self.search_input.text()
+        if query != self.current_query or self.library_view:
+            self.facet_bar.clear(notify=False)
+        self.current_query = query
+        self.library_view = None
+        self.update_library_buttons()
+        self.leave_details()
+        self.page_thread = None
+        self.has_more = True
+        
+        # Stale-while-revalidate: show results we already have, then refresh them
+        refresh = False
+        cached = self.cached_results(query) if show_loading else None
+        if cached:
+            results, age = cached
+            self.content_area.verticalScrollBar().setValue(0)
+            self.next_offset = len(results)
+            self.display_results(results)
+            if age <= JikanClient.CACHE_MAX_AGE:
+                self.set_stale(None)
+                # Answers to searches still in flight are dropped
+                self.search_thread = None
+                return
+            self.set_stale(age)
+            show_loading = False
+            refresh = True
         
-        # Show loading overlay
-        self.loading_overlay.show()
+        # Start search thread
+        self.search_thread = SearchThread(query, self, refresh=refresh)
+        
+        if show_loading:
+            # Show loading overlay
+            self.loading_overlay.show()
+            self.set_stale(None)
             
-        # Clear previous results
-        for i in reversed(range(self.content_layout.count())): 
-            self.content_layout.itemAt(i).widget().setParent(None)
+            # The grid stays under the overlay so the new results can reuse its cards
+            if self.grid_layout is None:
+                self.clear_content()
+            self.content_area.verticalScrollBar().setValue(0)
             
-        # Start search thread
-        self.search_thread = SearchThread(query, self)
-        self.search_thread.results_ready.connect(self.display_results)
+            self.search_thread.results_ready.connect(self.on_search_results)
+            self.search_thread.failed.connect(self.on_search_failed)
+        else:
+            # Refresh what is on screen without blanking it
+            self.search_thread.results_ready.connect(self.on_refresh_results)
+            self.search_thread.failed.connect(self.on_refresh_failed)
         self.search_thread.start()
-        
-    def display_results(self, results):
-        # Clear previous content
+    
+    def load_more(self):
+        """Fetch the next page of the current query and append it to the grid."""
+        if self.page_thread is not None or not self.has_more or self.grid_layout is None or self.library_view:
+            return
+        if self.search_thread is not None and self.search_thread.isRunning():
+            return
+        self.page_thread = SearchThread(self.current_query, self, offset=self.next_offset,
+                                        pages=self.PAGES_PER_LOAD)
+        self.page_thread.batch_ready.connect(self.on_page_batch)
+        self.page_thread.results_ready.connect(self.on_page_results)
+        self.page_thread.failed.connect(self.on_page_failed)
+        self.page_thread.start()
+        self.status_bar.showMessage("Loading more results...")
+    
+    def cached_results(self, query):
+        """Cached results for ``query`` within the staleness bound, as ``(results, age)``."""
+        max_age = self.config["max_stale_hours"] * 3600
+        if not max_age:
+            return None
+        return JikanClient().cached_anime_page(JikanClient.query_params(query), max_age=max_age)
+    
+    def set_stale(self, age=None, offline=False):
+        """Show how old the displayed results are, or hide the indicator for fresh results."""
+        if age is None:
+            self.stale_label.hide()
+            return
+        state = "offline" if offline else "refreshing…"
+        self.stale_label.setText(f"Cached {self.format_age(age)} ago · {state}")
+        self.stale_label.show()
+    
+    @staticmethod
+    def format_age(seconds):
+        if seconds < 3600:
+            return f"{max(1, int(seconds // 60))} min"
+        if seconds < 86400:
+            return f"{int(seconds // 3600)} h"
+        return f"{int(seconds // 86400)} d"
+    
+    def clear_content(self):
+        """Remove whatever the content area shows (grid and details)."""
+        self.cards = []
+        self.grid_layout = None
+        self.display_order = []
+        self.build_timer.stop()
+        self.details_views.clear()
+        self.details_message = None
         while self.content_layout.count():
             item = self.content_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
+    
+    def on_search_results(self, results):
+        # Answers from a search that has since been replaced are dropped
+        if self.sender() is not self.search_thread:
+            return
+        self.next_offset = len(results)
+        self.display_results(results)
+    
+    def on_search_failed(self):
+        # The error is reported in the status bar; whatever the grid showed stays
+        if self.sender() is not self.search_thread:
+            return
+        self.loading_overlay.hide()
+    
+    def on_refresh_failed(self):
+        if self.sender() is not self.search_thread:
+            return
+        self.mark_offline()
+    
+    def mark_offline(self):
+        """Note on the stale indicator that the cached results could not be refreshed."""
+        if self.stale_label.isVisible():
+            self.stale_label.setText(self.stale_label.text().replace("refreshing…", "offline"))
+    
+    def on_refresh_results(self, results):
+        if self.sender() is not self.search_thread:
+            return
+        # No titles for a query that had some is more likely an outage than the answer; keep what is shown
+        if not results:
+            self.mark_offline()
+            return
+        self.set_stale(None)
+        # The refresh covers the first page; pages loaded after it are kept. Titles that moved
+        # onto the first page are dropped from them, and titles that moved off it stay, after it
+        fresh = {anime.get('id') for anime in results}
+        rest = self.current_results[len(results):]
+        if rest:
+            rest = [anime for anime in self.current_results if anime.get('id') not in fresh]
+        else:
+            self.next_offset = len(results)
+        self.show_results(results + rest)
+    
+    def on_page_batch(self, results):
+        # Each page is appended as it arrives
+        if self.sender() is not self.page_thread:
+            return
+        # Counted before append_results drops titles already shown, so no page is skipped
+        self.next_offset += len(results)
+        self.append_results(results)
+    
+    def on_page_results(self, results):
+        if self.sender() is not self.page_thread:
+            return
+        self.page_thread = None
+        self.has_more = bool(results)
+    
+    def on_page_failed(self):
+        # Pages that arrived before the error stay; scrolling doesn't retry a failing API in a loop
+        if self.sender() is not self.page_thread:
+            return
+        self.page_thread = None
+        self.has_more = False
+    
+    def sort_rows(self, rows):
+        """Order rows of current_results according to configuration; unknown values go last."""
+        if self.config["sort_by"] not in self.SORT_KEYS:
+            return rows
+        key, descending = self.SORT_KEYS[self.config["sort_by"]]
+        return self.catalog.order(key, descending, rows)
+    
+    def create_card(self, anime):
+        # Posters are loaded by update_visible_cards once the card's row is known
+        with span("card_build"):
+            card = AnimeCard(anime, self.image_loader,
+                             show_score=self.config["show_score"],
+                             show_episodes=self.config["show_episodes"],
+                             show_status=self.config["show_status"],
+                             load_image=False)
+            card.clicked.connect(self.show_anime_details)
+            card.hovered.connect(self.on_card_hovered)
+            card.unhovered.connect(self.on_card_unhovered)
+        return card
+    
+    def place_cards(self, cards):
+        """Put cards at the cells of their ``(index, card)`` grid positions, moving only the ones whose cell changed."""
+        per_row = self.config["cards_per_row"]
+        moved = []
+        for i, card in cards:
+            cell = (i // per_row, i % per_row)
+            index = self.grid_layout.indexOf(card)
+            if index < 0 or self.grid_layout.getItemPosition(index)[:2] != cell:
+                if index >= 0:
+                    self.grid_layout.removeWidget(card)
+                moved.append((card, cell))
+        for card, (row, col) in moved:
+            self.grid_layout.addWidget(card, row, col)
         
-        # Sort results according to configuration
-        if self.config["sort_by"] == "Score":
-            results = sorted(results, key=lambda x: float(x['score']) if x['score'] != 'N/A' else 0, reverse=True)
-        elif self.config["sort_by"] == "Title":
-            results = sorted(results, key=lambda x: x['title'])
-        elif self.config["sort_by"] == "Episodes":
-            results = sorted(results, key=lambda x: int(x['episodes']) if x['episodes'] != '?' else 0)
-        elif self.config["sort_by"] == "Status":
-            results = sorted(results, key=lambda x: x['status'])
+    def display_results(self, results):
+        """Show ``results`` in the grid, keyed by anime id.
         
-        # Create grid layout for anime cards
-        grid = QWidget()
-        grid_layout = QGridLayout(grid)
-        grid_layout.setContentsMargins(0, 0, 0, 0)
-        grid_layout.setSpacing(30)
-        
-        row = 0
-        col = 0
-        for anime in results:
-            card = AnimeCard(anime, self.image_loader)
-            card.clicked.connect(self.show_anime_details)
-            
-            # Apply display configuration
-            if not self.config["show_score"]:
-                for i in range(card.layout().count()):
-                    widget = card.layout().itemAt(i).widget()
-                    if isinstance(widget, QFrame) and widget.layout():
-                        for j in range(widget.layout().count()):
-                            child = widget.layout().itemAt(j).widget()
-                            if isinstance(child, QLabel) and "★" in child.text():
-                                child.hide()
-            
-            if not self.config["show_episodes"]:
-                for i in range(card.layout().count()):
-                    widget = card.layout().itemAt(i).widget()
-                    if isinstance(widget, QFrame) and widget.layout():
-                        for j in range(widget.layout().count()):
-                            child = widget.layout().itemAt(j).widget()
-                            if isinstance(child, QLabel) and "Episodes:" in child.text():
-                                child.hide()
-            
-            if not self.config["show_status"]:
-                for i in range(card.layout().count()):
-                    widget = card.layout().itemAt(i).widget()
-                    if isinstance(widget, QFrame) and widget.layout():
-                        for j in range(widget.layout().count()):
-                            child = widget.layout().itemAt(j).widget()
-                            if isinstance(child, QLabel) and "Status:" in child.text():
-                                child.hide()
-            
-            grid_layout.addWidget(card, row, col)
-            col += 1
-            if col >= self.config["cards_per_row"]:
-                col = 0
-                row += 1
+        Cards of anime that are already shown are kept, with their posters, and
+        only updated if their data changed; they are moved to their new cell
+        when the order changes. New anime get new cards and missing ones are
+        removed, so re-sorting, refreshing or appending never rebuilds the grid.
+        """
+        self.index_results(results)
+        self.current_results = results
+        shown = self.facets.rows(self.facet_bar.selection())
         
-        self.content_layout.addWidget(grid)
+        # Create grid layout for anime cards
+        if self.grid_layout is None:
+            self.clear_content()
+            grid = QWidget()
+            self.grid_layout = QGridLayout(grid)
+            self.grid_layout.setContentsMargins(0, 0, 0, 0)
+            self.grid_layout.setSpacing(30)
+            grid.setAttribute(Qt.WidgetAttribute.WA_StaticContents)
+            self.content_layout.addWidget(grid)
+        
+        existing = {card.anime_data.get('id'): card for card in self.cards}
+        self.display_order = []
+        # Sort results according to configuration
+        for row in self.sort_rows(shown):
+            anime = results[row]
+            card = existing.pop(anime.get('id'), None)
+            if card is not None and card.anime_data != anime:
+                card.update_data(anime)
+            self.display_order.append((anime, card))
+        for card in existing.values():
+            self.grid_layout.removeWidget(card)
+            card.deleteLater()
+        self.place_cards((i, card) for i, (_, card) in enumerate(self.display_order) if card is not None)
+        
+        self.grid_outdated = False
+        self.build_cards()
         
         # Update status bar
-        self.status_bar.showMessage(f"Found {len(results)} results")
+        if len(shown) < len(results):
+            self.status_bar.showMessage(f"Showing {len(shown)} of {len(results)} results")
+        else:
+            self.status_bar.showMessage(f"Found {len(results)} results")
         
         # Hide loading overlay
         self.loading_overlay.hide()
     
+    def build_cards(self):
+        """Create the missing cards of ``display_order``, in order, for up to CARD_BUILD_BUDGET_MS.
+        
+        The cards built so far are placed right away, so the first rows show
+        after the first turn; the rest are built in the following turns, with
+        painting and input handled in between.
+        """
+        deadline = time.perf_counter() + self.CARD_BUILD_BUDGET_MS / 1000
+        order = self.display_order
+        per_row = self.config["cards_per_row"]
+        for i, (anime, card) in enumerate(order):
+            if card is None:
+                if time.perf_counter() > deadline:
+                    break
+                card = self.create_card(anime)
+                order[i] = (anime, card)
+                self.grid_layout.addWidget(card, i // per_row, i % per_row)
+                # Polished and shown now rather than later in the turn, so the budget covers it
+                card.show()
+        # Lay the new cards out now, so they are first painted in their cells
+        QApplication.sendPostedEvents(None, QEvent.Type.LayoutRequest)
+        cards = [card for _, card in order if card is not None]
+        self.cards = cards
+        self.update_visible_cards()
+        if len(cards) < len(order):
+            self.build_timer.start()
+    
+    def index_results(self, results):
+        """Bring the facet index in line with ``results``; appended pages are only added."""
+        indexed = self.facets.results
+        if len(results) >= len(indexed) and all(a is b for a, b in zip(results, indexed)):
+            added = results[len(indexed):]
+            self.facets.extend(added)
+            self.catalog.extend(added)
+            self.similarity.add(added)
+        else:
+            self.facets = FacetIndex(results)
+            self.catalog = CatalogStore(results)
+            self.similarity.add(results)
+        self.facet_bar.set_index(self.facets)
+    
+    def show_results(self, results):
+        """Display ``results``, or keep them for Back if a details view covers the grid."""
+        if self.back_button.isVisible():
+            self.current_results = results
+            self.grid_outdated = True
+        else:
+            self.display_results(results)
+    
+    def on_facets_changed(self):
+        # Filtering works on the loaded results, never refetches
+        self.show_results(self.current_results)
+    
+    def append_results(self, results):
+        """Add another page of results after the ones shown."""
+        shown = {anime.get('id') for anime in self.current_results}
+        self.show_results(self.current_results + [anime for anime in results if anime.get('id') not in shown])
+    
+    def show_library(self, list_name):
+        """Show a saved list in the grid: one indexed query, no network."""
+        if not self.library_view:
+            self.saved_search = (self.current_query, self.current_results)
+            self.facet_bar.clear(notify=False)
+        elif list_name != self.library_view:
+            self.facet_bar.clear(notify=False)
+        self.library_view = list_name
+        self.update_library_buttons()
+        # Answers to searches still in flight are dropped
+        self.search_thread = None
+        self.page_thread = None
+        self.has_more = False
+        self.leave_details()
+        self.set_stale(None)
+        self.content_area.verticalScrollBar().setValue(0)
+        
+        with registry.timer("library.open_ms", list=list_name):
+            titles = self.library.titles(list_name)
+        self.display_results(titles)
+        self.show_library_status()
+    
+    def show_library_status(self):
+        if not self.current_results:
+            self.status_bar.showMessage(f"Nothing in your {self.library_view} yet")
+            return
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M")
+        upcoming = self.library.upcoming(self.library_view, now, limit=1)
+        if upcoming:
+            self.status_bar.showMessage(f"{len(self.current_results)} titles · next episode: "
+                                        f"{upcoming[0]['title']}, {upcoming[0]['next_airing'][:10]}")
+    
+    def update_library_buttons(self):
+        for list_name, button in self.library_buttons.items():
+            button.setText(f"{list_name.capitalize()} ({self.library.count(list_name)})")
+            button.setProperty("active", list_name == self.library_view)
+            button.style().unpolish(button)
+            button.style().polish(button)
+    
+    def on_list_toggled(self, list_name, anime_data, on):
+        self.library.set(list_name, anime_data, on)
+        self.update_library_buttons()
+        # A list on screen under the details view reflects the change on Back
+        if self.library_view:
+            self.show_results(self.library.titles(self.library_view))
+        if on:
+            self.library_refresher.wake()
+    
+    def on_library_refreshed(self, titles):
+        # Refreshed data replaces what a shown list has, card by card
+        if self.library_view:
+            self.show_results(self.library.titles(self.library_view))
+            if not self.back_button.isVisible():
+                self.show_library_status()
+    
+    def on_card_hovered(self, anime_data):
+        self.hovered_anime = anime_data
+        self.hover_timer.start()
+    
+    def on_card_unhovered(self, anime_data):
+        if self.hovered_anime is not None and self.hovered_anime['id'] == anime_data['id']:
+            self.hovered_anime = None
+            self.hover_timer.stop()
+        self.prefetcher.cancel(anime_data['id'])
+    
+    def on_hover_intent(self):
+        if self.hovered_anime is not None:
+            self.prefetcher.prefetch(self.hovered_anime['id'])
+    
     def show_anime_details(self, anime_data):
-        # Clear previous content
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # What is shown now is kept for Back: the grid's scroll position, or the details view
+        if self.back_button.isVisible():
+            if self.current_details is not None:
+                self.details_stack.append(self.current_details)
+        else:
+            self.grid_scroll = self.content_area.verticalScrollBar().value()
         
         # Show back button
         self.back_button.show()
-        
-        # Show loading overlay
+        self.hover_timer.stop()
+        self.hovered_anime = None
+        self.open_details(anime_data['id'])
+    
+    def open_details(self, anime_id):
+        """Show the details view of ``anime_id``, reusing a kept one if there is one."""
+        self.current_details = anime_id
+        self.details_id = None
+        view = self.details_views.get(anime_id)
+        if view is not None:
+            self.details_views.move_to_end(anime_id)
+            self.show_content(view)
+            return
+        
+        # Details prefetched on hover open right away; otherwise wait for them
+        complete_details = self.prefetcher.cached(anime_id)
+        if complete_details:
+            self.show_details_view(complete_details)
+            return
+        self.show_content(None)
+        self.details_id = anime_id
         self.loading_overlay.show()
-        
-        # Fetch complete anime details
-        client = JikanClient()
-        complete_details = client.get_anime_details(anime_data['id'])
-        
+        self.prefetcher.fetch(anime_id)
+    
+    def on_details_ready(self, anime_id, details):
+        # Ignore details the user went back from before they arrived
+        if anime_id != self.details_id:
+            return
+        self.details_id = None
+        self.show_details_view(details)
+    
+    def show_details_view(self, complete_details):
         if complete_details:
             # Create and show details view with complete data
             from .components.anime_details import AnimeDetails
-            details_view = AnimeDetails(complete_details, self.image_loader)
+            # Details add studios to what the catalog knows about this title
+            self.similarity.add([complete_details])
+            similar = self.similarity.similar(complete_details['id'], k=self.SIMILAR_TITLES)
+            details_view = AnimeDetails(complete_details, self.image_loader, similar,
+                                        lists=self.library.lists(complete_details['id']))
+            details_view.title_selected.connect(self.show_anime_details)
+            details_view.list_toggled.connect(self.on_list_toggled)
             self.content_layout.addWidget(details_view)
+            self.show_content(details_view)
+            self.details_views[complete_details['id']] = details_view
+            while len(self.details_views) > self.DETAILS_VIEWS:
+                _, evicted = self.details_views.popitem(last=False)
+                self.content_layout.removeWidget(evicted)
+                evicted.deleteLater()
         else:
             # If we can't get complete details, show a message
             error_label = QLabel("Anime details could not be loaded")
-            error_label.setStyleSheet("""
-                QLabel {
-                    color: white;
-                    font-size: 16px;
-                    text-align: center;
-                }
-            """)
+            error_label.setObjectName("EmptyMessage")
+            error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.content_layout.addWidget(error_label)
+            self.show_content(error_label)
+            self.details_message = error_label
         
         # Hide loading overlay
         self.loading_overlay.hide()
     
     def closeEvent(self, event):
+        if profiler.running:
+            self.profile_action.setChecked(False)
+        self.save_session()
+        self.prefetcher.shutdown()
+        self.library_refresher.stop()
         self.image_loader.stop()
         self.image_loader.wait()
         super().closeEvent(event)
 
     def create_menu_bar(self):
         menubar = self.menuBar()
-        menubar.setStyleSheet("""
-            QMenuBar {
-                background-color: #0a0a0a;
-                color: #ffffff;
-                border-bottom: 1px solid #2a2a2a;
-            }
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 8px 12px;
-            }
-            QMenuBar::item:selected {
-                background-color: #2a2a2a;
-            }
-            QMenu {
-                background-color: #0a0a0a;
-                color: #ffffff;
-                border: 1px solid #2a2a2a;
-            }
-            QMenu::item {
-                padding: 8px 20px;
-            }
-            QMenu::item:selected {
-                background-color: #2a2a2a;
-            }
-        """)
+        menubar.setObjectName("MenuBar")
+        
+        view_menu = menubar.addMenu("View")
+        
+        self.metrics_action = QAction("Show Metrics", self)
+        self.metrics_action.setCheckable(True)
+        self.metrics_action.toggled.connect(self.toggle_metrics)
+        view_menu.addAction(self.metrics_action)
+        
+        dump_action = QAction("Dump Metrics to JSON...", self)
+        dump_action.triggered.connect(self.dump_metrics)
+        view_menu.addAction(dump_action)
+        
+        tools_menu = menubar.addMenu("Tools")
+        
+        self.profile_action = QAction("Profile", self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.toggled.connect(self.toggle_profiling)
+        tools_menu.addAction(self.profile_action)
+    
+    def on_errors_changed(self, summary, details):
+        self.error_toast.setText(summary)
+        self.error_toast.setToolTip(details)
+        self.error_toast.setVisible(bool(summary))
+    
+    def toggle_metrics(self, checked):
+        self.metrics_panel.set_active(checked)
+    
+    def toggle_profiling(self, checked):
+        if checked:
+            profiler.start()
+            self.status_bar.showMessage("Profiling... uncheck Tools → Profile to save the capture")
+            return
+        profiler.stop()
+        path = self.profile_path
+        if not path:
+            path, _ = QFileDialog.getSaveFileName(
+                self, "Save Profile", "pyitsu-profile.speedscope.json",
+                "Speedscope (*.json);;Collapsed stacks (*.txt)")
+        if path:
+            profiler.save(path)
+            self.status_bar.showMessage(f"Profile ({profiler.duration:.1f} s) written to {path}", 5000)
+    
+    def dump_metrics(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump Metrics", "pyitsu-metrics.json", "JSON (*.json)")
+        if path:
+            registry.dump_json(path)
+            self.status_bar.showMessage(f"Metrics written to {path}", 5000)
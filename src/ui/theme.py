@@ -0,0 +1,395 @@
+"""Application-wide stylesheet.
+
+Qt parses a stylesheet once per ``setStyleSheet`` call and re-polishes the
+whole subtree each time, so styling every card and label individually gets
+expensive as soon as a grid holds a few hundred widgets. Instead, every
+widget that needs custom styling gets an object name (``setObjectName``) or
+a ``class`` dynamic property, and this module installs a single stylesheet
+on the ``QApplication`` that targets them.
+"""
+from PySide6.QtWidgets import QApplication
+
+ACCENT = "#00b4d8"
+ACCENT_HOVER = "#0096c7"
+ACCENT_PRESSED = "#0077b6"
+BACKGROUND = "#0a0a0a"
+SURFACE = "#1a1a1a"
+SURFACE_HIGHLIGHT = "#2a2a2a"
+TEXT = "#ffffff"
+TEXT_MUTED = "#a0a0a0"
+
+APP_STYLESHEET = f"""
+/* Main window. Rules below are more specific or come later, so they win. */
+QMainWindow#MainWindow {{
+    background-color: {BACKGROUND};
+}}
+#MainWindow QWidget {{
+    background-color: {BACKGROUND};
+    color: {TEXT};
+}}
+#MainWindow QScrollArea {{
+    border: none;
+    background-color: transparent;
+}}
+#MainWindow QScrollBar:vertical {{
+    border: none;
+    background: {SURFACE};
+    width: 10px;
+    margin: 0px;
+}}
+#MainWindow QScrollBar::handle:vertical {{
+    background: {ACCENT};
+    border-radius: 5px;
+    min-height: 30px;
+}}
+#MainWindow QScrollBar::add-line:vertical, #MainWindow QScrollBar::sub-line:vertical {{
+    border: none;
+    background: none;
+}}
+
+/* Menu and status bar */
+QMenuBar#MenuBar {{
+    background-color: {BACKGROUND};
+    color: {TEXT};
+    border-bottom: 1px solid {SURFACE_HIGHLIGHT};
+}}
+QMenuBar#MenuBar::item {{
+    background-color: transparent;
+    padding: 8px 12px;
+}}
+QMenuBar#MenuBar::item:selected {{
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+QMenu {{
+    background-color: {BACKGROUND};
+    color: {TEXT};
+    border: 1px solid {SURFACE_HIGHLIGHT};
+}}
+QMenu::item {{
+    padding: 8px 20px;
+}}
+QMenu::item:selected {{
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+QStatusBar#StatusBar {{
+    background-color: {BACKGROUND};
+    color: {TEXT};
+    border-top: 1px solid {SURFACE_HIGHLIGHT};
+}}
+QLabel#ErrorToast {{
+    color: #ff6b6b;
+    background-color: {SURFACE_HIGHLIGHT};
+    border-radius: 4px;
+    padding: 2px 8px;
+}}
+QLabel#StaleIndicator {{
+    color: {ACCENT};
+    padding: 0 8px;
+}}
+
+/* Header */
+QWidget#TitleContainer {{
+    background-color: transparent;
+    border-bottom: 2px solid {ACCENT};
+    padding-bottom: 10px;
+}}
+QLabel#AppTitle {{
+    background-color: transparent;
+    font-size: 42px;
+    font-weight: bold;
+    color: {TEXT};
+    letter-spacing: 2px;
+}}
+QWidget#SearchContainer {{
+    background-color: transparent;
+}}
+QLabel#SearchIcon {{
+    background-color: transparent;
+    font-size: 20px;
+    color: {ACCENT};
+    padding: 0 10px;
+}}
+QLineEdit#SearchInput {{
+    padding: 15px;
+    border-radius: 8px;
+    border: 2px solid {SURFACE_HIGHLIGHT};
+    background-color: {SURFACE};
+    color: {TEXT};
+    font-size: 16px;
+    min-width: 400px;
+}}
+QLineEdit#SearchInput:focus {{
+    border: 2px solid {ACCENT};
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+QPushButton#SearchButton {{
+    background-color: {ACCENT};
+    color: {TEXT};
+    border: none;
+    padding: 15px 30px;
+    border-radius: 8px;
+    font-weight: bold;
+    font-size: 16px;
+    min-width: 120px;
+}}
+QPushButton#SearchButton:hover {{
+    background-color: {ACCENT_HOVER};
+}}
+QPushButton#SearchButton:pressed {{
+    background-color: {ACCENT_PRESSED};
+}}
+QWidget#FacetBar QToolButton, QPushButton#ClearFiltersButton {{
+    background-color: {SURFACE};
+    color: {TEXT_MUTED};
+    border: 1px solid {SURFACE_HIGHLIGHT};
+    border-radius: 6px;
+    padding: 6px 12px;
+    font-size: 13px;
+}}
+QWidget#FacetBar QToolButton::menu-indicator {{
+    image: none;
+}}
+QWidget#FacetBar QToolButton[active="true"] {{
+    color: {TEXT};
+    border: 1px solid {ACCENT};
+}}
+QWidget#FacetBar QToolButton:hover, QPushButton#ClearFiltersButton:hover {{
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+QMenu#FacetMenu {{
+    background-color: {SURFACE};
+    color: {TEXT};
+    border: 1px solid {SURFACE_HIGHLIGHT};
+}}
+QMenu#FacetMenu::item {{
+    padding: 6px 24px;
+}}
+QMenu#FacetMenu::item:selected {{
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+QMenu#FacetMenu::item:disabled {{
+    color: {TEXT_MUTED};
+}}
+QPushButton#BackButton {{
+    background-color: transparent;
+    color: {ACCENT};
+    border: 2px solid {ACCENT};
+    padding: 12px 24px;
+    border-radius: 8px;
+    font-weight: bold;
+    font-size: 16px;
+    min-width: 120px;
+}}
+QPushButton#BackButton:hover {{
+    background-color: {ACCENT};
+    color: {TEXT};
+}}
+QPushButton#BackButton:pressed {{
+    background-color: {ACCENT_HOVER};
+}}
+QPushButton#LibraryButton {{
+    background-color: transparent;
+    color: {TEXT_MUTED};
+    border: none;
+    padding: 12px 16px;
+    font-size: 16px;
+}}
+QPushButton#LibraryButton:hover, QPushButton#LibraryButton[active="true"] {{
+    color: {ACCENT};
+}}
+QPushButton#ConfigButton {{
+    background-color: {ACCENT};
+    color: {TEXT};
+    border: none;
+    border-radius: 25px;
+}}
+QPushButton#ConfigButton:hover {{
+    background-color: {ACCENT_HOVER};
+}}
+QPushButton#ConfigButton:pressed {{
+    background-color: {ACCENT_PRESSED};
+}}
+QLabel#EmptyMessage {{
+    color: {TEXT};
+    font-size: 16px;
+}}
+
+/* Loading overlay */
+QWidget#LoadingOverlay {{
+    background-color: rgba(0, 0, 0, 0.7);
+}}
+QWidget#LoadingOverlay QLabel {{
+    color: {TEXT};
+    font-size: 18px;
+    background-color: transparent;
+}}
+
+/* Anime cards */
+QFrame#AnimeCard {{
+    background-color: {SURFACE};
+    border-radius: 12px;
+    border: 1px solid {SURFACE_HIGHLIGHT};
+}}
+QFrame#AnimeCard QLabel {{
+    color: {TEXT};
+    background-color: transparent;
+}}
+QFrame#AnimeCard QLabel#CardImage {{
+    background-color: {SURFACE_HIGHLIGHT};
+    color: {TEXT_MUTED};
+    border-top-left-radius: 12px;
+    border-top-right-radius: 12px;
+}}
+QFrame#AnimeCard QWidget#CardInfo {{
+    background-color: {SURFACE};
+    border-bottom-left-radius: 12px;
+    border-bottom-right-radius: 12px;
+}}
+QFrame#AnimeCard QLabel[class="title"] {{
+    font-size: 15px;
+    font-weight: bold;
+    margin-bottom: 8px;
+}}
+QFrame#AnimeCard QLabel[class="score"] {{
+    color: {ACCENT};
+    font-weight: bold;
+    font-size: 14px;
+}}
+QFrame#AnimeCard QLabel[class="info"] {{
+    color: {TEXT_MUTED};
+    font-size: 13px;
+}}
+
+/* Anime details */
+QWidget#AnimeDetails QLabel {{
+    color: {TEXT};
+}}
+QWidget#AnimeDetails QScrollArea {{
+    border: none;
+    background-color: transparent;
+    padding-right: 20px;
+}}
+QWidget#AnimeDetails QWidget#CoverContainer {{
+    background-color: {SURFACE};
+    border-radius: 12px;
+}}
+QWidget#AnimeDetails QLabel#CoverImage {{
+    background-color: transparent;
+}}
+QWidget#AnimeDetails QLabel[class="title"] {{
+    font-size: 36px;
+    font-weight: bold;
+}}
+QWidget#AnimeDetails QLabel[class="subtitle"] {{
+    font-size: 24px;
+    color: {ACCENT};
+}}
+QWidget#AnimeDetails QLabel[class="info-label"] {{
+    font-size: 16px;
+}}
+QWidget#AnimeDetails QLabel[class="info-value"] {{
+    font-size: 16px;
+    color: {ACCENT};
+}}
+QWidget#AnimeDetails QLabel[class="synopsis"] {{
+    font-size: 16px;
+    padding-right: 20px;
+}}
+QWidget#AnimeDetails QLabel[class="section-title"] {{
+    font-size: 20px;
+    font-weight: bold;
+    margin-top: 20px;
+    margin-bottom: 10px;
+}}
+QWidget#AnimeDetails QFrame#SimilarTitle QLabel#SimilarImage {{
+    background-color: {SURFACE};
+    border-radius: 6px;
+}}
+QWidget#AnimeDetails QFrame#SimilarTitle:hover QLabel[class="similar-title"] {{
+    color: {ACCENT};
+}}
+QWidget#AnimeDetails QPushButton#ListButton {{
+    background-color: {SURFACE};
+    color: {TEXT_MUTED};
+    border: 1px solid {SURFACE_HIGHLIGHT};
+    border-radius: 6px;
+    padding: 8px 16px;
+    font-size: 14px;
+}}
+QWidget#AnimeDetails QPushButton#ListButton:hover {{
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+QWidget#AnimeDetails QPushButton#ListButton:checked {{
+    color: {TEXT};
+    border-color: {ACCENT};
+}}
+QWidget#AnimeDetails QLabel[class="similar-title"] {{
+    font-size: 13px;
+    font-weight: bold;
+}}
+QWidget#AnimeDetails QLabel[class="similar-match"] {{
+    font-size: 12px;
+    color: {TEXT_MUTED};
+}}
+QWidget#AnimeDetails QListView#EpisodeList {{
+    background-color: {SURFACE};
+    color: {TEXT};
+    border: 1px solid {SURFACE_HIGHLIGHT};
+    border-radius: 8px;
+    font-size: 14px;
+}}
+QWidget#AnimeDetails QListView#EpisodeList::item {{
+    padding: 5px;
+}}
+QWidget#AnimeDetails QListView#EpisodeList::item:hover {{
+    background-color: {SURFACE_HIGHLIGHT};
+}}
+
+/* Settings dialog */
+QDialog#ConfigDialog {{
+    background-color: {BACKGROUND};
+    color: {TEXT};
+}}
+QDialog#ConfigDialog QLabel, QDialog#ConfigDialog QCheckBox {{
+    color: {TEXT};
+    font-size: 14px;
+}}
+QDialog#ConfigDialog QComboBox, QDialog#ConfigDialog QSpinBox {{
+    background-color: {SURFACE};
+    color: {TEXT};
+    border: 1px solid {SURFACE_HIGHLIGHT};
+    border-radius: 4px;
+    padding: 5px;
+}}
+QDialog#ConfigDialog QComboBox {{
+    min-width: 150px;
+}}
+QDialog#ConfigDialog QSpinBox {{
+    min-width: 100px;
+}}
+QDialog#ConfigDialog QComboBox:focus, QDialog#ConfigDialog QSpinBox:focus {{
+    border: 1px solid {ACCENT};
+}}
+QDialog#ConfigDialog QPushButton {{
+    background-color: {ACCENT};
+    color: {TEXT};
+    border: none;
+    padding: 10px 20px;
+    border-radius: 4px;
+    font-weight: bold;
+    font-size: 14px;
+    min-width: 100px;
+}}
+QDialog#ConfigDialog QPushButton:hover {{
+    background-color: {ACCENT_HOVER};
+}}
+QDialog#ConfigDialog QPushButton:pressed {{
+    background-color: {ACCENT_PRESSED};
+}}
+"""
+
+
+def apply_theme(app: QApplication):
+    """Install the application stylesheet. Call once, before building windows."""
+    app.setStyleSheet(APP_STYLESHEET)
+
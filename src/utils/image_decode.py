@@ -0,0 +1,99 @@
+"""Poster decoding, in-thread or in a pool of worker processes.
+
+Decoding and LANCZOS resizing hold the GIL, so with many posters arriving at
+once they slow down each other and the GUI thread. ``ProcessDecoder`` runs
+them in worker processes instead. The decoded RGBA pixels are written to a
+``multiprocessing.shared_memory`` block and only its name travels back, so
+the pixels are never pickled.
+
+This module has no Qt dependency so worker processes start quickly.
+"""
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import shared_memory
+from typing import Tuple
+
+from PIL import Image
+
+
+def optimize_image_size(image: Image.Image, target_size: tuple) -> Image.Image:
+    """Shrink ``image`` to fit ``target_size``, keeping its aspect ratio. Never enlarges."""
+    width_ratio = target_size[0] / image.size[0]
+    height_ratio = target_size[1] / image.size[1]
+    scale_factor = min(width_ratio, height_ratio)
+
+    if scale_factor < 1:
+        new_size = (int(image.size[0] * scale_factor), int(image.size[1] * scale_factor))
+        image = image.resize(new_size, Image.Resampling.LANCZOS)
+    return image
+
+
+def decode_rgba(content: bytes, size: tuple) -> Tuple[bytes, int, int]:
+    """Decode an encoded image to RGBA pixels fitting ``size``. Returns ``(pixels, width, height)``."""
+    image = Image.open(BytesIO(content))
+    image = optimize_image_size(image, size).convert("RGBA")
+    return image.tobytes("raw", "RGBA"), image.size[0], image.size[1]
+
+
+def _decode_to_shared_memory(content: bytes, size: tuple) -> Tuple[str, int, int, float]:
+    """Worker process side: decode into a new shared memory block.
+
+    Returns ``(block name, width, height, decode ms)``. The caller owns the
+    block and must unlink it.
+    """
+    start = time.perf_counter()
+    pixels, width, height = decode_rgba(content, size)
+    block = shared_memory.SharedMemory(create=True, size=len(pixels))
+    try:
+        block.buf[:len(pixels)] = pixels
+        name = block.name
+    finally:
+        block.close()
+    return name, width, height, (time.perf_counter() - start) * 1000
+
+
+class SharedPixels:
+    """Decoded pixels living in a shared memory block. Use as a context manager, or call ``close``.
+
+    ``buffer`` is only valid inside the ``with`` block; the block is unlinked
+    on exit.
+    """
+
+    def __init__(self, name: str, width: int, height: int):
+        self.block = shared_memory.SharedMemory(name=name)
+        self.width = width
+        self.height = height
+        self.buffer = self.block.buf[:width * height * 4]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the buffer and unlink the block."""
+        self.buffer.release()
+        self.block.close()
+        self.block.unlink()
+
+
+class ProcessDecoder:
+    """Decodes images in a pool of worker processes."""
+
+    def __init__(self, workers: int = None):
+        # spawn, not fork: forking a process that runs Qt and threads is unsafe
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, content: bytes, size: tuple) -> Future:
+        """Start decoding; the future's result is ``(block name, width, height, decode ms)``.
+
+        Pass the result to :class:`SharedPixels` to read and free the pixels.
+        """
+        return self.executor.submit(_decode_to_shared_memory, content, tuple(size))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,142 @@
+"""In-process metrics: counters, gauges and histograms.
+
+Everything records into the module-level ``registry``. It has no Qt
+dependency so the API client and the CLI can use it too. Metrics are
+identified by a name plus optional labels, e.g.
+``registry.histogram("api.latency_ms", endpoint="/anime")``.
+"""
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def _metric_key(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "}"
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Keeps exact count/sum/min/max and a window of recent samples for percentiles."""
+    WINDOW = 2048
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.samples = deque(maxlen=self.WINDOW)
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self.lock:
+            self.count += 1
+            self.total += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+            self.samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        with self.lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def snapshot(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, labels):
+        key = _metric_key(name, labels)
+        metric = self.metrics.get(key)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.setdefault(key, cls())
+        return metric
+
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        return self._get(Histogram, name, labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Record the duration of the ``with`` block, in milliseconds, into a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name, **labels).observe((time.perf_counter() - start) * 1000)
+
+    def cache_hit_ratios(self) -> dict:
+        """Hit ratio per cache tier, from the ``cache.hits``/``cache.misses`` counters."""
+        tiers = {}
+        for key, metric in list(self.metrics.items()):
+            for name, index in (("cache.hits{tier=", 0), ("cache.misses{tier=", 1)):
+                if key.startswith(name):
+                    counts = tiers.setdefault(key[len(name):-1], [0, 0])
+                    counts[index] = metric.value
+        return {tier: hits / (hits + misses) for tier, (hits, misses) in tiers.items() if hits + misses}
+
+    def snapshot(self) -> dict:
+        snapshot = {key: metric.snapshot() for key, metric in sorted(self.metrics.items())}
+        snapshot["cache.hit_ratio"] = self.cache_hit_ratios()
+        return snapshot
+
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "metrics": self.snapshot()}, f, indent=2)
+
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+
+
+registry = MetricsRegistry()
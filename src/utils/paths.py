@@ -0,0 +1,14 @@
+import os
+
+APP_DIR_ENV = "PYITSU_HOME"
+
+
+def app_data_dir(*parts: str) -> str:
+    """Return (and create) a directory under the application data folder.
+
+    Defaults to ``~/.pyitsu``; set ``PYITSU_HOME`` to relocate it.
+    """
+    base = os.environ.get(APP_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".pyitsu")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,141 @@
+"""Sampling profiler for the whole process: the Qt main thread and all workers.
+
+A background thread snapshots every thread's Python stack at a fixed
+interval (``sys._current_frames``), so there is no per-call overhead. Code
+can tag hot paths with ``span("name")``; while profiling, samples taken
+inside a span get it as an extra frame, so a capture shows e.g. how much of
+the main thread went to ``[card_build]`` versus ``[paint]``.
+
+Captures are written as collapsed stacks (for flamegraph.pl, speedscope or
+inferno) or as speedscope JSON. The module-level ``profiler`` is the one
+the app toggles from the Tools menu or with ``PYITSU_PROFILE=<output path>``.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Thread ident -> stack of open span names, only maintained while sampling
+_spans = {}
+_active = False
+
+
+@contextmanager
+def span(name: str):
+    """Tag the enclosed code as ``name`` in profiles. Almost free when not profiling."""
+    if not _active:
+        yield
+        return
+    stack = _spans.setdefault(threading.get_ident(), [])
+    stack.append(name)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples all thread stacks every ``interval`` seconds between ``start`` and ``stop``."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()  # (thread name, frame names root first) -> total seconds
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.started_at = None
+        self.duration = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None
+
+    def start(self):
+        global _active
+        if self.running:
+            return
+        self.samples.clear()
+        self.stop_event.clear()
+        _active = True
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name="pyitsu-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        global _active
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        _active = False
+        _spans.clear()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self):
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self.stop_event.wait(self.interval):
+            now = time.perf_counter()
+            # Weight by the real elapsed time, the wait oversleeps under load
+            weight, last = now - last, now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                stack.extend(f"[{name}]" for name in _spans.get(ident, ()))
+                self.samples[(names.get(ident, f"thread-{ident}"), tuple(stack))] += weight
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format: ``thread;frame;...;frame milliseconds``."""
+        lines = []
+        for (thread, stack), seconds in sorted(self.samples.items()):
+            lines.append(";".join((thread,) + stack) + f" {max(1, round(seconds * 1000))}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict:
+        """Samples as a speedscope document, one sampled profile per thread."""
+        frames, frame_index, profiles = [], {}, {}
+        for (thread, stack), seconds in sorted(self.samples.items()):
+            indices = []
+            for name in stack:
+                if name not in frame_index:
+                    frame_index[name] = len(frames)
+                    frames.append({"name": name})
+                indices.append(frame_index[name])
+            profile = profiles.setdefault(thread, {
+                "type": "sampled", "name": thread, "unit": "milliseconds",
+                "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+            })
+            profile["samples"].append(indices)
+            profile["weights"].append(seconds * 1000)
+            profile["endValue"] += seconds * 1000
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "pyitsu",
+            "exporter": "pyitsu",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+    def save(self, path: str):
+        """Write the capture; ``.json`` paths get speedscope, anything else collapsed stacks."""
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                json.dump(self.speedscope(), f)
+            else:
+                f.write(self.collapsed())
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,157 @@
+"""Decoded thumbnails packed into one memory-mapped file.
+
+Every thumbnail gets a fixed-size slot big enough for ``size`` at 4 bytes per
+pixel, in whatever 32-bit layout the caller uses (the image loader stores
+Qt's premultiplied ARGB32, so reading needs no conversion). Thumbnails
+smaller than the slot, as posters with another aspect ratio are, take its
+first ``width * height * 4`` bytes. Reading one is slicing the map: no file
+open, no decode.
+
+The offset index is an append-only log of fixed-size records next to the
+atlas, replayed on start. Slots are reused in ring order once the atlas is
+full, so the oldest thumbnails are the ones overwritten.
+
+This module has no Qt dependency, like ``image_decode``.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from utils.metrics import registry
+from utils.paths import app_data_dir
+
+
+class ThumbnailAtlas:
+    """Fixed-size thumbnail slots in a memory-mapped file, keyed by URL. Thread-safe."""
+    BYTES_PER_PIXEL = 4
+    # Slots in a new atlas; the file is sparse, so only written slots use disk
+    DEFAULT_CAPACITY = 512
+    # Index record: key digest, slot, width, height
+    RECORD = struct.Struct("<20sIHH")
+
+    def __init__(self, size: Tuple[int, int], capacity: int = DEFAULT_CAPACITY, directory: Optional[str] = None):
+        self.size = tuple(size)
+        self.slot_bytes = size[0] * size[1] * self.BYTES_PER_PIXEL
+        self.capacity = capacity
+        directory = directory or app_data_dir("cache", "thumbnails")
+        name = f"atlas-{size[0]}x{size[1]}"
+        self.path = os.path.join(directory, name + ".bin")
+        self.index_path = os.path.join(directory, name + ".idx")
+        self.lock = threading.Lock()
+        self.entries = {}  # key digest -> (slot, width, height)
+        self.owners = {}  # slot -> key digest
+        self.next_slot = 0
+        self._load_index()
+
+        with open(self.path, "a+b") as f:
+            if os.fstat(f.fileno()).st_size != capacity * self.slot_bytes:
+                f.truncate(capacity * self.slot_bytes)
+        self.file = open(self.path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), capacity * self.slot_bytes)
+        self.index = open(self.index_path, "ab")
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.sha1(key.encode("utf-8")).digest()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        records = len(data) // self.RECORD.size
+        # A record cut short by a crash is ignored
+        for digest, slot, width, height in self.RECORD.iter_unpack(data[:records * self.RECORD.size]):
+            if slot >= self.capacity:
+                continue
+            previous = self.owners.pop(slot, None)
+            if previous is not None:
+                self.entries.pop(previous, None)
+            old = self.entries.pop(digest, None)
+            if old is not None:
+                self.owners.pop(old[0], None)
+            self.entries[digest] = (slot, width, height)
+            self.owners[slot] = digest
+            self.next_slot = (slot + 1) % self.capacity
+        if records > 2 * self.capacity:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the index with only live records, oldest first, so the log doesn't grow forever."""
+        live = sorted(self.entries.items(), key=lambda item: (item[1][0] - self.next_slot) % self.capacity)
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(b"".join(self.RECORD.pack(digest, *entry) for digest, entry in live))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Error compacting thumbnail index: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            return self._digest(key) in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def put(self, key: str, pixels, width: int, height: int):
+        """Store ``width * height`` pixels (tightly packed rows) for ``key``, replacing the oldest if full."""
+        if width > self.size[0] or height > self.size[1] or len(pixels) != width * height * self.BYTES_PER_PIXEL:
+            raise ValueError(f"{width}x{height} thumbnail does not fit a {self.size[0]}x{self.size[1]} slot")
+        digest = self._digest(key)
+        with self.lock:
+            if self.map is None:
+                return
+            # Unpublish the slot before writing it, so readers never see it half written
+            old = self.entries.pop(digest, None)
+            if old is not None:
+                self.owners.pop(old[0], None)
+            slot = self.next_slot
+            self.next_slot = (slot + 1) % self.capacity
+            evicted = self.owners.pop(slot, None)
+            if evicted is not None:
+                del self.entries[evicted]
+                registry.counter("cache.evictions", tier="atlas").inc()
+        offset = slot * self.slot_bytes
+        self.map[offset:offset + len(pixels)] = pixels
+        with self.lock:
+            if self.map is None:
+                return
+            self.entries[digest] = (slot, width, height)
+            self.owners[slot] = digest
+            self.index.write(self.RECORD.pack(digest, slot, width, height))
+            self.index.flush()
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[Optional[Tuple[memoryview, int, int]]]:
+        """Yield ``(pixels, width, height)`` for ``key``, or None if it isn't stored.
+
+        ``pixels`` is a view straight into the map, valid only inside the
+        ``with`` block; the slot can't be overwritten until it exits.
+        """
+        with self.lock:
+            entry = self.entries.get(self._digest(key)) if self.map is not None else None
+            if entry is None:
+                registry.counter("cache.misses", tier="atlas").inc()
+                yield None
+                return
+            registry.counter("cache.hits", tier="atlas").inc()
+            slot, width, height = entry
+            offset = slot * self.slot_bytes
+            with memoryview(self.map)[offset:offset + width * height * self.BYTES_PER_PIXEL] as pixels:
+                yield pixels, width, height
+
+    def close(self):
+        with self.lock:
+            if self.map is None:
+                return
+            self.map.flush()
+            self.map.close()
+            self.map = None
+            self.file.close()
+            self.index.close()